@@ -1,10 +1,19 @@
 import streamlit as st
 import pandas as pd
-import json
 import os
+import time
 from datetime import datetime
+from browser import InvalidRowBrowser
+from charts import build_chart_data, failure_timeline
+from profiler import profile_data, profiles_to_dict
+from repair import repair_data
+from run_store import RunStore
+from requirement import flag_invalid_rows
+from rules import evaluate_rules
+from schema_loader import load_schema, schema_hash
 from standardizer import standardize_data
 from validator import validate_data
+from violations import rule_violations
 import plotly.graph_objects as go
 
 st.set_page_config(
@@ -257,8 +266,8 @@ st.markdown("""
 st.title("📊 Data Quality Framework")
 st.markdown("<p style='text-align: center; color: rgba(255,255,255,0.8); font-size: 1.1rem; margin-top: -1rem;'>Upload a CSV file to validate, standardize, and generate a data quality report.</p>", unsafe_allow_html=True)
 
-with open("config/schema.json", "r", encoding="utf-8") as f:
-    schema = json.load(f)
+schema = load_schema("config/schema.json")
+run_store = RunStore(os.path.join("reports", "runs.sqlite"))
 
 uploaded_file = st.file_uploader(
     "Upload your CSV file",
@@ -279,122 +288,40 @@ st.success(
 with st.expander("📄 Preview Raw Data"):
     st.dataframe(df_raw.head(10), use_container_width=True)
 
+file_key = (uploaded_file.name, uploaded_file.size)
+
 if st.button("🚀 Run Quality Check"):
 
     with st.spinner("Processing data..."):
 
+        started_at, started = datetime.now(), time.perf_counter()
         df_standardized = standardize_data(df_raw, schema)
-        validation_results = validate_data(df_standardized, schema)
-
-        def flag_invalid_rows(df, schema):
-            errors = [[] for _ in range(len(df))]
-            is_valid = [True] * len(df)
-
-            for col, spec in schema.get("columns", {}).items():
-                if col not in df.columns:
-                    for i in range(len(df)):
-                        errors[i].append(f"missing column: {col}")
-                        is_valid[i] = False
-                    continue
-
-                if spec.get("required"):
-                    for i, val in enumerate(df[col].isna()):
-                        if val:
-                            errors[i].append(f"{col} is required")
-                            is_valid[i] = False
-
-            flagged = df.copy()
-            flagged["is_valid"] = is_valid
-            flagged["errors"] = ["; ".join(e) for e in errors]
-            return flagged
-
-        df_flagged = flag_invalid_rows(df_standardized, schema)
+        # Same as the pipeline: coerced values are quarantined and fixed where the schema says how
+        df_standardized, df_repairs = repair_data(df_raw, df_standardized, schema)
+        # Custom rules run once; validation and the violation masks share the results
+        custom_rules = evaluate_rules(df_standardized, schema)
+        validation_results = validate_data(df_standardized, schema, custom=custom_rules)
+        violations = list(rule_violations(df_standardized, schema, custom=custom_rules))
+        df_flagged = flag_invalid_rows(df_standardized, schema, copy=False, violations=violations)
+        browser = InvalidRowBrowser(df_standardized, violations)
+        invalid_df = df_flagged.take(browser.invalid_positions)
+        profiles = profile_data(df_standardized, schema)
+        rule_counts = dict(zip(browser.rules, browser.rule_counts()["rows"]))
+        # Small precomputed aggregates; the charts below never see individual rows
+        chart_data = build_chart_data(
+            profiles,
+            rule_counts,
+            failure_timeline(df_standardized, df_flagged["is_valid"].to_numpy(), schema),
+        )
 
         total_rows = len(df_flagged)
-        valid_rows = df_flagged["is_valid"].sum()
-        invalid_rows = total_rows - valid_rows
+        invalid_rows = len(browser.invalid_positions)
+        valid_rows = total_rows - invalid_rows
 
         stats = validation_results.get("statistics", {})
         passed = stats.get("successful_expectations", 0)
         total_exp = stats.get("evaluated_expectations", 0)
 
-        st.success("✅ Quality check completed")
-
-        c1, c2, c3, c4 = st.columns(4)
-
-        with c1:
-            st.metric("📊 Total Rows", total_rows)
-
-        with c2:
-            st.metric("✅ Valid Rows", valid_rows)
-
-        with c3:
-            st.metric("❌ Invalid Rows", invalid_rows)
-
-        with c4:
-            st.metric("🎯 Validation Score", f"{passed}/{total_exp}")
-
-        c5, c6 = st.columns(2)
-
-        with c5:
-            pie = go.Figure(go.Pie(
-                labels=["Valid", "Invalid"],
-                values=[valid_rows, invalid_rows],
-                hole=0.4,
-                marker=dict(colors=['#10b981', '#ef4444'])
-            ))
-            pie.update_layout(
-                title=dict(text="Valid vs Invalid Rows", font=dict(color='white', size=18)),
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='white'),
-                showlegend=True,
-                legend=dict(font=dict(color='white')),
-                margin=dict(t=50, b=20, l=20, r=20)
-            )
-            st.plotly_chart(pie, use_container_width=True)
-
-        with c6:
-            bar = go.Figure(go.Bar(
-                x=["Passed", "Failed"],
-                y=[passed, total_exp - passed],
-                marker=dict(color=['#10b981', '#ef4444'])
-            ))
-            bar.update_layout(
-                title=dict(text="Validation Results", font=dict(color='white', size=18)),
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='white'),
-                xaxis=dict(color='white', showgrid=False),
-                yaxis=dict(color='white', showgrid=True, gridcolor='rgba(255,255,255,0.1)'),
-                margin=dict(t=50, b=50, l=50, r=20)
-            )
-            st.plotly_chart(bar, use_container_width=True)
-
-        if invalid_rows > 0:
-            st.markdown("### ❌ Invalid Records")
-            invalid_df = df_flagged[~df_flagged["is_valid"]]
-            st.dataframe(invalid_df, use_container_width=True)
-        else:
-            st.success("🎉 All records are valid!")
-
-        st.markdown("### 💾 Downloads")
-
-        st.download_button(
-            "📥 Download Cleaned CSV",
-            df_standardized.to_csv(index=False).encode("utf-8"),
-            file_name="cleaned_data.csv",
-            mime="text/csv"
-        )
-
-        if invalid_rows > 0:
-            st.download_button(
-                "📥 Download Invalid Rows",
-                invalid_df.to_csv(index=False).encode("utf-8"),
-                file_name="invalid_rows.csv",
-                mime="text/csv"
-            )
-
         os.makedirs("reports", exist_ok=True)
         report_name = f"data_quality_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -641,7 +568,7 @@ if st.button("🚀 Run Quality Check"):
                 
                 <div class="content">
                     <h2 class="section-title">{"✅ All Records Valid" if invalid_rows == 0 else "❌ Invalid Records"}</h2>
-                    {f'<div class="no-data"><span class="success-badge">🎉 Congratulations! All {total_rows} records passed validation</span></div>' if invalid_rows == 0 else invalid_df.to_html(index=False, classes="data-table")}
+                    {f'<div class="no-data"><span class="success-badge">🎉 Congratulations! All {total_rows} records passed validation</span></div>' if invalid_rows == 0 else invalid_df.rename_axis("row_id").reset_index().to_html(index=False, classes="data-table")}
                 </div>
                 
                 <div class="footer">
@@ -656,14 +583,230 @@ if st.button("🚀 Run Quality Check"):
         with open(os.path.join("reports", report_name), "w", encoding="utf-8") as f:
             f.write(html_report)
 
+        run_store.record_run(
+            uploaded_file.name,
+            schema_hash(schema),
+            started_at,
+            time.perf_counter() - started,
+            total_rows,
+            invalid_rows,
+            stats,
+            rule_counts,
+            profiles=profiles_to_dict(profiles),
+        )
+
+        # Widgets below rerun the script, so keep the results instead of recomputing them
+        st.session_state["quality_check"] = {
+            "file": file_key,
+            "browser": browser,
+            "total_rows": total_rows,
+            "valid_rows": valid_rows,
+            "invalid_rows": invalid_rows,
+            "passed": passed,
+            "total_exp": total_exp,
+            "charts": chart_data,
+            "cleaned_csv": df_standardized.to_csv(index=False).encode("utf-8"),
+            "invalid_csv": invalid_df.to_csv(index_label="row_id").encode("utf-8"),
+            "repairs_csv": df_repairs.to_csv(index=False).encode("utf-8") if len(df_repairs) else None,
+            "html_report": html_report,
+            "report_name": report_name,
+        }
+
+check = st.session_state.get("quality_check")
+if check is not None and check["file"] == file_key:
+    browser = check["browser"]
+    total_rows, valid_rows, invalid_rows = check["total_rows"], check["valid_rows"], check["invalid_rows"]
+    passed, total_exp = check["passed"], check["total_exp"]
+
+    st.success("✅ Quality check completed")
+
+    c1, c2, c3, c4 = st.columns(4)
+
+    with c1:
+        st.metric("📊 Total Rows", total_rows)
+
+    with c2:
+        st.metric("✅ Valid Rows", valid_rows)
+
+    with c3:
+        st.metric("❌ Invalid Rows", invalid_rows)
+
+    with c4:
+        st.metric("🎯 Validation Score", f"{passed}/{total_exp}")
+
+    c5, c6 = st.columns(2)
+
+    with c5:
+        pie = go.Figure(go.Pie(
+            labels=["Valid", "Invalid"],
+            values=[valid_rows, invalid_rows],
+            hole=0.4,
+            marker=dict(colors=['#10b981', '#ef4444'])
+        ))
+        pie.update_layout(
+            title=dict(text="Valid vs Invalid Rows", font=dict(color='white', size=18)),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='white'),
+            showlegend=True,
+            legend=dict(font=dict(color='white')),
+            margin=dict(t=50, b=20, l=20, r=20)
+        )
+        st.plotly_chart(pie, use_container_width=True)
+
+    with c6:
+        bar = go.Figure(go.Bar(
+            x=["Passed", "Failed"],
+            y=[passed, total_exp - passed],
+            marker=dict(color=['#10b981', '#ef4444'])
+        ))
+        bar.update_layout(
+            title=dict(text="Validation Results", font=dict(color='white', size=18)),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='white'),
+            xaxis=dict(color='white', showgrid=False),
+            yaxis=dict(color='white', showgrid=True, gridcolor='rgba(255,255,255,0.1)'),
+            margin=dict(t=50, b=50, l=50, r=20)
+        )
+        st.plotly_chart(bar, use_container_width=True)
+
+    chart_data = check["charts"]
+    chart_layout = dict(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white'),
+        xaxis=dict(color='white', showgrid=False),
+        yaxis=dict(color='white', showgrid=True, gridcolor='rgba(255,255,255,0.1)'),
+        margin=dict(t=50, b=50, l=50, r=20)
+    )
+    c7, c8 = st.columns(2)
+
+    with c7:
+        failing = [r for r in chart_data["rule_counts"] if r["rows"]]
+        rules_bar = go.Figure(go.Bar(
+            x=[r["rows"] for r in failing],
+            y=[f"{r['column']} · {r['rule_id']}" for r in failing],
+            orientation="h",
+            marker=dict(color='#ef4444')
+        ))
+        rules_bar.update_layout(title=dict(text="Failures per Rule", font=dict(color='white', size=18)), **chart_layout)
+        st.plotly_chart(rules_bar, use_container_width=True)
+
+    with c8:
+        if chart_data["histograms"]:
+            hist_col = st.selectbox("Value distribution of", list(chart_data["histograms"]))
+            histogram = chart_data["histograms"][hist_col]
+            hist_bar = go.Figure(go.Bar(
+                x=[f"{edge:.4g}" if isinstance(edge, float) else edge for edge in histogram["edges"][:len(histogram["counts"])]],
+                y=histogram["counts"],
+                marker=dict(color='#667eea')
+            ))
+            hist_bar.update_layout(title=dict(text=f"Distribution of {hist_col}", font=dict(color='white', size=18)), **chart_layout)
+            st.plotly_chart(hist_bar, use_container_width=True)
+
+    for date_col, timeline in chart_data["timelines"].items():
+        line = go.Figure([
+            go.Scatter(x=timeline["start"], y=timeline["rows"], name="Rows", line=dict(color='#10b981')),
+            go.Scatter(x=timeline["start"], y=timeline["invalid"], name="Invalid", line=dict(color='#ef4444')),
+        ])
+        line.update_layout(
+            title=dict(text=f"Invalid Rows by {date_col} (per {timeline['bucket']})", font=dict(color='white', size=18)),
+            legend=dict(font=dict(color='white')),
+            **chart_layout
+        )
+        st.plotly_chart(line, use_container_width=True)
+
+    if invalid_rows > 0:
+        st.markdown("### ❌ Invalid Records")
+        # Paged on the server: only the visible page is taken from the frame and sent
+        f1, f2, f3 = st.columns([2, 2, 1])
+        with f1:
+            columns = st.multiselect("Filter by column", browser.columns)
+        with f2:
+            rule_ids = st.multiselect("Filter by rule", browser.rule_ids)
+        with f3:
+            page_size = st.selectbox("Rows per page", [25, 50, 100, 500], index=1)
+        positions = browser.filter(columns, rule_ids)
+        pages = browser.page_count(positions, page_size)
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1)
+        st.caption(f"{len(positions)} matching rows")
+        st.dataframe(browser.page(positions, page - 1, page_size), use_container_width=True, hide_index=True)
+        with st.expander("Failures per rule"):
+            st.dataframe(browser.rule_counts(), use_container_width=True, hide_index=True)
+    else:
+        st.success("🎉 All records are valid!")
+
+    st.markdown("### 💾 Downloads")
+
+    st.download_button(
+        "📥 Download Cleaned CSV",
+        check["cleaned_csv"],
+        file_name="cleaned_data.csv",
+        mime="text/csv"
+    )
+
+    if invalid_rows > 0:
+        st.download_button(
+            "📥 Download Invalid Rows",
+            check["invalid_csv"],
+            file_name="invalid_rows.csv",
+            mime="text/csv"
+        )
+
+    if check.get("repairs_csv") is not None:
         st.download_button(
-            "📥 Download HTML Report",
-            html_report.encode("utf-8"),
-            file_name=report_name,
-            mime="text/html"
+            "📥 Download Repair Log",
+            check["repairs_csv"],
+            file_name="repairs.csv",
+            mime="text/csv"
         )
 
-        st.success("✅ HTML report generated successfully")
+    st.download_button(
+        "📥 Download HTML Report",
+        check["html_report"].encode("utf-8"),
+        file_name=check["report_name"],
+        mime="text/html"
+    )
+
+    st.success("✅ HTML report generated successfully")
+
+with st.expander("📜 Run History"):
+    sources = run_store.sources()
+    if not sources:
+        st.info("No runs recorded yet")
+    else:
+        default = sources.index(uploaded_file.name) if uploaded_file.name in sources else 0
+        history_source = st.selectbox("Source", sources, index=default)
+        history = pd.DataFrame(run_store.runs(source=history_source, limit=500))
+        trend = go.Figure(go.Scatter(
+            x=history["started_at"],
+            y=history["invalid_ratio"],
+            mode="lines+markers",
+            line=dict(color='#ef4444')
+        ))
+        trend.update_layout(
+            title=dict(text="Invalid Row Ratio per Run", font=dict(color='white', size=18)),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='white'),
+            xaxis=dict(color='white', showgrid=False),
+            yaxis=dict(color='white', showgrid=True, gridcolor='rgba(255,255,255,0.1)', tickformat=".1%"),
+            margin=dict(t=50, b=50, l=50, r=20)
+        )
+        st.plotly_chart(trend, use_container_width=True)
+        rules = pd.DataFrame(run_store.rule_trend(source=history_source))
+        if not rules.empty:
+            st.dataframe(
+                rules.pivot_table(index="started_at", columns=["column", "rule_id"], values="rows", aggfunc="sum"),
+                use_container_width=True
+            )
+        st.dataframe(
+            history[["started_at", "total_rows", "invalid_rows", "invalid_ratio", "successful_expectations",
+                     "evaluated_expectations", "duration_s", "schema_hash"]],
+            use_container_width=True,
+            hide_index=True
+        )
 
 st.markdown("---")
 st.caption("Built with ❤️ using Streamlit • Data Quality Framework")
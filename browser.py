@@ -0,0 +1,73 @@
+"""Server-side paging over invalid rows, backed by the per-rule violation masks.
+
+Only the requested page is ever materialized: filters combine boolean masks into an
+array of row positions, and a page is a positional take of at most page_size rows."""
+import math
+
+import numpy as np
+import pandas as pd
+
+
+class InvalidRowBrowser:
+    """Filter invalid rows by column and rule and fetch them one page at a time.
+
+    Built from a standardized frame and its rule_violations() masks; the frame is
+    kept by reference, not copied.
+    """
+
+    def __init__(self, df: pd.DataFrame, violations: list):
+        self.df = df
+        self.rules = [(col, rule_id) for col, rule_id, _, _ in violations]
+        self.messages = [message for _, _, message, _ in violations]
+        self.masks = [mask for _, _, _, mask in violations]
+        self.invalid_positions = self._positions(range(len(self.masks)))
+        self._cache: dict[tuple, np.ndarray] = {}
+
+    def _positions(self, rule_indexes) -> np.ndarray:
+        selected = [self.masks[i] for i in rule_indexes]
+        if not selected:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(np.logical_or.reduce(selected))
+
+    @property
+    def columns(self) -> list[str]:
+        return list(dict.fromkeys(col for col, _ in self.rules))
+
+    @property
+    def rule_ids(self) -> list[str]:
+        return list(dict.fromkeys(rule_id for _, rule_id in self.rules))
+
+    def rule_counts(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            [(col, rule_id, int(np.count_nonzero(mask))) for (col, rule_id), mask in zip(self.rules, self.masks)],
+            columns=["column", "rule_id", "rows"],
+        )
+
+    def filter(self, columns: list[str] | None = None, rule_ids: list[str] | None = None) -> np.ndarray:
+        """Positions of rows failing any selected rule (no selection means all rules)."""
+        key = (tuple(columns or ()), tuple(rule_ids or ()))
+        if not any(key):
+            return self.invalid_positions
+        if key not in self._cache:
+            indexes = [
+                i for i, (col, rule_id) in enumerate(self.rules)
+                if (not columns or col in columns) and (not rule_ids or rule_id in rule_ids)
+            ]
+            self._cache[key] = self._positions(indexes)
+        return self._cache[key]
+
+    @staticmethod
+    def page_count(positions: np.ndarray, page_size: int) -> int:
+        return max(1, math.ceil(len(positions) / page_size))
+
+    def page(self, positions: np.ndarray, page: int, page_size: int) -> pd.DataFrame:
+        """Rows of one page (0-based) with their 'row_id' (the frame's index) and 'errors'."""
+        window = positions[page * page_size:(page + 1) * page_size]
+        rows = self.df.take(window)
+        errors = [[] for _ in range(len(window))]
+        for message, mask in zip(self.messages, self.masks):
+            for i in np.flatnonzero(mask[window]):
+                errors[i].append(message)
+        rows.insert(0, "row_id", rows.index.to_numpy())
+        rows["errors"] = ["; ".join(e) for e in errors]
+        return rows
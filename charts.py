@@ -0,0 +1,107 @@
+"""Chart-ready aggregates computed during the validation pass.
+
+Everything here is small and mergeable across chunks. Value histograms come from
+the column profiles' quantile sketches. Failures over time are per-day counts
+aggregated once per chunk. Per-rule counts come from the rule masks. Rendering
+cost therefore does not depend on the number of rows."""
+import numpy as np
+import pandas as pd
+
+# Coarser buckets are used until a timeline fits in max_points
+_FREQUENCIES = [("D", "day"), ("W-MON", "week"), ("MS", "month"), ("YS", "year")]
+
+
+def failure_timeline(df: pd.DataFrame, is_valid: np.ndarray, schema: dict) -> dict:
+    """Per-day row and invalid-row counts for each date column.
+
+    Returns {column: {"YYYY-MM-DD": [rows, invalid_rows]}}; rows without a date are skipped.
+    """
+    out = {}
+    for col, spec in schema.get("columns", {}).items():
+        if spec.get("type") != "date" or col not in df.columns or not pd.api.types.is_datetime64_any_dtype(df[col]):
+            continue
+        days = df[col].to_numpy().astype("datetime64[D]")
+        present = ~np.isnat(days)
+        keys, inverse = np.unique(days[present], return_inverse=True)
+        rows = np.bincount(inverse, minlength=keys.size)
+        invalid = np.bincount(inverse, weights=~is_valid[present], minlength=keys.size)
+        out[col] = {str(day): [int(r), int(i)] for day, r, i in zip(keys, rows, invalid)}
+    return out
+
+
+def merge_timelines(left: dict | None, right: dict) -> dict:
+    """Add right's per-day counts into left and return left."""
+    if left is None:
+        return right
+    for col, days in right.items():
+        merged = left.setdefault(col, {})
+        for day, (rows, invalid) in days.items():
+            if day in merged:
+                merged[day] = [merged[day][0] + rows, merged[day][1] + invalid]
+            else:
+                merged[day] = [rows, invalid]
+    return left
+
+
+def _downsample(days: dict, max_points: int) -> dict:
+    counts = pd.DataFrame(list(days.values()), index=pd.to_datetime(list(days)), columns=["rows", "invalid"]).sort_index()
+    for freq, label in _FREQUENCIES:
+        buckets = counts.resample(freq).sum()
+        if len(buckets) <= max_points:
+            break
+    return {
+        "bucket": label,
+        "start": [ts.strftime("%Y-%m-%d") for ts in buckets.index],
+        "rows": buckets["rows"].astype(int).tolist(),
+        "invalid": buckets["invalid"].astype(int).tolist(),
+    }
+
+
+def value_histogram(profile, bins: int = 20) -> dict | None:
+    """Equal-width histogram of a numeric or date profile, read off its quantile sketch.
+
+    Counts are approximate: they are read off the sketch's ranks at the bin edges.
+    """
+    sketch = profile.quantiles
+    if sketch is None or not sketch.n or profile.min is None:
+        return None
+    lo, hi = float(profile.min), float(profile.max)
+    edges = np.linspace(lo, hi, bins + 1) if hi > lo else np.array([lo, hi])
+    cdf = sketch.cdf(edges)
+    cdf[0] = 0.0  # the first bin includes the minimum
+    counts = np.round(np.diff(cdf) * sketch.n).astype(int) if hi > lo else np.array([sketch.n])
+    if profile.kind == "date":
+        labels = [str(pd.Timestamp(int(edge))) for edge in edges]
+    else:
+        labels = [float(edge) for edge in edges]
+    return {"edges": labels, "counts": counts.tolist()}
+
+
+def build_chart_data(
+    profiles: dict,
+    rule_counts: dict,
+    timeline: dict | None,
+    bins: int = 20,
+    max_points: int = 60,
+) -> dict:
+    """Everything the app and the report plot, in a few kilobytes.
+
+    rule_counts maps (column, rule_id) to failing rows; timelines are bucketed by
+    day, week, month or year so that each has at most max_points buckets.
+    """
+    column_failures = {}
+    for (col, _), rows in rule_counts.items():
+        column_failures[col] = column_failures.get(col, 0) + rows
+    histograms = {}
+    for col, profile in (profiles or {}).items():
+        histogram = value_histogram(profile, bins)
+        if histogram is not None:
+            histograms[col] = histogram
+    return {
+        "rule_counts": [
+            {"column": col, "rule_id": rule_id, "rows": rows} for (col, rule_id), rows in rule_counts.items()
+        ],
+        "column_failures": column_failures,
+        "histograms": histograms,
+        "timelines": {col: _downsample(days, max_points) for col, days in (timeline or {}).items() if days},
+    }
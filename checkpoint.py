@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+
+from schema_loader import schema_hash
+
+
+def part_path(path: str) -> str:
+    """Outputs are written under this name and only renamed once complete."""
+    return path + ".part"
+
+
+def finalize(path: str) -> None:
+    """Atomically publish a finished .part file under its final name."""
+    os.replace(part_path(path), path)
+
+
+def reopen(path: str) -> None:
+    """Move a published output back to its .part name so a run can append to it."""
+    os.replace(path, part_path(path))
+
+
+def fsync_file(path: str) -> None:
+    with open(path, "rb+") as f:
+        os.fsync(f.fileno())
+
+
+def truncate(path: str, size: int) -> None:
+    """Drop anything written after the last committed checkpoint."""
+    with open(path, "rb+") as f:
+        f.truncate(size)
+
+
+def atomic_write_json(path: str, data: dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def run_fingerprint(input_csv: str, schema: dict, layout, options: dict | None = None) -> dict:
+    """Identify a run; a checkpoint is only resumed if all of these still match.
+
+    `layout` describes how the input is cut (chunk size, byte-range size) and
+    `options` the output format (codec, errors column, which side outputs are
+    written), so a resumed run never appends to parts written differently.
+    """
+    stat = os.stat(input_csv)
+    return {
+        "input": os.path.abspath(input_csv),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "schema_sha256": schema_hash(schema),
+        "layout": layout,
+        "options": options or {},
+    }
+
+
+class Checkpoint:
+    """JSON checkpoint of a chunked run: rows done, committed output sizes, merged state."""
+
+    def __init__(self, path: str, fingerprint: dict):
+        self.path = path
+        self.fingerprint = fingerprint
+
+    def load(self) -> dict | None:
+        """Return the saved state, or None if there is none or it belongs to another run."""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("fingerprint") != self.fingerprint:
+            return None
+        return saved["state"]
+
+    def save(self, state: dict) -> None:
+        for path in state.get("outputs", {}):
+            fsync_file(path)
+        atomic_write_json(self.path, {"fingerprint": self.fingerprint, "state": state})
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# Bytes before the stored offset that must be unchanged for a tail run to continue
+_TAIL_WINDOW = 64 << 10
+
+
+def _tail_digest(path: str, offset: int) -> str:
+    with open(path, "rb") as f:
+        f.seek(max(0, offset - _TAIL_WINDOW))
+        return hashlib.sha256(f.read(offset - f.tell())).hexdigest()
+
+
+class TailState(Checkpoint):
+    """State of an incremental run over an append-only file, kept between runs.
+
+    Holds the byte offset after the last processed record and the merged writer
+    state (statistics, profiles, counts, output sizes). It is only used again
+    with the same schema and output options, while the input still has the same
+    bytes before that offset and the published outputs are intact; otherwise
+    the next run starts from scratch.
+    """
+
+    def __init__(self, path: str, input_csv: str, schema: dict, options: dict | None = None):
+        fingerprint = {"input": os.path.abspath(input_csv), "schema_sha256": schema_hash(schema), "options": options or {}}
+        super().__init__(path, fingerprint)
+        self.input_csv = input_csv
+
+    def load(self) -> dict | None:
+        state = super().load()
+        if state is None or state.get("byte_offset") is None:
+            return None
+        offset = state["byte_offset"]
+        if os.path.getsize(self.input_csv) < offset or _tail_digest(self.input_csv, offset) != state["tail_sha256"]:
+            return None  # truncated, rotated or rewritten
+        for part, size in state["outputs"].items():
+            published = part[: -len(".part")]
+            if not os.path.exists(published) or os.path.getsize(published) < size:
+                return None
+        return state
+
+    def save(self, state: dict) -> None:
+        """Record a finished run; its outputs must already be published."""
+        for part in state.get("outputs", {}):
+            fsync_file(part[: -len(".part")])
+        state = dict(state, tail_sha256=_tail_digest(self.input_csv, state["byte_offset"]))
+        atomic_write_json(self.path, {"fingerprint": self.fingerprint, "state": state})
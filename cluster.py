@@ -0,0 +1,330 @@
+"""Sharded runs across machines: a coordinator hands out shards over a socket and
+worker processes (on any machine) process them.
+
+A shard is one byte range of an uncompressed CSV, or a whole compressed file.
+A worker asks the coordinator for a shard, processes it, writes its outputs as
+part files to a work directory on a filesystem the coordinator can read, replies
+with the shard's statistics (validation results, profile sketches, rule counts,
+timings) and asks for the next one. A shard whose worker reports an error,
+disconnects or holds it longer than lease_timeout seconds (a hung worker) is
+handed out again, up to max_attempts times in all; a late reply to an expired
+lease is ignored. Each attempt writes its part files to its own directory; a
+reply naming files outside it is rejected (ShardRejected) and counts as a failed
+attempt.
+requirement.run_sharded_pipeline splits the inputs and merges the replies.
+
+Protocol: one connection per worker carrying JSON lines, framed as in daemon.py.
+The worker sends {"type": "next"}, or {"type": "result", "reply": {...}} or
+{"type": "error", "error": "..."} for the shard it holds; the coordinator
+answers {"type": "shard", "shard": {...}, "job": {...}} or {"type": "stop"}; the
+shard carries its "attempt" number.
+Only the standard library is imported at module level.
+
+    python cluster.py coordinate 0.0.0.0:7700 data/2024-01/*.csv --workers 0
+    python cluster.py work coordinator-host:7700    # on each machine
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from daemon import _read_message, _server_class, parse_address
+
+
+class ShardRejected(Exception):
+    """Raised by on_result for a reply it cannot use: the shard counts as a failed attempt."""
+
+
+class ShardQueue:
+    """Shards waiting to be handed out, shards held by workers, and their outcomes.
+
+    on_result(shard, reply) is called for each completed shard, one call at a time;
+    it raises ShardRejected to fail the attempt instead.
+    A lease not completed or failed within lease_timeout seconds (None: never)
+    expires and counts as a failed attempt.
+    """
+
+    def __init__(self, shards: list[dict], on_result: Callable, max_attempts: int = 3, lease_timeout: float | None = None):
+        self.total = len(shards)
+        self.on_result = on_result
+        self.max_attempts = max_attempts
+        self.lease_timeout = lease_timeout
+        self.pending = deque(shards)
+        self.attempts = {}
+        self.leases = {}  # shard id -> (shard, attempt, deadline) of the lease in force
+        self.completed = 0
+        self.failed = {}  # shard id -> last error
+        self.per_worker = {}  # worker -> shards completed
+        self.connected = 0
+        self.error = None
+        self._cond = threading.Condition()
+        self._merge_lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.error is not None or self.completed + len(self.failed) == self.total
+
+    def lease(self) -> dict | None:
+        """The next shard, waiting while others are still held by workers; None once all are done."""
+        with self._cond:
+            self._expire()
+            while not self.pending and not self.finished:
+                self._cond.wait(self._until_expiry())
+                self._expire()
+            if self.finished:
+                return None
+            shard = self.pending.popleft()
+            attempt = self.attempts[shard["id"]] = self.attempts.get(shard["id"], 0) + 1
+            deadline = None if self.lease_timeout is None else time.monotonic() + self.lease_timeout
+            self.leases[shard["id"]] = (shard, attempt, deadline)
+            return {**shard, "attempt": attempt}
+
+    def complete(self, shard: dict, reply: dict, worker: str) -> None:
+        with self._cond:
+            leased = self._end_lease(shard)
+            if leased is None:
+                return  # the lease expired and the shard went to another worker
+        try:
+            with self._merge_lock:
+                self.on_result(shard, reply)
+        except ShardRejected as exc:
+            with self._cond:
+                self._retry(leased, f"{worker}: {exc}")
+            return
+        except Exception as exc:
+            with self._cond:
+                self.error = f"merging shard {shard['id']} ({shard['path']}): {type(exc).__name__}: {exc}"
+                self._cond.notify_all()
+            return
+        with self._cond:
+            self.completed += 1
+            self.per_worker[worker] = self.per_worker.get(worker, 0) + 1
+            self._cond.notify_all()
+
+    def fail(self, shard: dict, error: str) -> None:
+        with self._cond:
+            shard = self._end_lease(shard)
+            if shard is not None:
+                self._retry(shard, error)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        with self._cond:
+            self._expire()
+            return self._cond.wait_for(lambda: self.finished, timeout)
+
+    def _end_lease(self, leased: dict) -> dict | None:
+        """Remove the lease a worker's shard was handed out under; None if it is no longer in force."""
+        shard, attempt, _ = self.leases.get(leased["id"], (None, None, None))
+        if attempt != leased["attempt"]:
+            return None
+        del self.leases[leased["id"]]
+        return shard
+
+    def _retry(self, shard: dict, error: str) -> None:
+        if self.attempts[shard["id"]] >= self.max_attempts:
+            self.failed[shard["id"]] = error
+        else:
+            # Handed out next: later shards of its file cannot be merged before it
+            self.pending.appendleft(shard)
+        self._cond.notify_all()
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for shard_id, (shard, _, deadline) in list(self.leases.items()):
+            if deadline is not None and deadline <= now:
+                del self.leases[shard_id]
+                self._retry(shard, f"lease expired after {self.lease_timeout:g}s")
+
+    def _until_expiry(self) -> float | None:
+        deadlines = [deadline for _, _, deadline in self.leases.values() if deadline is not None]
+        return max(min(deadlines) - time.monotonic(), 0.0) if deadlines else None
+
+    def _connections(self, delta: int) -> None:
+        with self._cond:
+            self.connected += delta
+
+
+class _ShardHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        queue = self.server.queue
+        shard, worker = None, str(self.client_address)
+        queue._connections(1)
+        try:
+            while True:
+                message = _read_message(self.rfile)
+                worker = message.get("worker", worker)
+                if shard is not None:
+                    if message["type"] == "result":
+                        queue.complete(shard, message["reply"], worker)
+                    else:
+                        queue.fail(shard, f"{worker}: {message.get('error', 'unknown error')}")
+                    shard = None
+                shard = queue.lease()
+                reply = {"type": "stop"} if shard is None else {"type": "shard", "shard": shard, "job": self.server.job}
+                self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+                if shard is None:
+                    return
+        except (ConnectionError, OSError, ValueError):
+            pass  # the worker went away; its shard is handed out again below
+        finally:
+            if shard is not None:
+                queue.fail(shard, f"{worker} disconnected")
+            queue._connections(-1)
+
+
+def coordinate(
+    shards: list[dict],
+    job: dict,
+    on_result: Callable,
+    address: str = "127.0.0.1:0",
+    local_workers: int = 0,
+    max_attempts: int = 3,
+    lease_timeout: float | None = 600.0,
+) -> ShardQueue:
+    """Serve shards on address until every one is completed or has failed max_attempts times.
+
+    job (keyword arguments of requirement.process_shard) goes out with every shard.
+    local_workers worker processes are started on this machine; with port 0 a free
+    port is picked for them. A worker that holds a shard for lease_timeout seconds
+    is taken to be hung and the shard is handed out again. Raises if merging a
+    reply fails, or if all local workers have exited while no other worker is
+    connected.
+    """
+    queue = ShardQueue(shards, on_result, max_attempts, lease_timeout)
+    family, addr = parse_address(address)
+    if family == socket.AF_UNIX:
+        if os.path.exists(addr):
+            os.remove(addr)
+    with _server_class(family)(addr, _ShardHandler) as server:
+        server.queue = queue
+        server.job = job
+        if family == socket.AF_UNIX:
+            local_address = addr
+        else:
+            host, port = server.server_address[:2]
+            local_address = f"{'127.0.0.1' if host in ('0.0.0.0', '') else host}:{port}"
+        # Started before the server thread: workers connect to the listening socket and wait
+        processes = [
+            multiprocessing.Process(target=run_worker, args=(local_address, f"local-{i}"), daemon=True)
+            for i in range(min(local_workers, len(shards)))
+        ]
+        for process in processes:
+            process.start()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            while not queue.wait(1.0):
+                if processes and not any(p.is_alive() for p in processes) and not queue.connected:
+                    raise RuntimeError("all workers exited before every shard was processed")
+        finally:
+            server.shutdown()
+            for process in processes:
+                process.join(timeout=10)
+                if process.is_alive():
+                    process.terminate()
+            if family == socket.AF_UNIX and os.path.exists(addr):
+                os.remove(addr)
+    if queue.error:
+        raise RuntimeError(queue.error)
+    return queue
+
+
+def run_worker(address: str, name: str | None = None, connect_timeout: float = 30.0) -> int:
+    """Process shards from a coordinator until it has none left; returns how many were processed.
+
+    The coordinator may not be listening yet: connecting is retried for
+    connect_timeout seconds.
+    """
+    from requirement import process_shard
+
+    name = name or f"{socket.gethostname()}-{os.getpid()}"
+    family, addr = parse_address(address)
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.connect(addr)
+            break
+        except OSError:
+            sock.close()
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.2)
+    processed = 0
+    with sock, sock.makefile("rb") as sock_file:
+        message = {"type": "next", "worker": name}
+        while True:
+            sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+            reply = _read_message(sock_file)
+            if reply["type"] == "stop":
+                return processed
+            try:
+                message = {"type": "result", "worker": name, "reply": process_shard(reply["shard"], **reply["job"])}
+                processed += 1
+            except Exception as exc:
+                message = {"type": "error", "worker": name, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Sharded data quality runs across worker processes and machines")
+    commands = parser.add_subparsers(dest="command", required=True)
+    coordinator = commands.add_parser("coordinate", help="split the inputs into shards and merge the workers' results")
+    coordinator.add_argument("address", help="Unix socket path or host:port to listen on (0.0.0.0:PORT for other machines)")
+    coordinator.add_argument("inputs", nargs="+", help="CSV files (.gz/.zst files are one shard each)")
+    coordinator.add_argument("--schema", default=os.path.join("config", "schema.json"))
+    coordinator.add_argument("--output-dir", default="sharded")
+    coordinator.add_argument("--work-dir", help="shared directory for part files (default <output-dir>/.shards)")
+    coordinator.add_argument("--workers", type=int, default=2, help="worker processes to start on this machine")
+    coordinator.add_argument("--range-mb", type=int, default=64, help="approximate shard size in MiB")
+    coordinator.add_argument("--max-attempts", type=int, default=3)
+    coordinator.add_argument(
+        "--lease-timeout", type=float, default=600.0, help="seconds a worker may hold a shard before it is handed out again"
+    )
+    coordinator.add_argument("--repairs", action="store_true", help="write repairs.csv per file")
+    coordinator.add_argument("--profile-store", help="directory of profile snapshots for drift checks")
+    coordinator.add_argument("--run-store", help="SQLite file recording the history of runs")
+    worker = commands.add_parser("work", help="process shards from a coordinator until it has none left")
+    worker.add_argument("address")
+    worker.add_argument("--name", help="worker name in the coordinator's summary (default host-pid)")
+    worker.add_argument("--connect-timeout", type=float, default=30.0)
+    args = parser.parse_args(argv)
+
+    if args.command == "work":
+        processed = run_worker(args.address, args.name, args.connect_timeout)
+        print(f"✓ Processed {processed} shards")
+        return 0
+
+    from requirement import run_sharded_pipeline
+
+    outputs = run_sharded_pipeline(
+        args.inputs,
+        schema_path=args.schema,
+        output_dir=args.output_dir,
+        address=args.address,
+        local_workers=args.workers,
+        range_bytes=args.range_mb << 20,
+        work_dir=args.work_dir,
+        max_attempts=args.max_attempts,
+        lease_timeout=args.lease_timeout,
+        with_repairs=args.repairs,
+        profile_store=args.profile_store,
+        run_store=args.run_store,
+    )
+    print(f"✓ {outputs['shards']} shards, {outputs.get('total_rows', 0)} rows, {outputs.get('invalid_rows', 0)} invalid")
+    for worker_name, count in sorted(outputs["workers"].items()):
+        print(f"- {worker_name}: {count} shards")
+    if outputs.get("report_html"):
+        print(f"Report: {outputs['report_html']}")
+    for path in outputs["failed_files"]:
+        print(f"❌ {path}: {outputs['files'][path]['error']}")
+    return 1 if outputs["failed_files"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
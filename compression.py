@@ -0,0 +1,130 @@
+import gzip
+import io
+import queue
+import threading
+
+import pandas as pd
+
+# Codec names match pandas' `compression` argument
+CODEC_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise ImportError("zstd support needs the 'zstandard' package (pip install zstandard)") from exc
+    return zstandard
+
+
+def detect_codec(path: str) -> str | None:
+    for codec, suffix in CODEC_SUFFIXES.items():
+        if path.endswith(suffix):
+            return codec
+    return None
+
+
+def with_codec_suffix(path: str, codec: str | None) -> str:
+    if codec is None:
+        return path
+    if codec not in CODEC_SUFFIXES:
+        raise ValueError(f"unsupported output codec: {codec} (use one of {sorted(CODEC_SUFFIXES)})")
+    suffix = CODEC_SUFFIXES[codec]
+    return path if path.endswith(suffix) else path + suffix
+
+
+class _PrefetchReader(io.RawIOBase):
+    """Reads a decompressing stream on a background thread, `prefetch` blocks ahead.
+
+    zlib and zstd release the GIL, so decompression overlaps with CSV parsing.
+    """
+
+    def __init__(self, stream, block_size: int = 1 << 20, prefetch: int = 8):
+        self._stream = stream
+        self._queue: queue.Queue = queue.Queue(maxsize=prefetch)
+        self._stop = threading.Event()
+        self._block = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._fill, args=(block_size,), name="decompress", daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> None:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _fill(self, block_size: int) -> None:
+        try:
+            while not self._stop.is_set():
+                block = self._stream.read(block_size)
+                self._put(block)
+                if not block:
+                    return
+        except BaseException as exc:
+            self._put(exc)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self._block and not self._eof:
+            item = self._queue.get()
+            if isinstance(item, BaseException):
+                raise item
+            self._eof = not item
+            self._block = memoryview(item)
+        n = min(len(buffer), len(self._block))
+        buffer[:n] = self._block[:n]
+        self._block = self._block[n:]
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._stream.close()
+        super().close()
+
+
+def open_input(path: str, prefetch: int = 8):
+    """Open a CSV for reading; .gz/.zst inputs are decompressed on a background thread."""
+    codec = detect_codec(path)
+    if codec is None:
+        return open(path, "rb")
+    if codec == "gzip":
+        stream = gzip.open(path, "rb")
+    else:
+        stream = _zstd().ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return io.BufferedReader(_PrefetchReader(stream, prefetch=prefetch), buffer_size=1 << 20)
+
+
+def compress_bytes(data: bytes, codec: str, level: int | None = None) -> bytes:
+    """One gzip member / zstd frame; concatenated members still decode as one file."""
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=6 if level is None else level)
+    # threads=-1: zstd compresses on all cores
+    return _zstd().ZstdCompressor(level=3 if level is None else level, threads=-1).compress(data)
+
+
+def write_csv(
+    df: pd.DataFrame,
+    path: str,
+    append: bool,
+    codec: str | None = None,
+    level: int | None = None,
+    header: bool | None = None,
+) -> None:
+    """Write or append a chunk; compressed chunks are appended as independent members.
+
+    The header is written when not appending, unless `header` says otherwise.
+    """
+    header = not append if header is None else header
+    if codec is None:
+        df.to_csv(path, mode="a" if append else "w", header=header, index=False)
+        return
+    data = df.to_csv(index=False, header=header).encode("utf-8")
+    with open(path, "ab" if append else "wb") as f:
+        f.write(compress_bytes(data, codec, level))
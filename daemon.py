@@ -0,0 +1,99 @@
+"""Persistent pipeline worker: keeps pandas and the pipeline imported and accepts jobs
+over a local socket, so short validation jobs skip interpreter and import startup.
+
+Protocol: one JSON object per connection, newline terminated. A request carries
+run_pipeline keyword arguments; the reply is {"ok": true, "outputs": {...}} or
+{"ok": false, "error": "..."}. Only the standard library is imported at module
+level, so a client submitting a job stays fast."""
+import json
+import os
+import socket
+import socketserver
+
+
+def parse_address(address: str):
+    """'host:port' means TCP on that address; anything else is a Unix socket path."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and os.sep not in host:
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    return socket.AF_UNIX, address
+
+
+def _read_message(sock_file) -> dict:
+    line = sock_file.readline()
+    if not line:
+        raise ConnectionError("connection closed before a message was received")
+    return json.loads(line)
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    # Handler threads do not keep the process alive (set here, not on the stdlib class)
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+
+def _server_class(family: int) -> type:
+    """The threading server class for a parse_address() family."""
+    return _UnixServer if family == socket.AF_UNIX else _TCPServer
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            job = _read_message(self.rfile)
+            outputs = self.server.run_job(**job)
+            reply = {"ok": True, "outputs": outputs}
+        except Exception as exc:
+            if self.server.metrics is not None:
+                self.server.metrics.observe_failure()
+            reply = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        self.wfile.write(json.dumps(reply, default=str).encode("utf-8") + b"\n")
+
+
+def serve(address: str, metrics_port: int | None = None) -> None:
+    """Run the worker until interrupted; the heavy imports happen once, here.
+
+    With metrics_port, metrics of all jobs are served at http://127.0.0.1:<port>/metrics.
+    """
+    from functools import partial
+
+    from metrics import PipelineMetrics
+    from requirement import run_pipeline
+
+    metrics = None
+    if metrics_port is not None:
+        metrics = PipelineMetrics()
+        metrics.serve(metrics_port)
+
+    family, addr = parse_address(address)
+    if family == socket.AF_UNIX:
+        if os.path.exists(addr):
+            os.remove(addr)
+    with _server_class(family)(addr, _JobHandler) as server:
+        server.run_job = partial(run_pipeline, metrics=metrics) if metrics else run_pipeline
+        server.metrics = metrics
+        print(f"✓ Pipeline worker listening on {address}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if family == socket.AF_UNIX and os.path.exists(addr):
+                os.remove(addr)
+
+
+def submit(address: str, job: dict, timeout: float | None = None) -> dict:
+    """Send one job to a running worker and return its outputs (raises on failure)."""
+    family, addr = parse_address(address)
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(addr)
+        sock.sendall(json.dumps(job).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as sock_file:
+            reply = _read_message(sock_file)
+    if not reply["ok"]:
+        raise RuntimeError(reply["error"])
+    return reply["outputs"]
@@ -0,0 +1,146 @@
+import json
+import math
+import os
+from datetime import datetime
+
+import numpy as np
+
+from profiler import merge_profiles, profiles_from_dict, profiles_to_dict
+
+DEFAULT_DRIFT = {
+    "baseline_runs": 7,
+    "psi_threshold": 0.2,
+    "ks_threshold": 0.1,
+    "null_ratio_threshold": 0.05,
+}
+
+_EPS = 1e-6
+
+
+def feed_name(input_csv: str) -> str:
+    """Snapshots are grouped per feed, keyed by the input file's stem."""
+    return os.path.basename(input_csv).split(".")[0]
+
+
+def save_profile_snapshot(store_dir: str, feed: str, profiles: dict, total_rows: int) -> str:
+    """Persist the run's column profiles as a compact JSON snapshot."""
+    run_at = datetime.now()
+    feed_dir = os.path.join(store_dir, feed)
+    os.makedirs(feed_dir, exist_ok=True)
+    path = os.path.join(feed_dir, f"{run_at.strftime('%Y%m%dT%H%M%S%f')}.json")
+    snapshot = {
+        "feed": feed,
+        "created": run_at.isoformat(timespec="seconds"),
+        "total_rows": total_rows,
+        "profiles": profiles_to_dict(profiles),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    return path
+
+
+def load_baseline(store_dir: str, feed: str, runs: int = DEFAULT_DRIFT["baseline_runs"]) -> dict | None:
+    """Merge the profiles of the last `runs` snapshots into one rolling baseline."""
+    feed_dir = os.path.join(store_dir, feed)
+    if not os.path.isdir(feed_dir):
+        return None
+    names = sorted(name for name in os.listdir(feed_dir) if name.endswith(".json"))[-runs:]
+    baseline = None
+    for name in names:
+        with open(os.path.join(feed_dir, name), "r", encoding="utf-8") as f:
+            baseline = merge_profiles(baseline, profiles_from_dict(json.load(f)["profiles"]))
+    return baseline
+
+
+def _psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    expected = np.clip(expected, _EPS, None)
+    actual = np.clip(actual, _EPS, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def _numeric_drift(current, baseline) -> dict:
+    """PSI over baseline deciles and KS distance, both read off the KLL sketches."""
+    edges = np.unique(baseline.quantiles.quantiles(np.linspace(0.1, 0.9, 9)))
+    expected = np.diff(np.concatenate([[0.0], baseline.quantiles.cdf(edges), [1.0]]))
+    actual = np.diff(np.concatenate([[0.0], current.quantiles.cdf(edges), [1.0]]))
+    points = np.unique(np.concatenate([baseline.quantiles.items(), current.quantiles.items()]))
+    ks = np.max(np.abs(baseline.quantiles.cdf(points) - current.quantiles.cdf(points))) if points.size else 0.0
+    return {"psi": _psi(expected, actual), "ks": float(ks)}
+
+
+def _categorical_drift(current, baseline) -> dict:
+    """PSI over the union of heavy hitters, with everything else in one 'other' bucket."""
+    base_n = max(baseline.count - baseline.null_count, 1)
+    cur_n = max(current.count - current.null_count, 1)
+    keys = baseline.top.counts.index.union(current.top.counts.index)
+    expected = baseline.top.counts.reindex(keys, fill_value=0).to_numpy(dtype=np.float64) / base_n
+    actual = current.top.counts.reindex(keys, fill_value=0).to_numpy(dtype=np.float64) / cur_n
+    expected = np.append(expected, max(1.0 - expected.sum(), 0.0))
+    actual = np.append(actual, max(1.0 - actual.sum(), 0.0))
+    return {"psi": _psi(expected, actual)}
+
+
+def _drift_settings(schema: dict, spec: dict) -> dict | None:
+    column_drift = spec.get("drift", {})
+    if column_drift is False:
+        return None
+    return {**DEFAULT_DRIFT, **schema.get("drift", {}), **(column_drift or {})}
+
+
+def detect_drift(current: dict, baseline: dict, schema: dict) -> list[dict]:
+    """Compare current profiles with a baseline; cost is O(sketch size) per column."""
+    columns = schema.get("columns", {})
+    results = []
+    for col, profile in current.items():
+        if col not in baseline or col not in columns:
+            continue
+        settings = _drift_settings(schema, columns[col])
+        if settings is None:
+            continue
+        base = baseline[col]
+
+        base_ratio = base.null_count / base.count if base.count else 0.0
+        cur_ratio = profile.null_count / profile.count if profile.count else 0.0
+        null_ok = abs(cur_ratio - base_ratio) <= settings["null_ratio_threshold"]
+        results.append({
+            "expectation_type": "expect_column_null_ratio_to_not_drift",
+            "success": null_ok,
+            "column": col,
+            "baseline_null_ratio": round(base_ratio, 6),
+            "observed_null_ratio": round(cur_ratio, 6),
+        })
+
+        if profile.quantiles is not None and base.quantiles is not None:
+            if not (profile.quantiles.n and base.quantiles.n):
+                continue
+            stats = _numeric_drift(profile, base)
+        else:
+            stats = _categorical_drift(profile, base)
+        dist_ok = stats["psi"] <= settings["psi_threshold"]
+        if "ks" in stats:
+            dist_ok = dist_ok and stats["ks"] <= settings["ks_threshold"]
+        entry = {
+            "expectation_type": "expect_column_distribution_to_not_drift",
+            "success": dist_ok,
+            "column": col,
+        }
+        entry.update({key: round(value, 6) for key, value in stats.items() if not math.isnan(value)})
+        summary, base_summary = profile.summary(qs=()), base.summary(qs=())
+        entry["baseline_range"] = [base_summary["min"], base_summary["max"]]
+        entry["observed_range"] = [summary["min"], summary["max"]]
+        results.append(entry)
+    return results
+
+
+def add_drift_results(ge_result: dict, drift_results: list[dict]) -> dict:
+    """Append drift expectations to a validate_data result and update its statistics."""
+    stats = ge_result["statistics"]
+    for entry in drift_results:
+        stats["evaluated_expectations"] += 1
+        if entry["success"]:
+            stats["successful_expectations"] += 1
+        else:
+            stats["unsuccessful_expectations"] += 1
+            ge_result["success"] = False
+        ge_result["results"].append(entry)
+    return ge_result
@@ -0,0 +1,220 @@
+"""Asyncio ingestion front end: watch a directory and/or accept local HTTP submissions,
+and run the pipeline for each file on a bounded pool of worker processes."""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+from metrics import CONTENT_TYPE, PipelineMetrics
+from requirement import run_pipeline
+
+CSV_SUFFIXES = (".csv", ".csv.gz", ".csv.zst")
+
+
+def job_name(path: str, taken) -> str:
+    """Output directory name for a file: its name without the CSV suffix, made unique among `taken`.
+
+    a.csv, a.csv.gz and a.v2.csv become "a", "a-2" (while "a" is taken) and "a.v2".
+    """
+    name = os.path.basename(path)
+    for suffix in CSV_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+            break
+    unique, n = name, 1
+    while unique in taken:
+        n += 1
+        unique = f"{name}-{n}"
+    return unique
+
+
+def _run_job(path: str, job_dir: str, pipeline_kwargs: dict) -> dict:
+    """Executed in a worker process: run the whole pipeline for one file, writing to job_dir.
+
+    The run's metrics come back as a snapshot under "metrics" for the service to merge.
+    """
+    os.makedirs(job_dir, exist_ok=True)
+    metrics = PipelineMetrics()
+    outputs = run_pipeline(
+        input_csv=path,
+        standardized_csv=os.path.join(job_dir, "standardized.csv"),
+        invalid_csv=os.path.join(job_dir, "invalid_rows.csv"),
+        report_html=os.path.join(job_dir, "report.html"),
+        metrics=metrics,
+        **pipeline_kwargs,
+    )
+    outputs["metrics"] = metrics.to_dict()
+    return outputs
+
+
+class IngestService:
+    """Producers (directory watcher, HTTP endpoint) feed a bounded queue; consumers
+    hand files to a process pool, so reads/writes of one file overlap with the
+    standardization of others and a burst can never queue more than queue_size files."""
+
+    def __init__(
+        self,
+        output_dir: str = "processed",
+        workers: int = 2,
+        queue_size: int = 8,
+        pipeline_kwargs: dict | None = None,
+    ):
+        self.output_dir = output_dir
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.pipeline_kwargs = pipeline_kwargs or {}
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.in_flight: set[str] = set()
+        # Output directory names of the jobs running now, so concurrent jobs never share one
+        self.job_names: set[str] = set()
+        self.metrics = PipelineMetrics()
+        self.completed = 0
+        self.failed = 0
+
+    async def submit(self, path: str) -> None:
+        """Enqueue a file, waiting while the queue is full (backpressure)."""
+        self.in_flight.add(path)
+        await self.queue.put(path)
+
+    def try_submit(self, path: str) -> bool:
+        if self.queue.full():
+            return False
+        self.in_flight.add(path)
+        self.queue.put_nowait(path)
+        return True
+
+    async def _consume(self, done_dir: str | None) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            path = await self.queue.get()
+            name = job_name(path, self.job_names)
+            self.job_names.add(name)
+            try:
+                job_dir = os.path.join(self.output_dir, name)
+                outputs = await loop.run_in_executor(self.executor, _run_job, path, job_dir, self.pipeline_kwargs)
+                self.metrics.merge(outputs["metrics"])
+                self.completed += 1
+                outcome = "done"
+            except Exception as exc:
+                self.metrics.observe_failure()
+                self.failed += 1
+                outcome = "failed"
+                print(f"❌ {path}: {exc}")
+            finally:
+                self.job_names.discard(name)
+                self.queue.task_done()
+            # Only files picked up from the watched directory are moved out of it
+            if done_dir and os.path.dirname(os.path.abspath(path)) == os.path.abspath(done_dir):
+                target = os.path.join(done_dir, outcome)
+                os.makedirs(target, exist_ok=True)
+                await asyncio.to_thread(shutil.move, path, os.path.join(target, os.path.basename(path)))
+            self.in_flight.discard(path)
+
+    async def watch(self, input_dir: str, poll_interval: float = 1.0) -> None:
+        """Poll input_dir; a file is picked up once its size is stable across two polls."""
+        sizes: dict[str, int] = {}
+        while True:
+            entries = await asyncio.to_thread(lambda: list(os.scandir(input_dir)))
+            for entry in entries:
+                if not entry.is_file() or not entry.name.endswith(CSV_SUFFIXES) or entry.path in self.in_flight:
+                    continue
+                size = entry.stat().st_size
+                if sizes.get(entry.path) == size:
+                    del sizes[entry.path]
+                    await self.submit(entry.path)
+                else:
+                    sizes[entry.path] = size
+            await asyncio.sleep(poll_interval)
+
+    async def _handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        status, body = 400, {"error": "bad request"}
+        content_type = "application/json"
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while (line := (await reader.readline()).decode("latin-1").strip()):
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+            payload = await reader.readexactly(int(headers.get("content-length", 0)))
+            method, route = request_line[0], request_line[1]
+            if method == "GET" and route == "/status":
+                status, body = 200, {
+                    "queued": self.queue.qsize(),
+                    "in_flight": len(self.in_flight),
+                    "completed": self.completed,
+                    "failed": self.failed,
+                }
+            elif method == "GET" and route == "/metrics":
+                status, body, content_type = 200, self.metrics.render(), CONTENT_TYPE
+            elif method == "POST" and route == "/submit":
+                path = json.loads(payload or b"{}").get("path", "")
+                if not os.path.isfile(path):
+                    status, body = 404, {"error": f"file not found: {path}"}
+                elif self.try_submit(path):
+                    status, body = 202, {"accepted": path}
+                else:
+                    status, body = 503, {"error": "queue full, retry later"}
+            else:
+                status, body = 404, {"error": "unknown route"}
+        except (ValueError, IndexError, asyncio.IncompleteReadError):
+            pass
+        data = body.encode("utf-8") if isinstance(body, str) else json.dumps(body).encode("utf-8")
+        reasons = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}
+        writer.write(
+            f"HTTP/1.1 {status} {reasons[status]}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode("latin-1") + data
+        )
+        await writer.drain()
+        writer.close()
+
+    async def serve(
+        self,
+        input_dir: str | None = None,
+        host: str = "127.0.0.1",
+        port: int | None = None,
+        poll_interval: float = 1.0,
+    ) -> None:
+        tasks = [asyncio.create_task(self._consume(input_dir)) for _ in range(self.workers)]
+        if input_dir:
+            tasks.append(asyncio.create_task(self.watch(input_dir, poll_interval)))
+        server = await asyncio.start_server(self._handle_http, host, port) if port is not None else None
+        try:
+            if server:
+                async with server:
+                    await asyncio.gather(server.serve_forever(), *tasks)
+            else:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.executor.shutdown(cancel_futures=True)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Data quality ingestion service")
+    parser.add_argument("--input-dir", help="directory to watch for incoming CSV files")
+    parser.add_argument("--output-dir", default="processed", help="where per-file outputs are written")
+    parser.add_argument("--port", type=int, help="serve POST /submit, GET /status and GET /metrics on this local port")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue-size", type=int, default=8)
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--schema", default=os.path.join("config", "schema.json"))
+    parser.add_argument("--chunksize", type=int)
+    parser.add_argument("--run-store", help="SQLite file recording the history of runs")
+    args = parser.parse_args(argv)
+    if not args.input_dir and args.port is None:
+        parser.error("give --input-dir and/or --port")
+
+    service = IngestService(
+        output_dir=args.output_dir,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        pipeline_kwargs={"schema_path": args.schema, "chunksize": args.chunksize, "run_store": args.run_store},
+    )
+    asyncio.run(service.serve(args.input_dir, port=args.port, poll_interval=args.poll_interval))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,322 +1,209 @@
-import json
-import os
-from datetime import datetime
-
-import pandas as pd
-
-from standardizer import standardize_data
-from validator import validate_data
-
-# Load schema
-with open("config/schema.json", "r", encoding="utf-8") as f:
-    schema = json.load(f)
-
-# Get CSV filename from user
-print("=" * 60)
-print("   DATA QUALITY FRAMEWORK")
-print("=" * 60)
-filename = input("\nEnter CSV file name (inside data folder): ").strip()
-
-# Add .csv extension if not provided
-if not filename.endswith('.csv'):
-    filename += '.csv'
-
-# Construct full path
-csv_path = os.path.join("data", filename)
-
-# Check if file exists
-if not os.path.exists(csv_path):
-    print(f"\n❌ Error: File '{csv_path}' not found!")
-    print(f"   Available files in data folder:")
-    if os.path.exists("data"):
-        for file in os.listdir("data"):
-            if file.endswith('.csv'):
-                print(f"   - {file}")
-    exit(1)
-
-print(f"\n✓ Loading: {csv_path}")
-
-# Load data
-df = pd.read_csv(csv_path)
-
-# Standardize data (now requires schema)
-df_standardized = standardize_data(df, schema)
+"""Command line entry point.
 
-# Validate data (now requires schema, returns GE validation result dict)
-validation_results = validate_data(df_standardized, schema)
+    python main.py rawdata.csv                      # run the pipeline once
+    python main.py --serve /tmp/dq.sock             # keep a warm worker running
+    python main.py rawdata.csv --daemon /tmp/dq.sock  # hand the job to that worker
 
-# Flag invalid records based on schema
-def flag_invalid_rows(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
-    """Add columns 'is_valid' and 'errors' based on schema checks."""
-    columns = schema.get("columns", {})
-    errors = [[] for _ in range(len(df))]
-    is_valid = [True] * len(df)
-
-    for col, spec in columns.items():
-        if col not in df.columns:
-            for i in range(len(df)):
-                errors[i].append(f"missing column: {col}")
-                is_valid[i] = False
-            continue
-        series = df[col]
-        # Required
-        if spec.get("required"):
-            nulls = series.isna()
-            for i, is_null in enumerate(nulls.tolist()):
-                if is_null:
-                    errors[i].append(f"{col} is required")
-                    is_valid[i] = False
-        # Type-specific checks
-        t = spec.get("type")
-        if t == "date":
-            bad = series.isna()
-            for i, b in enumerate(bad.tolist()):
-                if b and spec.get("required"):
-                    errors[i].append(f"{col} invalid date")
-                    is_valid[i] = False
-        elif t in {"int", "float"}:
-            # min/max constraints
-            if "min" in spec:
-                bad = series < spec["min"]
-                for i, b in enumerate(bad.fillna(False).tolist()):
-                    if b:
-                        errors[i].append(f"{col} below min {spec['min']}")
-                        is_valid[i] = False
-            if "max" in spec:
-                bad = series > spec["max"]
-                for i, b in enumerate(bad.fillna(False).tolist()):
-                    if b:
-                        errors[i].append(f"{col} above max {spec['max']}")
-                        is_valid[i] = False
-
-    flagged = df.copy()
-    flagged["is_valid"] = pd.Series(is_valid, dtype=bool)
-    flagged["errors"] = pd.Series(["; ".join(err) if err else "" for err in errors], dtype=object)
-    return flagged
-
-df_flagged = flag_invalid_rows(df_standardized, schema)
-
-# Save cleaned data
-df_standardized.to_csv("data/cleaned_data.csv", index=False)
-
-# Generate HTML report
-total = len(df_flagged)
-invalid = (~df_flagged["is_valid"]).sum()
-valid = total - invalid
-timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-# GE summary
-ge_stats = validation_results.get("statistics", {})
-ge_success = ge_stats.get("successful_expectations", 0)
-ge_total = ge_stats.get("evaluated_expectations", 0)
-
-invalid_rows_html = df_flagged.loc[~df_flagged["is_valid"]]
-invalid_table = invalid_rows_html.to_html(index=False, escape=False)
-
-html = f"""
-<!DOCTYPE html>
-<html lang="en">
-  <head>
-    <meta charset='utf-8'>
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Data Quality Report</title>
-    <style>
-      * {{
-        margin: 0;
-        padding: 0;
-        box-sizing: border-box;
-      }}
-      
-      body {{
-        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 20px;
-        min-height: 100vh;
-      }}
-      
-      .container {{
-        max-width: 1200px;
-        margin: 0 auto;
-        background: white;
-        border-radius: 16px;
-        box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-        padding: 40px;
-      }}
-      
-      h1 {{
-        color: #2d3748;
-        font-size: 2.5em;
-        margin-bottom: 10px;
-        border-bottom: 4px solid #667eea;
-        padding-bottom: 15px;
-      }}
-      
-      .meta {{
-        color: #718096;
-        font-size: 0.95em;
-        margin-bottom: 30px;
-        padding: 10px;
-        background: #f7fafc;
-        border-left: 4px solid #667eea;
-        border-radius: 4px;
-      }}
-      
-      .cards {{
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-        gap: 20px;
-        margin-bottom: 40px;
-      }}
-      
-      .card {{
-        padding: 25px;
-        border-radius: 12px;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
-        transition: transform 0.3s ease, box-shadow 0.3s ease;
-      }}
-      
-      .card:hover {{
-        transform: translateY(-5px);
-        box-shadow: 0 8px 25px rgba(102, 126, 234, 0.6);
-      }}
-      
-      .card-label {{
-        font-size: 0.85em;
-        opacity: 0.9;
-        margin-bottom: 8px;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-      }}
-      
-      .card-value {{
-        font-size: 2.2em;
-        font-weight: bold;
-      }}
-      
-      h2 {{
-        color: #2d3748;
-        font-size: 1.8em;
-        margin: 30px 0 20px 0;
-        padding-bottom: 10px;
-        border-bottom: 2px solid #e2e8f0;
-      }}
-      
-      table {{
-        border-collapse: collapse;
-        width: 100%;
-        margin-top: 20px;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        border-radius: 8px;
-        overflow: hidden;
-      }}
-      
-      th {{
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 15px;
-        text-align: left;
-        font-weight: 600;
-        text-transform: uppercase;
-        font-size: 0.85em;
-        letter-spacing: 0.5px;
-      }}
-      
-      td {{
-        padding: 12px 15px;
-        border-bottom: 1px solid #e2e8f0;
-        color: #4a5568;
-      }}
-      
-      tr:hover {{
-        background: #f7fafc;
-      }}
-      
-      tr:last-child td {{
-        border-bottom: none;
-      }}
-      
-      .error-cell {{
-        color: #e53e3e;
-        font-weight: 500;
-      }}
-      
-      @media (max-width: 768px) {{
-        .container {{
-          padding: 20px;
-        }}
-        
-        h1 {{
-          font-size: 1.8em;
-        }}
-        
-        .cards {{
-          grid-template-columns: 1fr;
-        }}
-        
-        table {{
-          font-size: 0.85em;
-        }}
-        
-        th, td {{
-          padding: 8px;
-        }}
-      }}
-      
-      .footer {{
-        margin-top: 40px;
-        text-align: center;
-        color: #a0aec0;
-        font-size: 0.85em;
-        padding-top: 20px;
-        border-top: 1px solid #e2e8f0;
-      }}
-    </style>
-  </head>
-  <body>
-    <div class="container">
-      <h1>📊 Data Quality Report</h1>
-      <div class="meta">
-        <strong>Source:</strong> {csv_path} | <strong>Generated:</strong> {timestamp}
-      </div>
-      
-      <div class="cards">
-        <div class="card">
-          <div class="card-label">Total Rows</div>
-          <div class="card-value">{total}</div>
-        </div>
-        <div class="card">
-          <div class="card-label">Valid Rows</div>
-          <div class="card-value">{valid}</div>
-        </div>
-        <div class="card">
-          <div class="card-label">Invalid Rows</div>
-          <div class="card-value">{invalid}</div>
-        </div>
-        <div class="card">
-          <div class="card-label">Expectations</div>
-          <div class="card-value">{ge_success}/{ge_total}</div>
-        </div>
-      </div>
-      
-      <h2>❌ Invalid Records</h2>
-      {invalid_table}
-      
-      <div class="footer">
-        Generated by Data Quality Framework | Python & Pandas
-      </div>
-    </div>
-  </body>
-</html>
+pandas and the pipeline are only imported when a job actually runs in this
+process, so `--help` and `--daemon` submissions start in milliseconds.
 """
-
-os.makedirs("reports", exist_ok=True)
-with open("reports/data_quality_report.html", "w", encoding="utf-8") as f:
-    f.write(html)
-
-print("✅ Data Quality Pipeline Executed Successfully")
-print(f"   Source: {csv_path}")
-print(f"   Total: {total} | Valid: {valid} | Invalid: {invalid}")
-print(f"   Report: reports/data_quality_report.html")
-print("\n" + "=" * 60)
\ No newline at end of file
+import argparse
+import os
+import sys
+
+
+def resolve_input(name: str) -> str | None:
+    """Accept a path, or a file name inside the data folder (.csv optional)."""
+    candidates = [name, os.path.join("data", name)]
+    if not os.path.splitext(name)[1]:
+        candidates += [name + ".csv", os.path.join("data", name + ".csv")]
+    for path in candidates:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _chunksize(text: str):
+    if text == "auto":
+        return text
+    try:
+        return int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected a row count or 'auto'") from None
+
+
+_SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def _byte_size(text: str) -> int:
+    """A byte count such as 512M or 2G."""
+    number, unit = text, ""
+    if text[-1:].isalpha():
+        number, unit = text[:-1], text[-1].upper()
+    try:
+        return int(float(number) * _SIZE_UNITS[unit])
+    except (KeyError, ValueError):
+        raise argparse.ArgumentTypeError(f"invalid size '{text}' (use e.g. 512M or 2G)") from None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Data Quality Framework")
+    parser.add_argument("input", nargs="?", help="CSV file (a path, or a name inside the data folder)")
+    parser.add_argument("--schema", default=os.path.join("config", "schema.json"))
+    parser.add_argument("--standardized", default=os.path.join("data", "cleaned_data.csv"), help="standardized output CSV")
+    parser.add_argument("--invalid", default=os.path.join("data", "invalid_rows.csv"), help="invalid rows output CSV")
+    parser.add_argument("--report", default=os.path.join("reports", "data_quality_report.html"), help="HTML report")
+    parser.add_argument("--repairs", help="CSV log of repaired and quarantined values")
+    parser.add_argument(
+        "--chunksize", type=_chunksize,
+        help="stream the input in chunks of this many rows, or 'auto' to size them from --memory-budget",
+    )
+    parser.add_argument(
+        "--memory-budget", type=_byte_size,
+        help="memory for in-flight chunks with --chunksize auto, e.g. 2G (default: half of available memory)",
+    )
+    parser.add_argument("--reader", choices=["pandas", "mmap"], default="pandas")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--pipelined", action="store_true", help="overlap read / compute / write stages")
+    parser.add_argument("--output-codec", choices=["gzip", "zstd"])
+    parser.add_argument("--profile-store", help="directory of profile snapshots for drift checks")
+    parser.add_argument(
+        "--feed", help="name the drift baseline is kept under (default: the input's file stem, e.g. for dated file names)"
+    )
+    parser.add_argument("--checkpoint", help="checkpoint file making chunked runs resumable")
+    parser.add_argument(
+        "--incremental", metavar="STATE",
+        help="state file for an append-only input: only rows appended since the last run are validated",
+    )
+    parser.add_argument(
+        "--route", action="append", metavar="VALUE=SCHEMA",
+        help="route rows whose --route-column equals VALUE to SCHEMA (repeatable; outputs go to --output-dir)",
+    )
+    parser.add_argument("--route-column", default="record_type")
+    parser.add_argument("--output-dir", default=os.path.join("data", "routed"), help="per-route outputs with --route")
+    parser.add_argument("--run-store", help="SQLite file recording the history of runs")
+    parser.add_argument("--metrics-file", help="write OpenMetrics output here after the run (textfile collector)")
+    parser.add_argument("--serve", metavar="ADDRESS", help="run a persistent worker on a socket path or host:port")
+    parser.add_argument("--metrics-port", type=int, help="with --serve, expose GET /metrics on this local port")
+    parser.add_argument("--daemon", metavar="ADDRESS", help="submit the job to a worker started with --serve")
+    return parser
+
+
+def _job(args: argparse.Namespace, input_csv: str) -> dict:
+    return {
+        "input_csv": os.path.abspath(input_csv),
+        "schema_path": os.path.abspath(args.schema),
+        "standardized_csv": os.path.abspath(args.standardized),
+        "invalid_csv": os.path.abspath(args.invalid),
+        "report_html": os.path.abspath(args.report),
+        "repairs_csv": args.repairs and os.path.abspath(args.repairs),
+        "chunksize": args.chunksize,
+        "memory_budget": args.memory_budget,
+        "reader": args.reader,
+        "workers": args.workers,
+        "pipelined": args.pipelined,
+        "output_codec": args.output_codec,
+        "profile_store": args.profile_store and os.path.abspath(args.profile_store),
+        "feed": args.feed,
+        "checkpoint_path": args.checkpoint and os.path.abspath(args.checkpoint),
+        "incremental_state": args.incremental and os.path.abspath(args.incremental),
+        "metrics_textfile": args.metrics_file and os.path.abspath(args.metrics_file),
+        "run_store": args.run_store and os.path.abspath(args.run_store),
+    }
+
+
+def _parse_routes(parser: argparse.ArgumentParser, routes: list[str]) -> dict[str, str]:
+    schema_paths = {}
+    for route in routes:
+        value, sep, schema = route.partition("=")
+        if not sep or not value or not schema:
+            parser.error(f"--route expects VALUE=SCHEMA, got '{route}'")
+        schema_paths[value] = os.path.abspath(schema)
+    return schema_paths
+
+
+def _run_routed(args: argparse.Namespace, parser: argparse.ArgumentParser, csv_path: str) -> int:
+    from requirement import run_routed_pipeline
+
+    outputs = run_routed_pipeline(
+        os.path.abspath(csv_path),
+        _parse_routes(parser, args.route),
+        route_column=args.route_column,
+        output_dir=args.output_dir,
+        chunksize=args.chunksize,
+        memory_budget=args.memory_budget,
+        profile_store=args.profile_store and os.path.abspath(args.profile_store),
+        feed=args.feed,
+        pipelined=args.pipelined,
+        workers=args.workers,
+        output_codec=args.output_codec,
+        run_store=args.run_store and os.path.abspath(args.run_store),
+    )
+    print("✅ Data Quality Pipeline Executed Successfully")
+    print(f"   Source: {csv_path} | Total: {outputs['total_rows']} | Unrouted: {outputs['unrouted_rows']}")
+    for route, route_outputs in outputs["routes"].items():
+        total, invalid = route_outputs["total_rows"], route_outputs["invalid_rows"]
+        print(f"   [{route}] Total: {total} | Valid: {total - invalid} | Invalid: {invalid} | Report: {route_outputs['report_html']}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        from daemon import serve
+
+        serve(args.serve, metrics_port=args.metrics_port)
+        return 0
+    if not args.input:
+        parser.error("an input CSV is required (or use --serve)")
+
+    csv_path = resolve_input(args.input)
+    if csv_path is None:
+        print(f"❌ Error: File '{args.input}' not found!", file=sys.stderr)
+        if os.path.isdir("data"):
+            print("   Available files in data folder:", file=sys.stderr)
+            for file in sorted(os.listdir("data")):
+                if file.endswith(".csv"):
+                    print(f"   - {file}", file=sys.stderr)
+        return 1
+
+    if args.route:
+        if args.daemon:
+            parser.error("--route runs locally; it cannot be combined with --daemon")
+        return _run_routed(args, parser, csv_path)
+
+    job = _job(args, csv_path)
+    if args.daemon:
+        from daemon import submit
+
+        outputs = submit(args.daemon, job)
+    else:
+        from requirement import run_pipeline
+
+        outputs = run_pipeline(**job)
+
+    stats = outputs.get("ge_result_summary", {})
+    print("✅ Data Quality Pipeline Executed Successfully")
+    print(f"   Source: {csv_path}")
+    total, invalid = outputs["total_rows"], outputs["invalid_rows"]
+    print(f"   Total: {total} | Valid: {total - invalid} | Invalid: {invalid}")
+    if "chunking" in outputs:
+        chunking = outputs["chunking"]
+        rows, headroom = chunking["chunk_rows"], chunking["min_headroom_bytes"]
+        print(f"   Chunks: {chunking['chunks']} of {rows['min']}-{rows['max']} rows", end="")
+        print(f" | Min. memory headroom: {headroom >> 20} MiB" if headroom is not None else "")
+    if "new_rows" in outputs:
+        print(f"   New rows this run: {outputs['new_rows']}")
+    print(f"   Expectations: {stats.get('successful_expectations', 0)}/{stats.get('evaluated_expectations', 0)} passed")
+    print(f"   Cleaned data: {outputs['standardized_csv']}")
+    print(f"   Invalid rows: {outputs['invalid_csv']}")
+    if outputs.get("repairs_csv"):
+        print(f"   Repairs: {outputs['repairs_csv']}")
+    print(f"   Report: {outputs['report_html']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""Pipeline metrics in the OpenMetrics text format.
+
+The writer updates counters and histograms once per chunk (never per row) under a
+single lock. The registry can be scraped over HTTP (GET /metrics) or written as a
+file for node_exporter's textfile collector. Only the standard library is used."""
+import bisect
+import http.server
+import os
+import threading
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+# name -> (type, help); counters are exposed with a _total suffix
+METRICS = {
+    "dq_rows": ("counter", "Rows processed."),
+    "dq_invalid_rows": ("counter", "Rows that failed at least one rule."),
+    "dq_chunks": ("counter", "Chunks (or byte ranges) committed."),
+    "dq_rule_failures": ("counter", "Rows failing each schema rule."),
+    "dq_repairs": ("counter", "Values repaired or quarantined, by action."),
+    "dq_runs": ("counter", "Pipeline runs, by outcome."),
+    "dq_stage_seconds": ("histogram", "Per-chunk latency of each pipeline stage."),
+    "dq_chunk_seconds": ("histogram", "Per-chunk processing plus write latency."),
+    "dq_rule_seconds": ("histogram", "Per-chunk latency of each custom rule."),
+    "dq_run_seconds": ("histogram", "Wall time of whole pipeline runs."),
+    "dq_last_run_rows_per_second": ("gauge", "Throughput of the most recent run."),
+    "dq_last_run_expectations": ("gauge", "Expectations of the most recent run, by result."),
+    "dq_chunk_rows": ("gauge", "Rows in the most recent chunk (adaptive chunk sizing)."),
+    "dq_memory_headroom_bytes": ("gauge", "Memory still available to the process at the most recent chunk."),
+}
+
+
+def _labels(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: tuple, extra: tuple = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Histogram:
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class PipelineMetrics:
+    """Thread-safe registry of the pipeline's counters, gauges and histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: dict[tuple, float] = {}
+        self.gauges: dict[tuple, float] = {}
+        self.histograms: dict[tuple, _Histogram] = {}
+
+    def _inc(self, name: str, value: float = 1, **labels) -> None:
+        key = (name, _labels(labels))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def _observe(self, name: str, value: float, **labels) -> None:
+        key = (name, _labels(labels))
+        if key not in self.histograms:
+            self.histograms[key] = _Histogram()
+        self.histograms[key].observe(value)
+
+    def observe_chunk(
+        self,
+        rows: int,
+        invalid_rows: int,
+        rule_counts: dict,
+        repair_counts: dict,
+        timings: dict,
+        write_seconds: float,
+        rule_timings: dict | None = None,
+    ) -> None:
+        """Record one committed chunk; rule_counts maps (column, rule_id) to failing rows
+        and rule_timings maps it to the custom rule's seconds."""
+        with self._lock:
+            self._inc("dq_rows", rows)
+            self._inc("dq_invalid_rows", invalid_rows)
+            self._inc("dq_chunks")
+            for (column, rule_id), count in rule_counts.items():
+                self._inc("dq_rule_failures", count, column=column, rule=rule_id)
+            for action, count in repair_counts.items():
+                self._inc("dq_repairs", count, action=action)
+            for stage, seconds in timings.items():
+                self._observe("dq_stage_seconds", seconds, stage=stage)
+            self._observe("dq_stage_seconds", write_seconds, stage="write")
+            self._observe("dq_chunk_seconds", sum(timings.values()) + write_seconds)
+            for (column, rule_id), seconds in (rule_timings or {}).items():
+                self._observe("dq_rule_seconds", seconds, column=column, rule=rule_id)
+
+    def observe_chunk_size(self, rows: int, headroom_bytes: int | None) -> None:
+        with self._lock:
+            self.gauges[("dq_chunk_rows", ())] = rows
+            if headroom_bytes is not None:
+                self.gauges[("dq_memory_headroom_bytes", ())] = headroom_bytes
+
+    def observe_run(self, rows: int, seconds: float, ge_result: dict | None = None) -> None:
+        """Record a completed run and its merged validate_data statistics."""
+        with self._lock:
+            self._inc("dq_runs", outcome="success")
+            self._observe("dq_run_seconds", seconds)
+            self.gauges[("dq_last_run_rows_per_second", ())] = rows / seconds if seconds > 0 else 0.0
+            stats = (ge_result or {}).get("statistics", {})
+            for result in ("successful", "unsuccessful"):
+                if f"{result}_expectations" in stats:
+                    key = ("dq_last_run_expectations", _labels({"result": result}))
+                    self.gauges[key] = stats[f"{result}_expectations"]
+
+    def observe_failure(self) -> None:
+        with self._lock:
+            self._inc("dq_runs", outcome="failure")
+
+    def to_dict(self) -> dict:
+        """Plain-data snapshot, e.g. to send a worker process's metrics back to a service."""
+        with self._lock:
+            return {
+                "counters": [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                "gauges": [[name, list(labels), value] for (name, labels), value in self.gauges.items()],
+                "histograms": [
+                    [name, list(labels), list(h.counts), h.sum] for (name, labels), h in self.histograms.items()
+                ],
+            }
+
+    def merge(self, data: dict) -> None:
+        """Add a to_dict() snapshot into this registry (gauges take the snapshot's value)."""
+        with self._lock:
+            for name, labels, value in data["counters"]:
+                key = (name, tuple(map(tuple, labels)))
+                self.counters[key] = self.counters.get(key, 0) + value
+            for name, labels, value in data["gauges"]:
+                self.gauges[(name, tuple(map(tuple, labels)))] = value
+            for name, labels, counts, total in data["histograms"]:
+                key = (name, tuple(map(tuple, labels)))
+                if key not in self.histograms:
+                    self.histograms[key] = _Histogram()
+                hist = self.histograms[key]
+                hist.counts = [a + b for a, b in zip(hist.counts, counts)]
+                hist.sum += total
+
+    def render(self) -> str:
+        """The registry in OpenMetrics text exposition format."""
+        with self._lock:
+            samples: dict[str, list[str]] = {name: [] for name in METRICS}
+            for (name, labels), value in sorted(self.counters.items()):
+                samples[name].append(f"{name}_total{_format_labels(labels)} {_format_value(value)}")
+            for (name, labels), value in sorted(self.gauges.items()):
+                samples[name].append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+            for (name, labels), hist in sorted(self.histograms.items(), key=lambda item: item[0]):
+                cumulative = 0
+                for bound, count in zip(hist.buckets + (float("inf"),), hist.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    samples[name].append(f"{name}_bucket{_format_labels(labels, (('le', le),))} {cumulative}")
+                samples[name].append(f"{name}_count{_format_labels(labels)} {cumulative}")
+                samples[name].append(f"{name}_sum{_format_labels(labels)} {_format_value(hist.sum)}")
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            if samples[name]:
+                lines += [f"# TYPE {name} {kind}", f"# HELP {name} {help_text}"] + samples[name]
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Atomically write the metrics for a textfile collector (e.g. dq.prom)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> http.server.ThreadingHTTPServer:
+        """Serve GET /metrics on a background thread; returns the server (call shutdown() to stop)."""
+        registry = self
+
+        class _Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        server = http.server.ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
@@ -0,0 +1,116 @@
+import io
+import mmap
+import os
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from compression import write_csv
+
+_COUNT_BLOCK = 16 << 20
+
+
+def _count_quotes(mm: mmap.mmap, start: int, end: int) -> int:
+    count = 0
+    for pos in range(start, end, _COUNT_BLOCK):
+        count += mm[pos:min(pos + _COUNT_BLOCK, end)].count(b'"')
+    return count
+
+
+def _record_end(mm: mmap.mmap, begin: int, target: int, has_quotes: bool) -> int:
+    """First position >= target that starts a new record, given that one starts at begin.
+
+    A newline only ends a record when the number of quotes since `begin` is even,
+    so newlines inside quoted fields are skipped ("" escapes keep the parity).
+    """
+    size = len(mm)
+    if target >= size:
+        return size
+    if not has_quotes:
+        nl = mm.find(b"\n", target)
+        return size if nl == -1 else nl + 1
+    quotes = _count_quotes(mm, begin, target)
+    pos = target
+    while True:
+        nl = mm.find(b"\n", pos)
+        if nl == -1:
+            return size
+        quotes += _count_quotes(mm, pos, nl)
+        if quotes % 2 == 0:
+            return nl + 1
+        pos = nl + 1
+
+
+def _last_record_end(mm: mmap.mmap, begin: int, has_quotes: bool) -> int:
+    """End of the last complete record after begin (a growing file may end mid-record)."""
+    end = mm.rfind(b"\n", begin) + 1
+    if end <= begin:
+        return begin
+    if has_quotes:
+        # A newline inside an open quoted field does not end a record
+        quotes = _count_quotes(mm, begin, end)
+        while quotes % 2:
+            prev = mm.rfind(b"\n", begin, end - 1) + 1
+            if prev <= begin:
+                return begin
+            quotes -= _count_quotes(mm, prev, end)
+            end = prev
+    return end
+
+
+def read_header(path: str) -> tuple[list[str], int]:
+    """Column names and the byte offset where the first data record starts."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header_end = _record_end(mm, 0, 0, mm.find(b'"') != -1)
+        columns = pd.read_csv(io.BytesIO(mm[:header_end]), nrows=0).columns.tolist()
+    return columns, header_end
+
+
+def split_byte_ranges(path: str, range_bytes: int = 64 << 20, start: int | None = None, complete_only: bool = False):
+    """Yield (first, start, end) byte ranges of roughly range_bytes, aligned on record starts.
+
+    `first` marks the range that begins right after the header. The file is
+    memory-mapped, so only the bytes around each boundary (and, for files with
+    quotes, the quote counts) are touched here. With complete_only, a trailing
+    record without its newline (still being appended) is left for a later run.
+    """
+    _, header_end = read_header(path)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        has_quotes = mm.find(b'"') != -1
+        pos = header_end if start is None else max(start, header_end)
+        limit = _last_record_end(mm, pos, has_quotes) if complete_only else len(mm)
+        while pos < limit:
+            end = limit if pos + range_bytes >= limit else _record_end(mm, pos, pos + range_bytes, has_quotes)
+            yield pos == header_end, pos, end
+            pos = end
+
+
+def process_byte_range(
+    byte_range: tuple[bool, int, int],
+    path: str,
+    columns: list[str],
+    process: Callable,
+    out_dir: str,
+    codec: str | None = None,
+    level: int | None = None,
+):
+    """Worker: parse and process one byte range, writing its standardized rows to a part file.
+
+    Returns (end offset, part file, row count, chunk result); the chunk result
+    carries only the invalid rows as `flagged`, and its row ids are positions
+    within the range.
+    """
+    first, start, end = byte_range
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = mm[start:end]
+    df_raw = pd.read_csv(io.BytesIO(data), header=None, names=columns)
+    del data
+    result = process(df_raw)
+
+    part = os.path.join(out_dir, f"range-{start:015d}.csv")
+    write_csv(result.standardized, part, append=False, codec=codec, level=level, header=first)
+    # Ship only the invalid rows back to the writer process
+    flagged = result.flagged
+    df_invalid = flagged.take(np.flatnonzero(~flagged["is_valid"].to_numpy()))
+    return end, part, len(flagged), result._replace(standardized=None, flagged=df_invalid)
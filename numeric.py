@@ -0,0 +1,200 @@
+"""Numeric parsing engine for int and float columns.
+
+Columns that are already numeric are used as they are, and text columns of
+plain numbers are converted in one numpy cast. Other text columns are parsed one
+distinct value at a time: plain numbers through pandas' C parser, and only the
+remaining values (currency, grouping, accounting negatives, percentages,
+locale decimals) go through a regex built from the column's "number_format".
+The fast paths accept exactly the values the regex accepts, so a value parses
+the same whatever else is in its column. Int columns never go through float64,
+so integers stay exact over the whole int64 range."""
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_FORMAT = {"decimal": ".", "thousands": ",", "currency": [], "percent": "strip"}
+_INT64_MAX = np.iinfo(np.int64).max
+# Floats at or beyond ±2**63 cannot be represented as int64
+_INT64_LIMIT = float(2 ** 63)
+
+# Symbols accepted before or after a number; ISO codes (USD, EUR) are matched as [A-Z]{3}
+_CURRENCY_SYMBOLS = "$€£¥₹₩₽₺₪₫฿₴₦₱¢"
+_MINUS = "-−"  # ASCII hyphen-minus and U+2212
+_SPACES = "\u00a0\u202f\u2009"  # no-break, narrow no-break and thin spaces
+
+
+@lru_cache(maxsize=None)
+def _pattern(decimal: str, thousands: str, currency: tuple) -> re.Pattern:
+    if " " in thousands:
+        thousands += _SPACES
+    group = f"[{re.escape(thousands)}]\\d{{3}}" if thousands else "(?!)"
+    codes = "|".join(re.escape(c) for c in sorted(currency, key=len, reverse=True))
+    cur = f"(?:[{_CURRENCY_SYMBOLS}]|[A-Z]{{3}}{'|' + codes if codes else ''})"
+    minus = re.escape(_MINUS)
+    sign = f"[+{minus}]"
+    return re.compile(
+        rf"^\s*(?P<sign>{sign})?\s*{cur}?\s*(?P<open>\()?\s*(?P<sign2>{sign})?\s*{cur}?\s*"
+        rf"(?P<int>\d{{1,3}}(?:{group})+|\d*)(?:{re.escape(decimal)}(?P<frac>\d*))?(?:[eE](?P<exp>[-+]?\d+))?"
+        rf"\s*(?P<pct>%)?\s*{cur}?\s*(?P<close>\))?\s*{cur}?\s*(?P<trail>[{minus}])?\s*$"
+    )
+
+
+def _resolve_format(number_format: dict | None) -> dict:
+    fmt = {**DEFAULT_FORMAT, **(number_format or {})}
+    if fmt["decimal"] == "," and "thousands" not in (number_format or {}):
+        fmt["thousands"] = "."
+    return fmt
+
+
+def _parse_text(values: np.ndarray, fmt: dict, exact: bool = False):
+    """Parse formatted numbers (an object array of distinct values) with the column's pattern.
+
+    With exact, also returns the values without a fractional part, exponent or
+    ratio percentage as signed digit strings (None elsewhere), for int columns.
+    """
+    pattern = _pattern(fmt["decimal"], fmt["thousands"], tuple(fmt["currency"]))
+    parts = pd.Series(values, dtype=object).astype(str).str.extract(pattern)
+    digits = parts["int"].str.replace(r"\D", "", regex=True)
+    frac = parts["frac"].fillna("")
+    number = digits + "." + frac + ("e" + parts["exp"]).fillna("")
+    out = pd.to_numeric(number.where(parts["int"].notna() & (digits + frac != "")), errors="coerce")
+    out = out.to_numpy(dtype=np.float64, na_value=np.nan)
+    # An opening parenthesis needs a closing one and vice versa, and only one sign is allowed
+    balanced = parts["open"].notna().to_numpy() == parts["close"].notna().to_numpy()
+    out[~balanced | (parts["sign"].notna() & parts["sign2"].notna()).to_numpy()] = np.nan
+    negative = (
+        parts["sign"].isin(list(_MINUS)).to_numpy()
+        | parts["sign2"].isin(list(_MINUS)).to_numpy()
+        | parts["open"].notna().to_numpy()
+        | parts["trail"].notna().to_numpy()
+    )
+    out[negative] = -out[negative]
+    ratio = parts["pct"].notna().to_numpy() & (fmt["percent"] == "ratio")
+    out[ratio] /= 100
+    if not exact:
+        return out
+    whole = ~np.isnan(out) & frac.str.fullmatch("0*").to_numpy() & parts["exp"].isna().to_numpy() & ~ratio
+    text = np.where(negative, "-", "").astype(object) + digits.fillna("").to_numpy(dtype=object)
+    return out, np.where(whole, text, None)
+
+
+def _is_plain_text(values: np.ndarray) -> bool:
+    """Whether the non-missing values are ASCII strings without "_".
+
+    float() and int() also accept digit group underscores and non-ASCII digits,
+    which the pattern rejects; such columns take the distinct-value path.
+    """
+    try:
+        joined = "".join(values[~pd.isna(values)])
+    except TypeError:
+        return False  # not all strings
+    return joined.isascii() and "_" not in joined
+
+
+def _plain_floats(values: np.ndarray) -> np.ndarray | None:
+    """The column as float64 if every value is a plain number or NaN, else None."""
+    if not _is_plain_text(values):
+        return None
+    try:
+        return values.astype(np.float64)
+    except (TypeError, ValueError):
+        return None
+
+
+def _plain_ints(values: np.ndarray) -> np.ndarray | None:
+    """The values as int64 if every one is a plain integer within int64 (none missing), else None."""
+    if not _is_plain_text(values):
+        return None
+    try:
+        return values.astype(np.int64)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _parse_distinct(series: pd.Series, fmt: dict) -> np.ndarray:
+    codes, uniques = pd.factorize(series)
+    uniques = np.asarray(uniques, dtype=object)
+    parsed = pd.to_numeric(pd.Series(uniques, dtype=object), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    if fmt["decimal"] != ".":
+        # The C parser would read "1.234" as 1.234; in this locale it is 1234
+        ambiguous = pd.Series(uniques, dtype=object).astype(str).str.contains(".", regex=False).to_numpy()
+        parsed[ambiguous] = np.nan
+    todo = np.isnan(parsed)
+    if todo.any():
+        parsed[todo] = _parse_text(uniques[todo], fmt)
+    return np.append(parsed, np.nan)[codes]  # code -1 (missing) picks the trailing NaN
+
+
+def parse_numeric(series: pd.Series, number_format: dict | None = None) -> pd.Series:
+    """Parse a column into float64, NaN where a value is missing or not a number.
+
+    Understands grouping ("1,234.56", or "1.234,56" with decimal ","), currency
+    symbols and ISO codes on either side, accounting negatives "(12.50)" and
+    "12.50-", scientific notation and percentages ("12%" is 12, or 0.12 with
+    percent "ratio"). Thousands default to "." when decimal is ",". Infinite
+    values become NaN.
+    """
+    fmt = _resolve_format(number_format)
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        out = series.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    else:
+        out = _plain_floats(series.to_numpy(dtype=object)) if fmt["decimal"] == "." else None
+        if out is None:
+            out = _parse_distinct(series, fmt)
+    out[~np.isfinite(out)] = np.nan
+    return pd.Series(out, index=series.index, name=series.name)
+
+
+def _ints_from_floats(floats: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Truncate floats to int64: (values, missing mask, out-of-range mask)."""
+    mask = ~np.isfinite(floats)
+    out_of_range = ~mask & ((floats >= _INT64_LIMIT) | (floats < -_INT64_LIMIT))
+    mask |= out_of_range
+    return np.trunc(np.where(mask, 0.0, floats)).astype(np.int64), mask, out_of_range
+
+
+def _parse_distinct_ints(uniques: np.ndarray, fmt: dict) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    plain = _plain_ints(uniques)
+    if plain is not None:
+        none = np.zeros(len(uniques), dtype=bool)
+        return plain, none, none
+    floats, exact = _parse_text(uniques, fmt, exact=True)
+    floats[~np.isfinite(floats)] = np.nan
+    ints, mask, out_of_range = _ints_from_floats(floats)
+    # Whole numbers are taken from their digits, not from the (rounded) float
+    for i in np.flatnonzero(pd.notna(exact)):
+        value = int(exact[i])
+        in_range = -_INT64_MAX - 1 <= value <= _INT64_MAX
+        ints[i] = value if in_range else 0
+        mask[i] = not in_range
+        out_of_range[i] = not in_range
+    return ints, mask, out_of_range
+
+
+def parse_integers(series: pd.Series, number_format: dict | None = None) -> tuple[pd.Series, int]:
+    """Parse an int column into nullable Int64 without a round trip through float64.
+
+    Accepts the same formats as parse_numeric. Whole numbers are exact over the
+    whole int64 range; fractions are truncated (12.7 is 12). Values outside int64
+    become <NA> and are counted. Returns (series, out-of-range count).
+    """
+    fmt = _resolve_format(number_format)
+    if pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(series):
+        codes, uniques = pd.factorize(series)
+        ints, mask, out_of_range = _parse_distinct_ints(np.asarray(uniques, dtype=object), fmt)
+        # Code -1 (missing) picks the trailing entry
+        ints, mask = np.append(ints, 0)[codes], np.append(mask, True)[codes]
+        overflow = int(np.count_nonzero(np.append(out_of_range, False)[codes]))
+    elif pd.api.types.is_unsigned_integer_dtype(series):
+        values = series.to_numpy(dtype=np.uint64, na_value=0)
+        out_of_range = values > _INT64_MAX
+        ints, mask = np.where(out_of_range, 0, values).astype(np.int64), series.isna().to_numpy() | out_of_range
+        overflow = int(np.count_nonzero(out_of_range))
+    elif pd.api.types.is_integer_dtype(series):
+        ints, mask, overflow = series.to_numpy(dtype=np.int64, na_value=0), series.isna().to_numpy(), 0
+    else:
+        ints, mask, out_of_range = _ints_from_floats(series.to_numpy(dtype=np.float64, na_value=np.nan))
+        overflow = int(np.count_nonzero(out_of_range))
+    return pd.Series(pd.arrays.IntegerArray(ints, mask), index=series.index, name=series.name), overflow
@@ -0,0 +1,328 @@
+import base64
+import math
+
+import numpy as np
+import pandas as pd
+
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch (2**p one-byte registers)."""
+
+    def __init__(self, p: int = 12):
+        # The rank is computed through float64, which is exact for <= 53 bits
+        if not 11 <= p <= 18:
+            raise ValueError("HyperLogLog precision must be between 11 and 18")
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, series: pd.Series) -> None:
+        values = series.dropna()
+        if values.empty:
+            return
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+        width = 64 - self.p
+        idx = (hashes >> np.uint64(width)).astype(np.intp)
+        rest = hashes & np.uint64((1 << width) - 1)
+        # frexp gives the bit length of rest; rank = leading zeros + 1
+        _, bit_length = np.frexp(rest.astype(np.float64))
+        rank = (width - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.p != self.p:
+            raise ValueError("cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            raw = m * math.log(m / zeros)
+        return int(round(raw))
+
+    def to_dict(self) -> dict:
+        return {"p": self.p, "registers": base64.b64encode(self.registers.tobytes()).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HyperLogLog":
+        sketch = cls(data["p"])
+        sketch.registers = np.frombuffer(base64.b64decode(data["registers"]), dtype=np.uint8).copy()
+        return sketch
+
+
+class KLLSketch:
+    """Mergeable quantile sketch; an item stored at level h stands for 2**h inputs."""
+
+    def __init__(self, k: int = 200, seed: int | None = None):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self) -> None:
+        while True:
+            over = [h for h, items in enumerate(self.levels) if items.size > self._capacity(h)]
+            if not over:
+                return
+            h = over[0]
+            if h + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[h])
+            # An odd leftover stays behind so the promoted half keeps exact weight
+            keep = items[:1] if items.size % 2 else items[:0]
+            items = items[keep.size:]
+            promoted = items[int(self._rng.integers(2))::2]
+            self.levels[h] = keep
+            self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return
+        self.n += values.size
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self._compress()
+
+    def _weighted(self) -> tuple[np.ndarray, np.ndarray]:
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(lvl.size, 2.0 ** h) for h, lvl in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], np.cumsum(weights[order])
+
+    def quantiles(self, qs) -> list[float]:
+        """Approximate values at the given ranks in [0, 1]."""
+        if not self.n:
+            return [math.nan for _ in qs]
+        items, cum = self._weighted()
+        pos = np.searchsorted(cum, np.asarray(qs, dtype=np.float64) * cum[-1], side="left")
+        return items[np.minimum(pos, items.size - 1)].tolist()
+
+    def cdf(self, points) -> np.ndarray:
+        """Approximate fraction of inputs <= each point."""
+        points = np.asarray(points, dtype=np.float64)
+        if not self.n:
+            return np.zeros(points.shape)
+        items, cum = self._weighted()
+        pos = np.searchsorted(items, points, side="right")
+        return np.where(pos > 0, cum[np.maximum(pos - 1, 0)], 0.0) / cum[-1]
+
+    def items(self) -> np.ndarray:
+        return np.concatenate(self.levels)
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "n": self.n, "levels": [lvl.tolist() for lvl in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "KLLSketch":
+        sketch = cls(data["k"])
+        sketch.n = data["n"]
+        sketch.levels = [np.asarray(lvl, dtype=np.float64) for lvl in data["levels"]] or [np.empty(0)]
+        return sketch
+
+
+class FrequentItems:
+    """Misra-Gries heavy hitters; counts are lower bounds off by at most n / (capacity + 1)."""
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.int64)
+
+    def _absorb(self, counts: pd.Series) -> None:
+        combined = self.counts.add(counts, fill_value=0).astype(np.int64)
+        if len(combined) > self.capacity:
+            cut = combined.nlargest(self.capacity + 1).iloc[-1]
+            combined = combined[combined > cut] - cut
+        self.counts = combined
+
+    def update(self, series: pd.Series) -> None:
+        counts = series.value_counts(dropna=True)
+        if counts.empty:
+            return
+        if len(counts) > self.capacity:
+            # Reduce the chunk to its own summary first (summaries stay mergeable),
+            # so at most `capacity` values are ever stringified
+            cut = counts.iloc[self.capacity]
+            counts = counts[counts > cut] - cut
+        counts.index = counts.index.astype(str)
+        self._absorb(counts.groupby(level=0).sum())
+
+    def merge(self, other: "FrequentItems") -> None:
+        self._absorb(other.counts)
+
+    def top(self, n: int = 5) -> list[tuple[str, int]]:
+        return [(str(k), int(v)) for k, v in self.counts.nlargest(n).items()]
+
+    def to_dict(self) -> dict:
+        return {"capacity": self.capacity, "counts": {str(k): int(v) for k, v in self.counts.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FrequentItems":
+        sketch = cls(data["capacity"])
+        sketch.counts = pd.Series(data["counts"], dtype=np.int64)
+        return sketch
+
+
+def _column_kind(spec: dict) -> str:
+    """The profile kind of a schema column; columns outside the schema are profiled as text,
+    since their dtype is only guessed per chunk and chunks may guess differently."""
+    col_type = spec.get("type")
+    if col_type in {"int", "float"}:
+        return "numeric"
+    if col_type == "date":
+        return "date"
+    return "string"
+
+
+class ColumnProfile:
+    """Constant-size summary of one column: counts, min/max, distinct, quantiles, top-k."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.count = 0
+        self.null_count = 0
+        self.min = None
+        self.max = None
+        self.distinct = HyperLogLog()
+        self.quantiles = KLLSketch() if kind in {"numeric", "date"} else None
+        self.top = FrequentItems()
+
+    def _values(self, series: pd.Series) -> pd.Series:
+        values = series.dropna()
+        if self.kind == "date":
+            return values.astype("int64")
+        if self.kind == "numeric":
+            return pd.to_numeric(values, errors="coerce").dropna().astype(np.float64)
+        return values.astype(str)
+
+    def _widen(self, lo, hi) -> None:
+        if lo is None:
+            return
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+
+    def update(self, series: pd.Series) -> None:
+        nulls = int(series.isna().sum())
+        self.count += len(series)
+        self.null_count += nulls
+        values = self._values(series)
+        if values.empty:
+            return
+        lo, hi = values.min(), values.max()
+        self._widen(lo.item() if hasattr(lo, "item") else lo, hi.item() if hasattr(hi, "item") else hi)
+        self.distinct.update(values)
+        if self.quantiles is not None:
+            self.quantiles.update(values.to_numpy(dtype=np.float64))
+        self.top.update(series)
+
+    def _as_string(self) -> None:
+        """Turn into a "string" profile, keeping what does not depend on the kind."""
+        self.min, self.max = (None if value is None else str(self._display(value)) for value in (self.min, self.max))
+        self.kind, self.quantiles = "string", None
+
+    def merge(self, other: "ColumnProfile") -> None:
+        if other.kind != self.kind:
+            # e.g. a stored snapshot from before the column's schema type changed
+            other = ColumnProfile.from_dict(other.to_dict())
+            self._as_string()
+            other._as_string()
+        self.count += other.count
+        self.null_count += other.null_count
+        self._widen(other.min, other.max)
+        self.distinct.merge(other.distinct)
+        if self.quantiles is not None and other.quantiles is not None:
+            self.quantiles.merge(other.quantiles)
+        self.top.merge(other.top)
+
+    def _display(self, value):
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return None
+        if self.kind == "date":
+            return str(pd.Timestamp(int(value)))
+        return value
+
+    def summary(self, qs=(0.25, 0.5, 0.75, 0.95)) -> dict:
+        out = {
+            "kind": self.kind,
+            "count": self.count,
+            "null_count": self.null_count,
+            "null_ratio": self.null_count / self.count if self.count else 0.0,
+            "distinct": self.distinct.estimate(),
+            "min": self._display(self.min),
+            "max": self._display(self.max),
+            "top": self.top.top(),
+        }
+        if self.quantiles is not None:
+            out["quantiles"] = {q: self._display(v) for q, v in zip(qs, self.quantiles.quantiles(qs))}
+        return out
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "count": self.count,
+            "null_count": self.null_count,
+            "min": self.min,
+            "max": self.max,
+            "distinct": self.distinct.to_dict(),
+            "quantiles": self.quantiles.to_dict() if self.quantiles is not None else None,
+            "top": self.top.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnProfile":
+        profile = cls(data["kind"])
+        profile.count = data["count"]
+        profile.null_count = data["null_count"]
+        profile.min = data["min"]
+        profile.max = data["max"]
+        profile.distinct = HyperLogLog.from_dict(data["distinct"])
+        if data.get("quantiles") is not None:
+            profile.quantiles = KLLSketch.from_dict(data["quantiles"])
+        profile.top = FrequentItems.from_dict(data["top"])
+        return profile
+
+
+def profile_data(df: pd.DataFrame, schema: dict) -> dict[str, ColumnProfile]:
+    """Build a ColumnProfile for every column of a (standardized) frame or chunk."""
+    columns = schema.get("columns", {})
+    profiles = {}
+    for col in df.columns:
+        profile = ColumnProfile(_column_kind(columns.get(col, {})))
+        profile.update(df[col])
+        profiles[col] = profile
+    return profiles
+
+
+def merge_profiles(left: dict[str, ColumnProfile] | None, right: dict[str, ColumnProfile]) -> dict[str, ColumnProfile]:
+    """Merge right into left (chunks, parallel workers, stored runs) and return left."""
+    if left is None:
+        return right
+    for col, profile in right.items():
+        if col in left:
+            left[col].merge(profile)
+        else:
+            left[col] = profile
+    return left
+
+
+def profiles_to_dict(profiles: dict[str, ColumnProfile]) -> dict:
+    return {col: profile.to_dict() for col, profile in profiles.items()}
+
+
+def profiles_from_dict(data: dict) -> dict[str, ColumnProfile]:
+    return {col: ColumnProfile.from_dict(item) for col, item in data.items()}
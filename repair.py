@@ -0,0 +1,145 @@
+"""Quarantine-and-repair stage: values that standardization coerced to NaN/NaT are
+quarantined with their raw text, and the strategies a column lists under "repair"
+(see schema_loader.REPAIR_STRATEGIES) try to fix them with whole-column string ops."""
+import numpy as np
+import pandas as pd
+
+from numeric import parse_integers
+from standardizer import to_nullable_int
+
+# 1.234,56 / 1 234,56 / 12,5 — but not 12,500, which reads as a thousands separator
+_DECIMAL_COMMA = r"^[-+]?(?:\d{1,3}(?:[.\s']\d{3})+,\d+|\d+,(?!\d{3}$)\d+)$"
+
+
+def _as_text(values: pd.Series) -> pd.Series:
+    return values.astype(str).str.strip()
+
+
+def _decimal_comma(raw: pd.Series, current: pd.Series, integral: bool = False) -> pd.Series:
+    """Re-read numbers written with a decimal comma (12,5 or 1.234,56), which the default
+    number_format quarantines; for whole columns in that locale set number_format instead.
+
+    Only values that failed to parse are re-read. With integral (int columns), a
+    value with a fractional part stays quarantined instead of being truncated.
+    """
+    failed = raw.notna() & current.isna()
+    if pd.api.types.is_numeric_dtype(raw) or not failed.any():
+        return pd.Series(dtype=float)
+    text = _as_text(raw[failed]).str.replace(r"[^\d,.\s'+-]", "", regex=True).str.strip()
+    text = text[text.str.match(_DECIMAL_COMMA)]
+    fixed = text.str.replace(r"[.\s']", "", regex=True).str.replace(",", ".", regex=False)
+    if integral:
+        # Parsed as integers, so large values stay exact
+        return parse_integers(fixed[fixed.str.fullmatch(r"[-+]?\d+(?:\.0*)?")])[0].dropna()
+    return pd.to_numeric(fixed, errors="coerce").dropna()
+
+
+def _swap_day_month(fmt: str) -> str:
+    return fmt.replace("%d", "\0").replace("%m", "%d").replace("\0", "%m")
+
+
+def _day_month_swap(raw: pd.Series, current: pd.Series, formats: list[str]) -> pd.Series:
+    """Parse values that failed every format with day and month swapped (01-15-2024)."""
+    failed = raw.notna() & current.isna()
+    if not failed.any():
+        return current.iloc[:0]
+    text = _as_text(raw[failed])
+    repaired = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+    for fmt in formats:
+        if "%d" not in fmt or "%m" not in fmt:
+            continue
+        todo = repaired.isna()
+        if not todo.any():
+            break
+        repaired[todo] = pd.to_datetime(text[todo], format=_swap_day_month(fmt), errors="coerce")
+    return repaired.dropna()
+
+
+def _default_value(col_type: str, value):
+    if col_type == "date":
+        return pd.Timestamp(value)
+    if col_type == "int":
+        return int(value)
+    if col_type == "float":
+        return float(value)
+    return str(value)
+
+
+def repair_data(df_raw: pd.DataFrame, df_std: pd.DataFrame, schema: dict):
+    """Apply the schema's repair strategies to a standardized chunk.
+
+    Every value that was present in the raw data but coerced to NaN/NaT is
+    quarantined; configured strategies then try to fix it with bulk column
+    operations, and "default" fills whatever is still missing. Repaired columns
+    replace those in df_std (df_std itself is not modified).
+
+    Returns (repaired frame, log). The log is the compact side record of the
+    original values: one row per repaired or still-quarantined value with
+    row_id, column, action (a strategy, "default" or "quarantined") and raw.
+    """
+    out = df_std.copy(deep=False)
+    log_parts = []
+    columns = schema.get("columns", {})
+
+    def _log(col: str, action: str, index: pd.Index) -> None:
+        if len(index):
+            raw = df_raw.loc[index, col]
+            log_parts.append(pd.DataFrame({
+                "row_id": np.asarray(index, dtype=np.int64),
+                "column": col,
+                "action": action,
+                "raw": raw.astype(str).where(raw.notna(), None).to_numpy(dtype=object),
+            }))
+
+    for col, spec in columns.items():
+        if col not in out.columns or col not in df_raw.columns:
+            continue
+        col_type = spec.get("type")
+        strategies = spec.get("repair", [])
+        raw, current = df_raw[col], out[col]
+        changed = False
+        if col_type == "int" and (strategies or "default" in spec):
+            # Fixes are applied on Int64; the column is narrowed back to Int32 below where it fits
+            current = current.astype("Int64")
+
+        if col_type == "string":
+            # Normalizations touch every value, so they are not logged per value
+            present = raw.notna()
+            if "trim" in strategies:
+                current = current.where(~present, current.str.replace(r"\s+", " ", regex=True).str.strip())
+                changed = True
+            if "casefold" in strategies:
+                current = current.where(~present, current.str.casefold())
+                changed = True
+        else:
+            fixes = []
+            if "decimal_comma" in strategies:
+                fixes.append(("decimal_comma", _decimal_comma(raw, current, integral=col_type == "int")))
+            if "day_month_swap" in strategies:
+                fixes.append(("day_month_swap", _day_month_swap(raw, current, spec.get("parse_formats", []))))
+            for action, fixed in fixes:
+                if len(fixed):
+                    current = current.copy()
+                    current.loc[fixed.index] = fixed.astype(current.dtype)
+                    changed = True
+                    _log(col, action, fixed.index)
+
+        if "default" in spec:
+            # String columns hold the text "nan" for missing values, so go by the raw data too
+            missing = current.isna() | raw.isna()
+            if missing.any():
+                current = current.copy()
+                current[missing] = _default_value(col_type, spec["default"])
+                changed = True
+                _log(col, "default", current.index[missing.to_numpy()])
+        if col_type != "string":
+            quarantined = raw.notna() & current.isna()
+            _log(col, "quarantined", current.index[quarantined.to_numpy()])
+
+        if changed:
+            out[col] = to_nullable_int(current)[0] if col_type == "int" else current
+
+    log = pd.concat(log_parts, ignore_index=True) if log_parts else pd.DataFrame(
+        {"row_id": np.empty(0, dtype=np.int64), "column": [], "action": [], "raw": []}
+    )
+    return out, log.sort_values("row_id", kind="stable", ignore_index=True)
@@ -1,69 +1,167 @@
-import json
+import copy
 import os  #use to create forlder or directory which we use to store data 
+import shutil
+import time
 from datetime import datetime
+from functools import partial
+from typing import NamedTuple
 
+import numpy as np
 import pandas as pd
 
+from charts import build_chart_data, failure_timeline, merge_timelines
+from checkpoint import Checkpoint, TailState, finalize, part_path, reopen, run_fingerprint, truncate
+from cluster import ShardRejected, coordinate
+from compression import detect_codec, open_input, with_codec_suffix, write_csv
+from drift import DEFAULT_DRIFT, add_drift_results, detect_drift, feed_name, load_baseline, save_profile_snapshot
+from metrics import PipelineMetrics
+from mmap_reader import process_byte_range, read_header, split_byte_ranges
+from profiler import merge_profiles, profile_data, profiles_from_dict, profiles_to_dict
+from repair import repair_data
+from rules import evaluate_rules
+from resources import ChunkSizer
+from run_store import RunStore
+from schema_loader import load_schema, schema_hash
+from staged import run_staged
 from standardizer import standardize_data # importing our own created function
-from validator import validate_data
+from validator import merge_validation_results, validate_data
+from violations import ViolationsWriter, rule_violations, violations_table
 
 
-def load_schema(path: str) -> dict:
-	with open(path, "r", encoding="utf-8") as f:  #here utf8 makes sures that all type of characters are read properly plus this function reads the json schema properly+ here the "R" stands for read mode which makes sure that it will only read the file and not write on it 
-		return json.load(f)
+# Name of the row id column in invalid-row outputs: the 0-based data row of the input
+# file (its source line is row_id + 2 unless a quoted field spans lines)
+ROW_ID = "row_id"
 
 
-def flag_invalid_rows(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
-	"""Add columns 'is_valid' and 'errors' based on schema checks."""
-	columns = schema.get("columns", {})
-	errors = [[] for _ in range(len(df))]
-	is_valid = [True] * len(df)
+def _with_row_ids(df: pd.DataFrame) -> pd.DataFrame:
+	return df.rename_axis(ROW_ID).reset_index()
 
-	for col, spec in columns.items():
-		if col not in df.columns:
-			for i in range(len(df)):
-				errors[i].append(f"missing column: {col}")
-				is_valid[i] = False
-			continue
-		series = df[col]
-		# Required
-		if spec.get("required"):
-			nulls = series.isna()
-			for i, is_null in enumerate(nulls.tolist()):
-				if is_null:
-					errors[i].append(f"{col} is required")
-					is_valid[i] = False
-		# Type-specific checks
-		t = spec.get("type")
-		if t == "date":
-			bad = series.isna()
-			for i, b in enumerate(bad.tolist()):
-				if b:
-					errors[i].append(f"{col} invalid date")
-					is_valid[i] = False
-		elif t in {"int", "float"}:
-			# min/max constraints
-			if "min" in spec:
-				bad = series < spec["min"]
-				for i, b in enumerate(bad.fillna(False).tolist()):
-					if b:
-						errors[i].append(f"{col} below min {spec['min']}")
-						is_valid[i] = False
-			if "max" in spec:
-				bad = series > spec["max"]
-				for i, b in enumerate(bad.fillna(False).tolist()):
-					if b:
-						errors[i].append(f"{col} above max {spec['max']}")
-						is_valid[i] = False
-
-	flagged = df.copy()
-	flagged["is_valid"] = pd.Series(is_valid, dtype=bool)
-	flagged["errors"] = pd.Series(["; ".join(err) if err else "" for err in errors], dtype=object)
+
+def _error_combinations(violations: list, n: int) -> tuple[np.ndarray, list[str]]:
+	"""Encode each row's set of failed rules as a code into a list of distinct messages.
+
+	Rule messages are formatted once; rows share one string per distinct
+	combination, and code 0 is always the empty (valid) combination.
+	"""
+	if not violations or n == 0:
+		return np.zeros(n, dtype=np.intp), [""]
+	if len(violations) <= 64:
+		bits = np.zeros(n, dtype=np.uint64)
+		for i, (_, _, _, mask) in enumerate(violations):
+			bits |= mask.astype(np.uint64) << np.uint64(i)
+		keys, codes = np.unique(bits, return_inverse=True)
+		combos = [[i for i in range(len(violations)) if int(key) >> i & 1] for key in keys]
+	else:
+		# Wide schemas: pack the rule matrix into one opaque byte string per row
+		packed = np.packbits(np.column_stack([mask for _, _, _, mask in violations]), axis=1)
+		keys, codes = np.unique(packed, axis=0, return_inverse=True)
+		combos = [np.flatnonzero(np.unpackbits(key)[:len(violations)]).tolist() for key in keys]
+	messages = [message for _, _, message, _ in violations]
+	# Rules may share a message (two allowed_values rules on one column), so a message
+	# appears once per row and different combinations can share one category
+	categories = ["; ".join(dict.fromkeys(messages[i] for i in combo)) for combo in combos]
+	if categories[0] != "":
+		# No valid rows in this chunk; keep "" as code 0 anyway
+		categories.insert(0, "")
+		codes = codes + 1
+	remap, unique = pd.factorize(pd.Series(categories, dtype=object))
+	return remap[codes.reshape(-1)], unique.tolist()
+
+
+def flag_invalid_rows(
+	df: pd.DataFrame,
+	schema: dict,
+	copy: bool = True,
+	with_errors: bool = True,
+	violations: list | None = None,
+) -> pd.DataFrame:
+	"""Add columns 'is_valid' and 'errors' based on schema checks.
+
+	'errors' is a categorical over the distinct error combinations rather than one
+	string per row. With copy=False the result shares the data columns with df and
+	only the two flag columns are new. with_errors=False skips the 'errors' column.
+	Precomputed rule_violations() masks can be passed in to reuse them.
+	"""
+	if violations is None:
+		violations = list(rule_violations(df, schema))
+	codes, categories = _error_combinations(violations, len(df))
+
+	flagged = df.copy(deep=copy)
+	# Plain arrays are assigned by position, so whatever the index (row ids) is, nothing is realigned
+	flagged["is_valid"] = codes == 0
+	if with_errors:
+		flagged["errors"] = pd.Categorical.from_codes(codes, categories=categories)
 	return flagged
 
 
-def generate_html_report(output_path: str, source_csv: str, df_flagged: pd.DataFrame, ge_result: dict):
-	total = len(df_flagged)
+def _bars_html(labels: list, values: list, totals: list | None = None) -> str:
+	"""Horizontal CSS bars; with totals each bar shows value out of its total."""
+	top = max(totals or values, default=0) or 1
+	rows = []
+	for i, (label, value) in enumerate(zip(labels, values)):
+		text = f"{value} / {totals[i]}" if totals else f"{value}"
+		rows.append(
+			f"<tr><td>{label}</td><td style='width:70%'><div class='bar' style='width:{100 * value / top:.1f}%'></div></td>"
+			f"<td>{text}</td></tr>"
+		)
+	return "<table class='bars'>" + "".join(rows) + "</table>"
+
+
+def _charts_html(charts: dict) -> str:
+	parts = []
+	rule_counts = [r for r in charts.get("rule_counts", []) if r["rows"]]
+	if rule_counts:
+		labels = [f"{r['column']} · {r['rule_id']}" for r in rule_counts]
+		parts.append(f"<h2>Failures per Rule</h2>{_bars_html(labels, [r['rows'] for r in rule_counts])}")
+	for col, timeline in charts.get("timelines", {}).items():
+		parts.append(
+			f"<h2>Invalid Rows by {col} (per {timeline['bucket']})</h2>"
+			+ _bars_html(timeline["start"], timeline["invalid"], timeline["rows"])
+		)
+	for col, histogram in charts.get("histograms", {}).items():
+		edges = [f"{edge:.4g}" if isinstance(edge, float) else edge for edge in histogram["edges"]]
+		labels = [f"{edges[i]} – {edges[i + 1]}" for i in range(len(histogram["counts"]))]
+		parts.append(f"<h3>Distribution of {col}</h3>{_bars_html(labels, histogram['counts'])}")
+	return "".join(parts)
+
+
+def _profiles_table_html(profiles: dict) -> str:
+	rows = []
+	for col, profile in profiles.items():
+		s = profile.summary()
+		quantiles = s.get("quantiles", {})
+		q_text = " / ".join(str(quantiles[q]) for q in (0.25, 0.5, 0.75)) if quantiles else ""
+		top_text = ", ".join(f"{value} ({count})" for value, count in s["top"])
+		rows.append(
+			f"<tr><td>{col}</td><td>{s['kind']}</td><td>{s['count']}</td><td>{s['null_ratio']:.2%}</td>"
+			f"<td>~{s['distinct']}</td><td>{s['min']}</td><td>{s['max']}</td><td>{q_text}</td><td>{top_text}</td></tr>"
+		)
+	return (
+		"<table><tr><th>Column</th><th>Kind</th><th>Count</th><th>Null Ratio</th><th>Distinct</th>"
+		"<th>Min</th><th>Max</th><th>p25 / p50 / p75</th><th>Top Values</th></tr>"
+		+ "".join(rows)
+		+ "</table>"
+	)
+
+
+def generate_html_report(
+	output_path: str,
+	source_csv: str,
+	df_flagged: pd.DataFrame,
+	ge_result: dict,
+	profiles: dict | None = None,
+	total_rows: int | None = None,
+	repair_counts: dict | None = None,
+	charts: dict | None = None,
+	rule_timings: dict | None = None,
+):
+	"""Write the HTML report; chunked runs pass only the invalid rows plus total_rows.
+
+	charts (from charts.build_chart_data) are drawn as plain CSS bars, so their size
+	does not depend on the number of rows. rule_timings maps (column, rule_id) of
+	each custom rule to its total seconds.
+	"""
+	total = len(df_flagged) if total_rows is None else total_rows
 	invalid = (~df_flagged["is_valid"]).sum()
 	valid = total - invalid
 	timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -74,7 +172,23 @@ def generate_html_report(output_path: str, source_csv: str, df_flagged: pd.DataF
 	ge_total = ge_stats.get("evaluated_expectations", 0)
 
 	invalid_rows_html = df_flagged.loc[~df_flagged["is_valid"]]
-	invalid_table = invalid_rows_html.to_html(index=False, escape=False)
+	invalid_table = _with_row_ids(invalid_rows_html).to_html(index=False, escape=False)
+	profiles_html = f"<h2>Column Profiles</h2>{_profiles_table_html(profiles)}" if profiles else ""
+	repairs_html = ""
+	if repair_counts:
+		items = "".join(f"<li>{action}: {count}</li>" for action, count in sorted(repair_counts.items()))
+		repairs_html = f"<h2>Repairs</h2><ul>{items}</ul>"
+	charts_html = _charts_html(charts) if charts else ""
+	rules_html = ""
+	if rule_timings:
+		rows = "".join(
+			f"<tr><td>{col}</td><td>{rule_id}</td><td>{seconds:.3f}</td><td>{seconds / max(total, 1) * 1e6:.2f}</td></tr>"
+			for (col, rule_id), seconds in sorted(rule_timings.items(), key=lambda item: -item[1])
+		)
+		rules_html = (
+			"<h2>Custom Rule Timings</h2><table><tr><th>Column</th><th>Rule</th><th>Seconds</th>"
+			f"<th>µs per row</th></tr>{rows}</table>"
+		)
 
 	html = f"""
 	<html>
@@ -88,6 +202,8 @@ def generate_html_report(output_path: str, source_csv: str, df_flagged: pd.DataF
 		  table {{ border-collapse: collapse; width: 100%; }}
 		  th, td {{ border: 1px solid #ddd; padding: 8px; }}
 		  th {{ background: #f6f6f6; }}
+		  table.bars td {{ border: none; padding: 2px 8px; }}
+		  .bar {{ background: #667eea; height: 12px; }}
 		</style>
 	  </head>
 	  <body>
@@ -99,6 +215,10 @@ def generate_html_report(output_path: str, source_csv: str, df_flagged: pd.DataF
 		  <div class="card"><strong>Invalid Rows:</strong><br/>{invalid}</div>
 		  <div class="card"><strong>GE Expectations:</strong><br/>{ge_success}/{ge_total} passed</div>
 		</div>
+		{profiles_html}
+		{repairs_html}
+		{charts_html}
+		{rules_html}
 		<h2>Invalid Records</h2>
 		{invalid_table}
 	  </body>
@@ -109,32 +229,906 @@ def generate_html_report(output_path: str, source_csv: str, df_flagged: pd.DataF
 		f.write(html)
 
 
+class ChunkResult(NamedTuple):
+	"""Everything the writer needs from one processed chunk."""
+	standardized: pd.DataFrame | None
+	flagged: pd.DataFrame
+	ge_result: dict
+	profiles: dict
+	violations: pd.DataFrame | None
+	repairs: pd.DataFrame
+	rule_counts: dict
+	timeline: dict
+	timings: dict
+	rule_timings: dict
+
+
+def _process_chunk(df_raw: pd.DataFrame, schema: dict, with_errors: bool = True, with_violations: bool = False) -> ChunkResult:
+	"""Standardize, repair, validate, profile and flag one chunk (or a whole file).
+
+	Each stage's wall time is recorded in the result's timings, rule_counts
+	holds the number of failing rows per (column, rule_id) and rule_timings the
+	seconds each custom rule took.
+	"""
+	timings = {}
+	clock = time.perf_counter()
+
+	def _lap(stage: str) -> None:
+		nonlocal clock
+		now = time.perf_counter()
+		timings[stage] = now - clock
+		clock = now
+
+	# The raw chunk is dropped after this, so neither step needs a deep copy
+	df_std = standardize_data(df_raw, schema, copy=False)
+	_lap("standardize")
+	df_std, df_repairs = repair_data(df_raw, df_std, schema)
+	_lap("repair")
+	custom = evaluate_rules(df_std, schema)
+	_lap("rules")
+	ge_result = validate_data(df_std, schema, custom=custom)
+	_lap("validate")
+	profiles = profile_data(df_std, schema)
+	_lap("profile")
+	violations = list(rule_violations(df_std, schema, custom=custom))
+	df_flagged = flag_invalid_rows(df_std, schema, copy=False, with_errors=with_errors, violations=violations)
+	df_violations = violations_table(df_std, violations, schema, df_raw) if with_violations else None
+	_lap("flag")
+	rule_counts = {(col, rule_id): int(np.count_nonzero(mask)) for col, rule_id, _, mask in violations}
+	timeline = failure_timeline(df_std, df_flagged["is_valid"].to_numpy(), schema)
+	_lap("charts")
+	rule_timings = {(result.column, result.rule_id): result.seconds for result in custom}
+	return ChunkResult(
+		df_std, df_flagged, ge_result, profiles, df_violations, df_repairs, rule_counts, timeline, timings, rule_timings
+	)
+
+
+def _iter_chunks(input_csv: str, chunksize: int | None, skip_rows: int = 0, sizer: ChunkSizer | None = None):
+	"""Yield the input in chunks indexed by row id (0-based data row of the file).
+
+	With a sizer, each chunk has sizer.rows rows and is measured by the sizer
+	before it is yielded.
+	"""
+	# Compressed inputs are decompressed on a background thread (see compression.open_input)
+	with open_input(input_csv) as stream:
+		if chunksize is None:
+			yield pd.read_csv(stream)
+			return
+		with pd.read_csv(stream, iterator=True) as reader:
+			# Resumed runs parse and drop the committed records: a quoted field may
+			# span lines, so skipping physical lines could cut a record in two
+			while skip_rows:
+				try:
+					skip_rows -= len(reader.get_chunk(min(skip_rows, sizer.rows if sizer is not None else chunksize)))
+				except StopIteration:
+					return
+			while True:
+				try:
+					chunk = reader.get_chunk(sizer.rows if sizer is not None else chunksize)
+				except StopIteration:
+					return
+				if sizer is not None:
+					sizer.observe_chunk(chunk)
+				yield chunk
+
+
+def _chunk_sizer(chunksize, memory_budget: int | None, pipelined: bool, queue_size: int) -> ChunkSizer | None:
+	if chunksize != "auto":
+		return None
+	# The staged runner holds up to queue_size + 2 chunks at once
+	return ChunkSizer(memory_budget, in_flight=queue_size + 2 if pipelined else 1)
+
+
+def _observe_chunk_size(sizer: ChunkSizer, metrics: PipelineMetrics | None, rows: int, seconds: float) -> None:
+	"""Feed a committed chunk's processing time back to the sizer (and its size to metrics)."""
+	sizer.observe_latency(rows, seconds)
+	if metrics is not None:
+		metrics.observe_chunk_size(rows, sizer.headroom_bytes)
+
+
+class _ChunkWriter:
+	"""Writer stage: appends each processed chunk to the outputs and merges its results.
+
+	Outputs are written to .part files; with a checkpoint, the committed state is
+	saved every `checkpoint_every` chunks so a restarted run can resume from it.
+	"""
+
+	def __init__(
+		self,
+		standardized_csv: str,
+		invalid_csv: str,
+		checkpoint: Checkpoint | None = None,
+		checkpoint_every: int = 1,
+		codec: str | None = None,
+		level: int | None = None,
+		violations: ViolationsWriter | None = None,
+		repairs_csv: str | None = None,
+		metrics: PipelineMetrics | None = None,
+	):
+		self.standardized_csv = standardized_csv
+		self.violations = violations
+		self.invalid_csv = invalid_csv
+		self.repairs_csv = repairs_csv
+		self.metrics = metrics
+		self.codec = codec
+		self.level = level
+		self.checkpoint = checkpoint
+		self.checkpoint_every = checkpoint_every
+		self.ge_result = None
+		self.profiles = None
+		self.invalid_parts = []
+		self.repair_counts = {}
+		self.rule_counts = {}
+		self.timings = {}
+		self.rule_timings = {}
+		self.timeline = None
+		self.total_rows = 0
+		self.byte_offset = None
+		self.chunks = 0
+		self.refresh = None
+
+	@property
+	def outputs(self) -> list[str]:
+		paths = [self.standardized_csv, self.invalid_csv] + ([self.repairs_csv] if self.repairs_csv else [])
+		return [part_path(path) for path in paths]
+
+	def __call__(self, result: ChunkResult) -> None:
+		started = time.perf_counter()
+		# Save outputs (appending after the first chunk)
+		write_csv(result.standardized, part_path(self.standardized_csv), self.chunks > 0, self.codec, self.level)
+		self._commit(result, len(result.flagged), started)
+
+	def append_range(self, ranged) -> None:
+		"""Writer for byte-range mode: splice in a worker's part file and merge its results."""
+		started = time.perf_counter()
+		end, range_part, rows, result = ranged
+		# Workers index rows within their range; ranges arrive in file order, so
+		# shifting by the rows committed so far gives the row ids
+		result.flagged.index += self.total_rows
+		result.repairs["row_id"] += self.total_rows
+		if result.violations is not None:
+			result.violations["row_id"] += self.total_rows
+		with open(range_part, "rb") as src, open(part_path(self.standardized_csv), "ab" if self.chunks else "wb") as dst:
+			shutil.copyfileobj(src, dst, 1 << 20)
+		os.remove(range_part)
+		self._commit(result, rows, started, byte_offset=end)
+
+	def _commit(self, result: ChunkResult, rows: int, started: float, byte_offset: int | None = None) -> None:
+		if self.violations is not None:
+			self.violations.write(result.violations, self.chunks)
+		# Positional take of the (usually few) invalid rows instead of a boolean-mask copy
+		df_flagged = result.flagged
+		df_invalid = df_flagged.take(np.flatnonzero(~df_flagged["is_valid"].to_numpy()))
+		write_csv(_with_row_ids(df_invalid), part_path(self.invalid_csv), self.chunks > 0, self.codec, self.level)
+		if self.repairs_csv:
+			write_csv(result.repairs, part_path(self.repairs_csv), self.chunks > 0, self.codec, self.level)
+		if self.refresh is not None:
+			# Merging modifies the merged-into results, so the tally gets its own copies
+			self.refresh._tally(
+				result._replace(ge_result=copy.deepcopy(result.ge_result), profiles=copy.deepcopy(result.profiles)), rows, df_invalid
+			)
+		chunk_repairs = self._tally(result, rows, df_invalid)
+		self.byte_offset = byte_offset
+		self.chunks += 1
+
+		if self.checkpoint and self.chunks % self.checkpoint_every == 0:
+			self.checkpoint.save(self.state())
+		if self.metrics is not None:
+			self.metrics.observe_chunk(
+				rows,
+				len(df_invalid),
+				result.rule_counts,
+				chunk_repairs,
+				result.timings,
+				time.perf_counter() - started,
+				result.rule_timings,
+			)
+
+	def _tally(self, result: ChunkResult, rows: int, df_invalid: pd.DataFrame) -> dict:
+		"""Merge a committed chunk's results into the totals; returns its repair counts."""
+		self.ge_result = merge_validation_results(self.ge_result, result.ge_result)
+		self.profiles = merge_profiles(self.profiles, result.profiles)
+		self.invalid_parts.append(df_invalid)
+		chunk_repairs = {action: int(count) for action, count in result.repairs["action"].value_counts().items()}
+		for action, count in chunk_repairs.items():
+			self.repair_counts[action] = self.repair_counts.get(action, 0) + count
+		for rule, count in result.rule_counts.items():
+			self.rule_counts[rule] = self.rule_counts.get(rule, 0) + count
+		self.timeline = merge_timelines(self.timeline, result.timeline)
+		for stage, seconds in result.timings.items():
+			self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+		for rule, seconds in result.rule_timings.items():
+			self.rule_timings[rule] = self.rule_timings.get(rule, 0.0) + seconds
+		self.total_rows += rows
+		return chunk_repairs
+
+	def start_refresh(self) -> None:
+		"""Also total the chunks committed from now on by themselves, in self.refresh
+		(the rows an incremental run appends)."""
+		self.refresh = _ChunkWriter(None, None)
+
+	def state(self) -> dict:
+		return {
+			"chunks": self.chunks,
+			"rows": self.total_rows,
+			"byte_offset": self.byte_offset,
+			"outputs": {path: os.path.getsize(path) for path in self.outputs},
+			"ge_result": self.ge_result,
+			"repair_counts": self.repair_counts,
+			"rule_counts": [[col, rule_id, count] for (col, rule_id), count in self.rule_counts.items()],
+			"timeline": self.timeline,
+			"timings": self.timings,
+			"rule_timings": [[col, rule_id, seconds] for (col, rule_id), seconds in self.rule_timings.items()],
+			"profiles": profiles_to_dict(self.profiles),
+		}
+
+	def restore(self, state: dict) -> None:
+		"""Continue from a checkpoint: cut the .part files back to their committed size."""
+		for path, size in state["outputs"].items():
+			truncate(path, size)
+		self.chunks = state["chunks"]
+		self.total_rows = state["rows"]
+		self.byte_offset = state.get("byte_offset")
+		self.ge_result = state["ge_result"]
+		self.repair_counts = state.get("repair_counts", {})
+		self.rule_counts = {(col, rule_id): count for col, rule_id, count in state.get("rule_counts", [])}
+		self.timeline = state.get("timeline")
+		self.timings = state.get("timings", {})
+		self.rule_timings = {(col, rule_id): seconds for col, rule_id, seconds in state.get("rule_timings", [])}
+		self.profiles = profiles_from_dict(state["profiles"])
+		self.invalid_parts = [pd.read_csv(part_path(self.invalid_csv), compression=self.codec, index_col=ROW_ID)]
+		if self.violations is not None:
+			self.violations.discard_from(self.chunks)
+
+	def reopen(self) -> None:
+		"""Move published outputs back to .part files so an incremental run appends to them."""
+		for path in (self.standardized_csv, self.invalid_csv, self.repairs_csv):
+			if path:
+				reopen(path)
+		if self.violations is not None:
+			self.violations.reopen()
+
+	def absorb(self, other: "_ChunkWriter", source: str) -> None:
+		"""Add another writer's committed statistics to this one (a total over several files).
+
+		Its invalid rows are kept with a leading 'source' column naming their file.
+		"""
+		self.ge_result = merge_validation_results(self.ge_result, other.ge_result)
+		self.profiles = merge_profiles(self.profiles, other.profiles)
+		for part in other.invalid_parts:
+			self.invalid_parts.append(part.copy())
+			self.invalid_parts[-1].insert(0, "source", source)
+		for total, counts in ((self.repair_counts, other.repair_counts), (self.rule_counts, other.rule_counts)):
+			for key, count in counts.items():
+				total[key] = total.get(key, 0) + count
+		for total, seconds in ((self.timings, other.timings), (self.rule_timings, other.rule_timings)):
+			for key, value in seconds.items():
+				total[key] = total.get(key, 0.0) + value
+		self.timeline = merge_timelines(self.timeline, other.timeline)
+		self.total_rows += other.total_rows
+		self.chunks += other.chunks
+
+	def finalize(self) -> None:
+		for path in (self.standardized_csv, self.invalid_csv, self.repairs_csv):
+			if path:
+				finalize(path)
+		if self.violations is not None:
+			self.violations.finalize()
+		if self.checkpoint:
+			self.checkpoint.clear()
+
+
 def run_pipeline(
 	input_csv: str = os.path.join("data", "rawdata.csv"),
 	schema_path: str = os.path.join("config", "schema.json"),
 	standardized_csv: str = os.path.join("data", "standardized.csv"),
 	invalid_csv: str = os.path.join("data", "invalid_rows.csv"),
 	report_html: str = os.path.join("reports", "report.html"),
+	chunksize: int | str | None = None,
+	profile_store: str | None = None,
+	pipelined: bool = False,
+	workers: int = 2,
+	queue_size: int = 4,
+	executor: str = "thread",
+	checkpoint_path: str | None = None,
+	checkpoint_every: int = 1,
+	output_codec: str | None = None,
+	output_level: int | None = None,
+	reader: str = "pandas",
+	range_bytes: int = 64 << 20,
+	violations_path: str | None = None,
+	errors_column: bool = True,
+	repairs_csv: str | None = None,
+	metrics: PipelineMetrics | None = None,
+	metrics_textfile: str | None = None,
+	run_store: str | None = None,
+	incremental_state: str | None = None,
+	memory_budget: int | None = None,
+	feed: str | None = None,
 ):
+	"""Run the pipeline; with chunksize the input is streamed and results are merged per chunk.
+
+	With profile_store, the run's column profiles are snapshotted there and compared
+	against a rolling baseline of earlier runs of the same feed (drift expectations).
+	The feed defaults to the input's file stem (drift.feed_name); pass feed when
+	the file names change between runs, e.g. orders_2024-01-02.csv.
+	With pipelined (and a chunksize), reading, per-chunk compute on `workers` threads
+	(or processes, executor="process") and writing run as overlapping stages joined
+	by a queue of `queue_size` chunks; output order is preserved.
+	With checkpoint_path (and a chunksize), progress is checkpointed every
+	`checkpoint_every` chunks and a rerun with the same input and schema resumes
+	after the last committed chunk. Outputs only appear under their final names
+	once the run is complete.
+	Inputs ending in .gz/.zst are decompressed on a background thread; with
+	output_codec ("gzip" or "zstd", at output_level) the CSV outputs are written
+	compressed and get the matching suffix.
+	With reader="mmap", an uncompressed local CSV is memory-mapped and split into
+	record-aligned byte ranges of about range_bytes, which are parsed and
+	processed on `workers` processes and merged in file order.
+	With violations_path, a long-format violations table (row_id, column, rule_id,
+	observed) is written there as a Parquet dataset; errors_column=False drops the
+	string 'errors' column from the flagged output.
+	Values coerced to NaN/NaT are quarantined and fixed where the schema lists
+	"repair" strategies or a "default"; with repairs_csv, every repaired or
+	quarantined value is logged there with its raw text (row_id, column, action, raw).
+	With metrics (a metrics.PipelineMetrics), per-chunk counters and stage latency
+	histograms are recorded there; metrics_textfile writes them in OpenMetrics
+	format at the end of the run (for a textfile collector).
+	With run_store (a SQLite file, see run_store.RunStore), the run's statistics,
+	per-rule counts, stage timings and profiles are appended to the run history.
+	With incremental_state (a JSON file), the input is treated as append-only: the
+	byte offset and merged state are kept there after each run, and the next run
+	reads only complete records appended since, appends to the existing outputs
+	and rewrites the report from the merged state. This implies reader="mmap".
+	Each such refresh is recorded in run_store and metrics with only the rows it
+	appended, and its profile_store snapshot holds only those rows: drift compares
+	the new rows with the rows appended by the last refreshes of the feed (a
+	refresh without new rows is not snapshotted). new_rows counts them.
+	With chunksize="auto", each chunk's row count is chosen from the measured
+	bytes per row, memory_budget (bytes; default half of the memory available to
+	the process, cgroup-aware) and the observed per-chunk latency; the chosen
+	sizes and memory headroom are returned under "chunking" (see
+	resources.ChunkSizer).
+	"""
+	started_at = datetime.now()
+	started = time.perf_counter()
+	if metrics_textfile and metrics is None:
+		metrics = PipelineMetrics()
 	schema = load_schema(schema_path)
-	df_raw = pd.read_csv(input_csv)
-	df_std = standardize_data(df_raw, schema)
-	ge_result = validate_data(df_std, schema)
-	df_flagged = flag_invalid_rows(df_std, schema)
+	standardized_csv = with_codec_suffix(standardized_csv, output_codec)
+	invalid_csv = with_codec_suffix(invalid_csv, output_codec)
+	if repairs_csv:
+		repairs_csv = with_codec_suffix(repairs_csv, output_codec)
+	if incremental_state:
+		reader = "mmap"
+	if reader == "mmap" and detect_codec(input_csv):
+		raise ValueError("reader='mmap' needs an uncompressed CSV")
+	layout = {"mmap": range_bytes} if reader == "mmap" else chunksize
+	# Resumed runs append to the existing parts, so they must be written the same way
+	output_options = {
+		"errors_column": errors_column,
+		"codec": output_codec,
+		"repairs": repairs_csv is not None,
+		"violations": violations_path is not None,
+	}
+	checkpoint = None
+	if checkpoint_path and layout:
+		checkpoint = Checkpoint(checkpoint_path, run_fingerprint(input_csv, schema, layout, output_options))
+	violations = ViolationsWriter(violations_path) if violations_path else None
+	writer = _ChunkWriter(
+		standardized_csv, invalid_csv, checkpoint, checkpoint_every, output_codec, output_level, violations, repairs_csv, metrics
+	)
+	tail = None
+	if incremental_state:
+		tail = TailState(incremental_state, input_csv, schema, output_options)
+	saved = checkpoint.load() if checkpoint else None
+	if saved is None and tail is not None:
+		saved = tail.load()
+		if saved and (violations is None or os.path.isdir(violations.path)):
+			writer.reopen()
+		else:
+			saved = None
+	if saved:
+		writer.restore(saved)
+	elif violations is not None:
+		violations.discard_from(0)
+	if tail is not None:
+		writer.start_refresh()
+	process = partial(_process_chunk, schema=schema, with_errors=errors_column, with_violations=violations is not None)
+
+	sizer = None
+	if reader == "mmap":
+		range_dir = standardized_csv + ".ranges"
+		os.makedirs(range_dir, exist_ok=True)
+		columns, header_end = read_header(input_csv)
+		worker = partial(
+			process_byte_range,
+			path=input_csv,
+			columns=columns,
+			process=process,
+			out_dir=range_dir,
+			codec=output_codec,
+			level=output_level,
+		)
+		ranges = split_byte_ranges(input_csv, range_bytes, start=writer.byte_offset, complete_only=tail is not None)
+		if writer.chunks:
+			# Resumed after the header-only chunk below: the outputs already have their header
+			ranges = ((False, start, end) for _, start, end in ranges)
+		run_staged(ranges, worker, writer.append_range, workers=workers, queue_size=queue_size, executor="process")
+		shutil.rmtree(range_dir, ignore_errors=True)
+		if not writer.chunks:
+			# No (complete) data records: an empty chunk gives every output its header and
+			# the report its statistics, and an incremental run continues after the header
+			writer(process(pd.DataFrame({col: pd.Series(dtype=object) for col in columns})))
+			writer.byte_offset = header_end
+	else:
+		sizer = _chunk_sizer(chunksize, memory_budget, pipelined, queue_size)
+		write = writer
+		if sizer is not None:
+			def write(result: ChunkResult) -> None:
+				writer(result)
+				_observe_chunk_size(sizer, metrics, len(result.flagged), sum(result.timings.values()))
+
+		chunks = _iter_chunks(input_csv, chunksize, skip_rows=writer.total_rows, sizer=sizer)
+		if pipelined:
+			run_staged(chunks, process, write, workers=workers, queue_size=queue_size, executor=executor)
+		else:
+			for df_raw in chunks:
+				write(process(df_raw))
+	# Copied before _finish adds this run's drift results to the merged statistics
+	tail_state = copy.deepcopy(writer.state()) if tail is not None else None
+	outputs = _finish(writer, schema, input_csv, report_html, profile_store, feed or feed_name(input_csv))
+	# An incremental run's history and metrics cover the rows it appended, like its duration
+	new = writer.refresh or writer
+	if tail is not None:
+		tail.save(tail_state)
+		outputs["new_rows"] = new.total_rows
+	if sizer is not None:
+		outputs["chunking"] = sizer.report()
+	if run_store:
+		_record_run(RunStore(run_store), input_csv, schema, new, outputs, started_at, time.perf_counter() - started)
+	if metrics is not None:
+		metrics.observe_run(new.total_rows, time.perf_counter() - started, new.ge_result)
+		if metrics_textfile:
+			metrics.write_textfile(metrics_textfile)
+	return outputs
+
+
+def _finish(writer: _ChunkWriter, schema: dict, input_csv: str, report_html: str, profile_store: str | None, feed: str) -> dict:
+	"""Publish a writer's outputs, run drift checks and write the report; returns the run summary."""
+	writer.finalize()
+	return _report(writer, schema, input_csv, report_html, profile_store, feed)
+
 
-	# Save outputs
-	df_std.to_csv(standardized_csv, index=False)
-	df_flagged.loc[~df_flagged["is_valid"]].to_csv(invalid_csv, index=False)
-	generate_html_report(report_html, input_csv, df_flagged, ge_result)
+def _report(writer: _ChunkWriter, schema: dict, input_csv: str, report_html: str, profile_store: str | None, feed: str) -> dict:
+	"""Run drift checks on a writer's merged statistics and write the report (see _finish)."""
+	ge_result, profiles, total_rows = writer.ge_result, writer.profiles, writer.total_rows
+
+	# An incremental run snapshots and checks only the rows it appended (see run_pipeline)
+	new = writer.refresh or writer
+	if profile_store and (new is writer or new.total_rows):
+		runs = schema.get("drift", {}).get("baseline_runs", DEFAULT_DRIFT["baseline_runs"])
+		baseline = load_baseline(profile_store, feed, runs)
+		if baseline:
+			drift_results = detect_drift(new.profiles, baseline, schema)
+			add_drift_results(ge_result, drift_results)
+			if new is not writer:
+				add_drift_results(new.ge_result, drift_results)
+		save_profile_snapshot(profile_store, feed, new.profiles, new.total_rows)
+
+	# Empty parts (a header-only chunk, or one restored from a header-only file) have no dtypes to merge
+	df_invalid = pd.concat([part for part in writer.invalid_parts if len(part)] or writer.invalid_parts[-1:])
+	charts = build_chart_data(profiles, writer.rule_counts, writer.timeline)
+	generate_html_report(
+		report_html,
+		input_csv,
+		df_invalid,
+		ge_result,
+		profiles=profiles,
+		total_rows=total_rows,
+		repair_counts=writer.repair_counts,
+		charts=charts,
+		rule_timings=writer.rule_timings,
+	)
 
 	return {
-		"standardized_csv": standardized_csv,
-		"invalid_csv": invalid_csv,
+		"standardized_csv": writer.standardized_csv,
+		"invalid_csv": writer.invalid_csv,
 		"report_html": report_html,
+		"violations_path": writer.violations.path if writer.violations is not None else None,
+		"repairs_csv": writer.repairs_csv,
+		"total_rows": total_rows,
+		"invalid_rows": len(df_invalid),
+		"repairs": writer.repair_counts,
+		"charts": charts,
+		"rule_timings": [
+			{"column": col, "rule_id": rule_id, "seconds": seconds} for (col, rule_id), seconds in writer.rule_timings.items()
+		],
 		"ge_result_summary": ge_result.get("statistics", {}) if isinstance(ge_result, dict) else {},
 	}
 
 
+def _record_run(
+	store: RunStore,
+	input_csv: str,
+	schema: dict,
+	writer: _ChunkWriter,
+	outputs: dict,
+	started_at: datetime,
+	seconds: float,
+	route: str | None = None,
+) -> None:
+	"""Append a writer's totals to the run history and put the run id in outputs."""
+	outputs["run_id"] = store.record_run(
+		os.path.abspath(input_csv),
+		schema_hash(schema),
+		started_at,
+		seconds,
+		writer.total_rows,
+		sum(len(part) for part in writer.invalid_parts),
+		writer.ge_result["statistics"] if writer.ge_result else {},
+		writer.rule_counts,
+		timings=writer.timings,
+		profiles=profiles_to_dict(writer.profiles) if writer.profiles else None,
+		route=route,
+	)
+
+
+def _route_chunk(df_raw: pd.DataFrame, schemas: dict, route_column: str, process) -> tuple[dict, pd.DataFrame]:
+	"""Partition a chunk by its route column with one groupby and process each partition
+	with its own schema. Returns ({route: ChunkResult}, rows matching no route)."""
+	if route_column not in df_raw.columns:
+		raise ValueError(f"route column '{route_column}' not found in input")
+	keys = df_raw[route_column]
+	if pd.api.types.is_float_dtype(keys):
+		# Integer codes are read as floats once the column has a null: 1.0 must still match route "1"
+		text = keys.astype(str)
+		integral = (keys % 1 == 0).to_numpy()
+		text[integral] = keys[integral].astype(np.int64).astype(str)
+		keys = text.where(keys.notna())
+	elif keys.dtype != object:
+		keys = keys.astype(str).where(keys.notna())
+	results = {}
+	unrouted = [np.flatnonzero(keys.isna().to_numpy())]
+	for key, positions in df_raw.groupby(keys, sort=False).indices.items():
+		if key in schemas:
+			results[key] = process(df_raw.take(positions), schema=schemas[key])
+		else:
+			unrouted.append(positions)
+	return results, df_raw.take(np.sort(np.concatenate(unrouted)))
+
+
+def run_routed_pipeline(
+	input_csv: str,
+	schema_paths: dict[str, str],
+	route_column: str = "record_type",
+	output_dir: str = "routed",
+	chunksize: int | str | None = None,
+	profile_store: str | None = None,
+	pipelined: bool = False,
+	workers: int = 2,
+	queue_size: int = 4,
+	executor: str = "thread",
+	output_codec: str | None = None,
+	output_level: int | None = None,
+	errors_column: bool = True,
+	metrics: PipelineMetrics | None = None,
+	run_store: str | None = None,
+	memory_budget: int | None = None,
+	feed: str | None = None,
+):
+	"""Validate a mixed feed against several schemas in a single read of the input.
+
+	schema_paths maps each value of route_column to a schema file. Every chunk is
+	partitioned by route with one groupby and each partition is processed with its
+	compiled schema. Each route gets <output_dir>/<route>/standardized.csv,
+	invalid_rows.csv and report.html; rows whose route has no schema go to
+	<output_dir>/unrouted.csv. chunksize (including "auto" with memory_budget),
+	pipelined/workers/executor, profile_store, feed and output_codec work as in run_pipeline (drift baselines are kept per route);
+	with run_store, each route is recorded as its own run.
+	"""
+	started_at = datetime.now()
+	started = time.perf_counter()
+	schemas = {route: load_schema(path) for route, path in schema_paths.items()}
+	writers = {}
+	for route in schemas:
+		route_dir = os.path.join(output_dir, route)
+		os.makedirs(route_dir, exist_ok=True)
+		writers[route] = _ChunkWriter(
+			with_codec_suffix(os.path.join(route_dir, "standardized.csv"), output_codec),
+			with_codec_suffix(os.path.join(route_dir, "invalid_rows.csv"), output_codec),
+			codec=output_codec,
+			level=output_level,
+			metrics=metrics,
+		)
+	unrouted_csv = with_codec_suffix(os.path.join(output_dir, "unrouted.csv"), output_codec)
+	unrouted_rows = 0
+	chunks_read = 0
+	sizer = _chunk_sizer(chunksize, memory_budget, pipelined, queue_size)
+
+	def _write(routed) -> None:
+		nonlocal unrouted_rows, chunks_read
+		results, df_unrouted = routed
+		for route, result in results.items():
+			writers[route](result)
+		write_csv(_with_row_ids(df_unrouted), part_path(unrouted_csv), chunks_read > 0, output_codec, output_level)
+		unrouted_rows += len(df_unrouted)
+		chunks_read += 1
+		if sizer is not None:
+			rows = len(df_unrouted) + sum(len(result.flagged) for result in results.values())
+			seconds = sum(sum(result.timings.values()) for result in results.values())
+			_observe_chunk_size(sizer, metrics, rows, seconds)
+
+	process = partial(
+		_route_chunk,
+		schemas=schemas,
+		route_column=route_column,
+		process=partial(_process_chunk, with_errors=errors_column),
+	)
+	chunks = _iter_chunks(input_csv, chunksize, sizer=sizer)
+	if pipelined:
+		run_staged(chunks, process, _write, workers=workers, queue_size=queue_size, executor=executor)
+	else:
+		for df_raw in chunks:
+			_write(process(df_raw))
+	if not chunks_read:
+		# The reader yielded nothing: still publish the unrouted file, with just its header
+		with open_input(input_csv) as stream:
+			df_empty = pd.read_csv(stream, nrows=0)
+		write_csv(_with_row_ids(df_empty), part_path(unrouted_csv), False, output_codec, output_level)
+	finalize(unrouted_csv)
+
+	routes = {}
+	feed = feed or feed_name(input_csv)
+	for route, writer in writers.items():
+		if not writer.chunks:
+			continue  # no rows for this route
+		report_html = os.path.join(output_dir, route, "report.html")
+		routes[route] = _finish(writer, schemas[route], input_csv, report_html, profile_store, f"{feed}.{route}")
+	if run_store:
+		store = RunStore(run_store)
+		seconds = time.perf_counter() - started
+		for route, outputs in routes.items():
+			_record_run(store, input_csv, schemas[route], writers[route], outputs, started_at, seconds, route=route)
+	total_rows = unrouted_rows + sum(outputs["total_rows"] for outputs in routes.values())
+	if metrics is not None:
+		metrics.observe_run(total_rows, time.perf_counter() - started)
+
+	outputs = {
+		"routes": routes,
+		"unrouted_csv": unrouted_csv,
+		"unrouted_rows": unrouted_rows,
+		"total_rows": total_rows,
+	}
+	if sizer is not None:
+		outputs["chunking"] = sizer.report()
+	return outputs
+
+
+def process_shard(
+	shard: dict,
+	schema_path: str,
+	work_dir: str,
+	errors_column: bool = True,
+	output_codec: str | None = None,
+	output_level: int | None = None,
+) -> dict:
+	"""Worker side of a sharded run (see cluster.py): process one shard into part files.
+
+	A shard is a byte range of an uncompressed CSV ({"id", "path", "first",
+	"start", "end"}) or a whole compressed file ({"id", "path"}), with the
+	coordinator's "attempt" number. The standardized rows, invalid rows and
+	repairs are written under work_dir, which the coordinator reads; the returned
+	statistics are plain JSON.
+	"""
+	schema = load_schema(schema_path)
+	process = partial(_process_chunk, schema=schema, with_errors=errors_column)
+	shard_dir = _shard_dir(work_dir, shard)
+	os.makedirs(shard_dir, exist_ok=True)
+	if "start" in shard:
+		columns, _ = read_header(shard["path"])
+		byte_range = (shard["first"], shard["start"], shard["end"])
+		end, part, rows, result = process_byte_range(
+			byte_range, shard["path"], columns, process, shard_dir, output_codec, output_level
+		)
+		df_invalid = result.flagged
+	else:
+		result = process(next(_iter_chunks(shard["path"], None)))
+		end, part, rows = None, os.path.join(shard_dir, "standardized.csv"), len(result.flagged)
+		write_csv(result.standardized, part, False, output_codec, output_level)
+		df_invalid = result.flagged.take(np.flatnonzero(~result.flagged["is_valid"].to_numpy()))
+	invalid_part = os.path.join(shard_dir, "invalid_rows.csv")
+	write_csv(_with_row_ids(df_invalid), invalid_part, False)
+	repairs_part = os.path.join(shard_dir, "repairs.csv")
+	write_csv(result.repairs, repairs_part, False)
+	return {
+		"end": end,
+		"rows": rows,
+		"standardized": part,
+		"invalid": invalid_part,
+		"repairs": repairs_part,
+		"ge_result": result.ge_result,
+		"profiles": profiles_to_dict(result.profiles),
+		"rule_counts": [[col, rule_id, count] for (col, rule_id), count in result.rule_counts.items()],
+		"timeline": result.timeline,
+		"timings": result.timings,
+		"rule_timings": [[col, rule_id, seconds] for (col, rule_id), seconds in result.rule_timings.items()],
+	}
+
+
+def _shard_dir(work_dir: str, shard: dict) -> str:
+	"""The directory an attempt at a shard writes its part files to."""
+	# One directory per attempt: a requeued shard may run while a hung worker still writes
+	return os.path.join(work_dir, f"shard-{shard['id']:06d}-{shard.get('attempt', 1)}")
+
+
+def _check_shard_reply(reply: dict, shard_dir: str) -> None:
+	"""Reject a reply whose part files are not inside its attempt's directory.
+
+	The coordinator reads and deletes these files, so a reply must not be able
+	to point it anywhere else.
+	"""
+	root = os.path.realpath(shard_dir)
+	for key in ("standardized", "invalid", "repairs"):
+		path = reply.get(key)
+		if not isinstance(path, str) or os.path.dirname(os.path.realpath(path)) != root:
+			raise ShardRejected(f"reply file {key}={path!r} is not in {shard_dir}")
+
+
+def _shard_result(reply: dict):
+	"""A worker's reply as the (end, part file, rows, ChunkResult) _ChunkWriter.append_range takes."""
+	# Read back as text, so the values are written out again exactly as the worker wrote them
+	flagged = pd.read_csv(reply["invalid"], dtype=str, keep_default_na=False, index_col=ROW_ID)
+	flagged.index = flagged.index.astype(np.int64)
+	flagged["is_valid"] = flagged["is_valid"] == "True"
+	repairs = pd.read_csv(reply["repairs"], dtype=str, keep_default_na=False)
+	repairs["row_id"] = repairs["row_id"].astype(np.int64)
+	result = ChunkResult(
+		None,
+		flagged,
+		reply["ge_result"],
+		profiles_from_dict(reply["profiles"]),
+		None,
+		repairs,
+		{(col, rule_id): count for col, rule_id, count in reply["rule_counts"]},
+		reply["timeline"],
+		reply["timings"],
+		{(col, rule_id): seconds for col, rule_id, seconds in reply["rule_timings"]},
+	)
+	return reply["end"], reply["standardized"], reply["rows"], result
+
+
+def run_sharded_pipeline(
+	inputs: list[str],
+	schema_path: str = os.path.join("config", "schema.json"),
+	output_dir: str = "sharded",
+	address: str = "127.0.0.1:0",
+	local_workers: int = 2,
+	range_bytes: int = 64 << 20,
+	work_dir: str | None = None,
+	max_attempts: int = 3,
+	lease_timeout: float | None = 600.0,
+	errors_column: bool = True,
+	with_repairs: bool = False,
+	output_codec: str | None = None,
+	output_level: int | None = None,
+	profile_store: str | None = None,
+	metrics: PipelineMetrics | None = None,
+	run_store: str | None = None,
+):
+	"""Validate many files on worker processes, on this machine or others, and merge one report.
+
+	Each uncompressed input is split into record-aligned byte ranges of about
+	range_bytes (compressed inputs are one shard each). A coordinator listening on
+	`address` (a Unix socket path or host:port; see cluster.py) hands the shards to
+	`local_workers` worker processes started here and to any worker started
+	elsewhere with `python cluster.py work ADDRESS`. Workers write part files to
+	work_dir (default <output_dir>/.shards), which must be on a filesystem every
+	machine can reach under the same path, as must the inputs and the schema. A
+	shard whose worker fails, disconnects or holds it for lease_timeout seconds
+	is handed out again, up to max_attempts times.
+	Replies are merged in file order, so each file gets
+	<output_dir>/<file stem>/standardized.csv and invalid_rows.csv (and
+	repairs.csv with with_repairs), row ids included, identical to those of
+	run_pipeline(reader="mmap") with the same range_bytes. The statistics of all files are merged into
+	<output_dir>/report.html, whose invalid records carry a 'source' column.
+	profile_store (one feed named after output_dir), metrics and run_store (one
+	run per file) work as in run_pipeline.
+	"""
+	started_at = datetime.now()
+	started = time.perf_counter()
+	schema = load_schema(schema_path)
+	work_dir = os.path.abspath(work_dir or os.path.join(output_dir, ".shards"))
+	os.makedirs(work_dir, exist_ok=True)
+	writers, shards, names = {}, [], {}
+	for path in dict.fromkeys(os.path.abspath(path) for path in inputs):
+		name = feed_name(path)
+		if name in names.values():
+			name = f"{name}-{len(names)}"
+		names[path] = name
+		file_dir = os.path.join(output_dir, name)
+		os.makedirs(file_dir, exist_ok=True)
+		writers[path] = _ChunkWriter(
+			with_codec_suffix(os.path.join(file_dir, "standardized.csv"), output_codec),
+			with_codec_suffix(os.path.join(file_dir, "invalid_rows.csv"), output_codec),
+			codec=output_codec,
+			level=output_level,
+			repairs_csv=with_codec_suffix(os.path.join(file_dir, "repairs.csv"), output_codec) if with_repairs else None,
+			metrics=metrics,
+		)
+		ranges = [(True, None, None)] if detect_codec(path) else split_byte_ranges(path, range_bytes)
+		for seq, (first, start, end) in enumerate(ranges):
+			shard = {"id": len(shards), "path": path, "seq": seq}
+			if start is not None:
+				shard.update(first=first, start=start, end=end)
+			shards.append(shard)
+
+	# Replies arrive in any order; each file's are merged in sequence so row ids follow the file
+	waiting = {path: {} for path in writers}
+
+	def _merge(shard: dict, reply: dict) -> None:
+		# Checked on arrival, while the shard can still be handed out again
+		shard_dir = _shard_dir(work_dir, shard)
+		_check_shard_reply(reply, shard_dir)
+		path = shard["path"]
+		waiting[path][shard["seq"]] = (reply, shard_dir)
+		writer = writers[path]
+		while writer.chunks in waiting[path]:
+			reply, shard_dir = waiting[path].pop(writer.chunks)
+			writer.append_range(_shard_result(reply))
+			shutil.rmtree(shard_dir, ignore_errors=True)
+
+	job = {
+		"schema_path": os.path.abspath(schema_path),
+		"work_dir": work_dir,
+		"errors_column": errors_column,
+		"output_codec": output_codec,
+		"output_level": output_level,
+	}
+	queue = coordinate(shards, job, _merge, address, local_workers, max_attempts, lease_timeout)
+	shutil.rmtree(work_dir, ignore_errors=True)
+
+	failed = {shards[shard_id]["path"]: error for shard_id, error in queue.failed.items()}
+	total = _ChunkWriter(None, None)
+	files = {}
+	store = RunStore(run_store) if run_store else None
+	seconds = time.perf_counter() - started
+	for path, writer in writers.items():
+		if path in failed:
+			for part in writer.outputs:
+				if os.path.exists(part):
+					os.remove(part)
+			files[path] = {"error": failed[path]}
+			continue
+		if not writer.chunks:
+			continue  # no data rows
+		writer.finalize()
+		df_invalid = pd.concat(writer.invalid_parts)
+		files[path] = {
+			"standardized_csv": writer.standardized_csv,
+			"invalid_csv": writer.invalid_csv,
+			"repairs_csv": writer.repairs_csv,
+			"total_rows": writer.total_rows,
+			"invalid_rows": len(df_invalid),
+			"ge_result_summary": writer.ge_result["statistics"],
+		}
+		if store is not None:
+			_record_run(store, path, schema, writer, files[path], started_at, seconds)
+		total.absorb(writer, names[path])
+
+	outputs = {"files": files, "shards": len(shards), "failed_files": list(failed), "workers": queue.per_worker}
+	if total.chunks:
+		report_html = os.path.join(output_dir, "report.html")
+		source = f"{len(files) - len(failed)} files ({len(shards)} shards)"
+		feed = os.path.basename(os.path.normpath(output_dir))
+		outputs.update(_report(total, schema, source, report_html, profile_store, feed))
+		for key in ("standardized_csv", "invalid_csv", "violations_path", "repairs_csv"):
+			del outputs[key]
+	if metrics is not None:
+		metrics.observe_run(total.total_rows, time.perf_counter() - started)
+	return outputs
+
+
 if __name__ == "__main__":
 	outputs = run_pipeline()
 	print("Outputs:")
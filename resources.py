@@ -0,0 +1,172 @@
+"""Memory limits and adaptive chunk sizing for the chunked pipeline.
+
+The limit is the smallest of the process's cgroup memory limit (v2 memory.max or
+v1 memory.limit_in_bytes) and physical memory, so containers are sized by their
+own limit rather than the host's. Only the standard library is imported here."""
+import os
+
+_CGROUP_ROOT = "/sys/fs/cgroup"
+# (limit file, usage file) per cgroup version
+_CGROUP_FILES = {"v2": ("memory.max", "memory.current"), "v1": ("memory.limit_in_bytes", "memory.usage_in_bytes")}
+# cgroup v1 reports "no limit" as a page-aligned number close to 2**63
+_UNLIMITED = 1 << 60
+
+# Processing a chunk holds the raw frame, the standardized and flagged frames and the
+# rule masks at once; peak memory is taken as this multiple of the raw frame's size
+EXPANSION = 4.0
+_SAMPLE_ROWS = 1_000
+
+
+def _read_int(path: str) -> int | None:
+    try:
+        with open(path, "r", encoding="ascii") as f:
+            value = int(f.read().strip())
+    except (OSError, ValueError):
+        return None  # missing, or "max"
+    return value if value < _UNLIMITED else None
+
+
+def _cgroup_dir() -> tuple[str, str] | None:
+    """(version, directory) of this process's memory cgroup, if one is mounted."""
+    candidates = []
+    try:
+        with open("/proc/self/cgroup", "r", encoding="utf-8") as f:
+            for line in f:
+                hierarchy, controllers, path = line.rstrip("\n").split(":", 2)
+                if hierarchy == "0":
+                    candidates.append(("v2", os.path.join(_CGROUP_ROOT, path.lstrip("/"))))
+                elif "memory" in controllers.split(","):
+                    candidates.append(("v1", os.path.join(_CGROUP_ROOT, "memory", path.lstrip("/"))))
+    except (OSError, ValueError):
+        pass
+    # Inside a container the process's own cgroup is usually mounted at the root
+    candidates += [("v2", _CGROUP_ROOT), ("v1", os.path.join(_CGROUP_ROOT, "memory"))]
+    for version, directory in candidates:
+        if os.path.exists(os.path.join(directory, _CGROUP_FILES[version][0])):
+            return version, directory
+    return None
+
+
+def _meminfo(key: str) -> int | None:
+    try:
+        with open("/proc/meminfo", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(key + ":"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def memory_limit() -> int | None:
+    """Bytes this process may use: its cgroup limit or physical memory, whichever is lower."""
+    limits = []
+    cgroup = _cgroup_dir()
+    if cgroup:
+        limit = _read_int(os.path.join(cgroup[1], _CGROUP_FILES[cgroup[0]][0]))
+        if limit:
+            limits.append(limit)
+    try:
+        limits.append(os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE"))
+    except (AttributeError, OSError, ValueError):
+        pass
+    return min(limits) if limits else None
+
+
+def available_memory() -> int | None:
+    """Bytes that can still be allocated: cgroup limit minus usage, and MemAvailable."""
+    available = []
+    cgroup = _cgroup_dir()
+    if cgroup:
+        limit_file, usage_file = _CGROUP_FILES[cgroup[0]]
+        limit = _read_int(os.path.join(cgroup[1], limit_file))
+        usage = _read_int(os.path.join(cgroup[1], usage_file))
+        if limit and usage is not None:
+            available.append(max(0, limit - usage))
+    host = _meminfo("MemAvailable")
+    if host is not None:
+        available.append(host)
+    return min(available) if available else None
+
+
+class ChunkSizer:
+    """Picks the row count of each chunk from measured bytes per row, a memory budget
+    and observed per-chunk latency.
+
+    The budget (default: half of the memory available at start) is shared by the
+    `in_flight` chunks a run holds at once. Chunks are also kept near
+    target_seconds of processing: large enough that fixed per-chunk costs do not
+    dominate, small enough to keep stages and checkpoints moving. Until a latency
+    has been observed the size at most doubles per chunk, starting from a small
+    probe. Sizes stay within [min_rows, max_rows].
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int | None = None,
+        in_flight: int = 1,
+        initial_rows: int = 10_000,
+        min_rows: int = 1_000,
+        max_rows: int = 5_000_000,
+        target_seconds: float = 2.0,
+    ):
+        self.limit_bytes = memory_limit()
+        if budget_bytes is None:
+            available = available_memory()
+            budget_bytes = available // 2 if available else 1 << 30
+        self.budget_bytes = int(budget_bytes)
+        self.in_flight = max(1, in_flight)
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.target_seconds = target_seconds
+        self.rows = max(min_rows, min(initial_rows, max_rows))
+        self.bytes_per_row = None
+        self.seconds_per_row = None
+        self.headroom_bytes = None
+        self.min_headroom_bytes = None
+        self.sizes = []
+
+    def observe_chunk(self, df) -> None:
+        """Measure a chunk just read (deep size of a sample of its rows) and resize."""
+        if len(df):
+            sample = df.iloc[:_SAMPLE_ROWS]
+            measured = float(sample.memory_usage(deep=True, index=False).sum()) / len(sample)
+            self.bytes_per_row = measured if self.bytes_per_row is None else max(measured, 0.5 * (self.bytes_per_row + measured))
+        self.sizes.append(len(df))
+        self.headroom_bytes = available_memory()
+        if self.headroom_bytes is not None:
+            if self.min_headroom_bytes is None or self.headroom_bytes < self.min_headroom_bytes:
+                self.min_headroom_bytes = self.headroom_bytes
+        self._resize()
+
+    def observe_latency(self, rows: int, seconds: float) -> None:
+        """Feed back a chunk's processing time (the sum of its stage timings)."""
+        if rows and seconds > 0:
+            measured = seconds / rows
+            # Averaged with the previous estimate to damp noise between chunks
+            self.seconds_per_row = measured if self.seconds_per_row is None else 0.5 * (self.seconds_per_row + measured)
+            self._resize()
+
+    def _resize(self) -> None:
+        if self.seconds_per_row:
+            target = min(self.max_rows, self.target_seconds / self.seconds_per_row)
+        else:
+            target = min(self.max_rows, self.rows * 2.0)  # ramp up until a latency is known
+        if self.bytes_per_row:
+            # Memory taken by other processes since the start shrinks the budget
+            budget = self.budget_bytes if self.headroom_bytes is None else min(self.budget_bytes, self.headroom_bytes)
+            target = min(target, budget / (self.in_flight * EXPANSION * self.bytes_per_row))
+        self.rows = int(max(target, self.min_rows))
+
+    def report(self) -> dict:
+        """Chunk sizes and memory figures of the run, for its outputs and metrics."""
+        sizes = self.sizes or [0]
+        return {
+            "memory_limit_bytes": self.limit_bytes,
+            "budget_bytes": self.budget_bytes,
+            "in_flight": self.in_flight,
+            "bytes_per_row": round(self.bytes_per_row, 1) if self.bytes_per_row else None,
+            "chunks": len(self.sizes),
+            "chunk_rows": {"first": sizes[0], "last": sizes[-1], "min": min(sizes), "max": max(sizes)},
+            "min_headroom_bytes": self.min_headroom_bytes,
+        }
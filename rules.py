@@ -0,0 +1,175 @@
+"""Custom rules: checks registered by name and referenced from schema.json.
+
+A rule is a function registered with @register_rule. A "column" rule receives
+the standardized column; a "frame" rule receives the chunk and the column name.
+Its keyword-only parameters come from the schema entry. It returns a boolean
+violation mask (True = the row fails), optionally with a dict of numeric
+metrics as (mask, metrics). Rules must work on whole columns: the engine
+times every rule per chunk and warns about rules that return plain Python
+iterables or take longer than SLOW_SECONDS_PER_ROW per row.
+
+    from rules import register_rule
+
+    @register_rule("positive_margin", types={"float"}, message="{column} margin below {floor}")
+    def positive_margin(values, *, floor=0.0):
+        return (values < floor).to_numpy()
+
+    "order_amount": {"type": "float", "rules": [{"name": "positive_margin", "floor": 1}]}
+
+Modules defining rules are listed under the schema's top-level "rule_modules" so
+every process running the schema (including worker processes) imports them.
+Only the standard library is imported at module level."""
+import importlib
+import inspect
+import time
+import warnings
+from typing import Callable, NamedTuple
+
+# Above this many seconds per row a rule is reported as not vectorized
+SLOW_SECONDS_PER_ROW = 2e-6
+# Chunks smaller than this are too small to judge a rule's speed
+_MIN_ROWS_TO_JUDGE = 10_000
+# Ids of the rules every schema gets from violations.rule_violations; custom rules may not reuse them
+BUILTIN_RULE_IDS = ["missing_column", "required", "invalid_date", "below_min", "above_max"]
+# Schema entry keys that are not passed to the rule function
+RESERVED_KEYS = {"name", "id", "message"}
+
+
+class Rule(NamedTuple):
+    name: str
+    fn: Callable
+    scope: str
+    types: frozenset | None
+    message: str | None
+    params: dict  # keyword-only parameter -> required?
+
+
+class RuleResult(NamedTuple):
+    """One custom rule evaluated on one chunk."""
+    column: str
+    rule_id: str
+    message: str
+    mask: object  # np.ndarray of bool
+    metrics: dict
+    seconds: float
+
+
+RULES: dict[str, Rule] = {}
+_warned: set = set()
+
+
+def register_rule(name: str, scope: str = "column", types: set | None = None, message: str | None = None):
+    """Decorator registering a rule function under `name`.
+
+    types limits the column types it may be used on. message is a format string
+    over {column} and the rule's parameters (default "{column} failed <rule id>").
+    """
+    if scope not in {"column", "frame"}:
+        raise ValueError(f"rule scope must be 'column' or 'frame', got {scope!r}")
+
+    def decorator(fn: Callable) -> Callable:
+        params = {
+            p.name: p.default is inspect.Parameter.empty
+            for p in inspect.signature(fn).parameters.values()
+            if p.kind is inspect.Parameter.KEYWORD_ONLY
+        }
+        RULES[name] = Rule(name, fn, scope, frozenset(types) if types else None, message, params)
+        return fn
+
+    return decorator
+
+
+def load_rule_modules(schema: dict) -> None:
+    """Import the modules listed under the schema's "rule_modules" (registering their rules)."""
+    for module in schema.get("rule_modules", []):
+        importlib.import_module(module)
+
+
+def rule_ids(schema: dict) -> list[str]:
+    """Ids of the custom rules a schema uses, in schema order."""
+    ids = {}
+    for spec in schema.get("columns", {}).values():
+        for rule in spec.get("rules", []):
+            ids[rule["id"]] = None
+    return list(ids)
+
+
+def _as_mask(out, n: int, where: str):
+    """Convert a rule's return value to a bool array; also says whether it came back vectorized."""
+    if hasattr(out, "to_numpy"):  # Series, or a pandas array; missing counts as passing
+        mask, vectorized = out.to_numpy(dtype=bool, na_value=False), True
+    elif hasattr(out, "dtype") and hasattr(out, "shape"):
+        mask, vectorized = out.astype(bool, copy=False).reshape(-1), True
+    else:
+        # A list or generator was built row by row in Python
+        import numpy as np
+
+        mask, vectorized = np.fromiter((bool(v) for v in out), dtype=bool), False
+    if mask.shape[0] != n:
+        raise ValueError(f"{where} returned {mask.shape[0]} values for {n} rows")
+    return mask, vectorized
+
+
+def _warn_slow(where: str, reason: str) -> None:
+    if where not in _warned:
+        _warned.add(where)
+        warnings.warn(f"{where} is not vectorized ({reason}); it will be slow on large inputs", RuntimeWarning, stacklevel=3)
+
+
+def evaluate_rules(df, schema: dict) -> list[RuleResult]:
+    """Run the custom rules of every column present in df, timing each one."""
+    load_rule_modules(schema)
+    n = len(df)
+    results = []
+    for col, spec in schema.get("columns", {}).items():
+        if col not in df.columns:
+            continue  # reported once as missing_column
+        for entry in spec.get("rules", []):
+            rule = RULES.get(entry["name"])
+            if rule is None:
+                raise ValueError(f"rule '{entry['name']}' is not registered (list its module under 'rule_modules')")
+            where = f"rule '{entry['id']}' on column '{col}'"
+            params = entry["params"]
+            started = time.perf_counter()
+            out = rule.fn(df[col], **params) if rule.scope == "column" else rule.fn(df, col, **params)
+            metrics = {}
+            if isinstance(out, tuple):
+                out, metrics = out
+            mask, vectorized = _as_mask(out, n, where)
+            seconds = time.perf_counter() - started
+            if not vectorized:
+                _warn_slow(where, "it returned a Python iterable")
+            elif n >= _MIN_ROWS_TO_JUDGE and seconds / n > SLOW_SECONDS_PER_ROW:
+                _warn_slow(where, f"{seconds / n * 1e6:.1f} µs per row")
+            template = entry.get("message") or rule.message or f"{{column}} failed {entry['id']}"
+            message = template.format(column=col, **params)
+            # Plain numbers, so metrics survive JSON checkpoints and merging
+            metrics = {name: value.item() if hasattr(value, "item") else value for name, value in metrics.items()}
+            results.append(RuleResult(col, entry["id"], message, mask, metrics, seconds))
+    return results
+
+
+# Built-in rules
+
+@register_rule("pattern", types={"string"}, message="{column} does not match {pattern}")
+def _pattern(values, *, pattern: str):
+    return ~values.str.fullmatch(pattern, na=True)
+
+
+@register_rule("allowed_values", message="{column} not an allowed value")
+def _allowed_values(series, *, values: list):
+    return ~series.isin(values) & series.notna()
+
+
+@register_rule("not_in_future", types={"date"}, message="{column} is in the future")
+def _not_in_future(values):
+    import pandas as pd
+
+    return values > pd.Timestamp.now()
+
+
+@register_rule("not_before", scope="frame", types={"int", "float", "date"}, message="{column} before {other}")
+def _not_before(df, column: str, *, other: str):
+    if other not in df.columns:
+        raise ValueError(f"not_before: column '{other}' not found")
+    return df[column] < df[other]
@@ -0,0 +1,183 @@
+"""Historical run store: one SQLite file recording every run's statistics, per-rule
+counts, stage timings and profile sketches, indexed for trend queries.
+
+Only the standard library is imported at module level."""
+import json
+import os
+import sqlite3
+import zlib
+from datetime import datetime
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    route TEXT,
+    schema_hash TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    duration_s REAL NOT NULL,
+    total_rows INTEGER NOT NULL,
+    invalid_rows INTEGER NOT NULL,
+    evaluated_expectations INTEGER NOT NULL,
+    successful_expectations INTEGER NOT NULL,
+    timings TEXT NOT NULL,
+    profiles BLOB
+);
+CREATE TABLE IF NOT EXISTS rule_counts (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    column_name TEXT NOT NULL,
+    rule_id TEXT NOT NULL,
+    rows INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_source_time ON runs (source, started_at);
+CREATE INDEX IF NOT EXISTS runs_schema_time ON runs (schema_hash, started_at);
+CREATE INDEX IF NOT EXISTS runs_time ON runs (started_at);
+CREATE INDEX IF NOT EXISTS rule_counts_run ON rule_counts (run_id);
+CREATE INDEX IF NOT EXISTS rule_counts_rule ON rule_counts (column_name, rule_id, run_id);
+"""
+
+_RUN_COLUMNS = (
+    "id, source, route, schema_hash, started_at, duration_s, total_rows, invalid_rows, "
+    "evaluated_expectations, successful_expectations, timings"
+)
+
+
+def _filters(source: str | None, schema_hash: str | None, since: str | None, until: str | None, route=None) -> tuple[str, list]:
+    clauses, params = [], []
+    for column, value in (("source", source), ("schema_hash", schema_hash), ("route", route)):
+        if value is not None:
+            clauses.append(f"runs.{column} = ?")
+            params.append(value)
+    if since is not None:
+        clauses.append("runs.started_at >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("runs.started_at < ?")
+        params.append(until)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+class RunStore:
+    """Append-only history of pipeline runs in a local SQLite database.
+
+    Times are ISO-8601 strings (local time, as in the reports), so range filters
+    compare lexicographically and use the (source|schema_hash, started_at) indexes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        # WAL lets the app read history while a pipeline run is being recorded
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def record_run(
+        self,
+        source: str,
+        schema_hash: str,
+        started_at: datetime,
+        duration_s: float,
+        total_rows: int,
+        invalid_rows: int,
+        statistics: dict,
+        rule_counts: dict,
+        timings: dict | None = None,
+        profiles: dict | None = None,
+        route: str | None = None,
+    ) -> int:
+        """Store one run; rule_counts maps (column, rule_id) to failing rows and profiles is
+        profiles_to_dict() output (stored zlib-compressed). Returns the run id."""
+        blob = zlib.compress(json.dumps(profiles).encode("utf-8")) if profiles is not None else None
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (source, route, schema_hash, started_at, duration_s, total_rows, invalid_rows, "
+                "evaluated_expectations, successful_expectations, timings, profiles) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    source,
+                    route,
+                    schema_hash,
+                    started_at.isoformat(timespec="seconds"),
+                    duration_s,
+                    total_rows,
+                    invalid_rows,
+                    statistics.get("evaluated_expectations", 0),
+                    statistics.get("successful_expectations", 0),
+                    json.dumps(timings or {}),
+                    blob,
+                ),
+            )
+            run_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO rule_counts (run_id, column_name, rule_id, rows) VALUES (?, ?, ?, ?)",
+                [(run_id, col, rule_id, int(rows)) for (col, rule_id), rows in rule_counts.items()],
+            )
+        return run_id
+
+    def runs(
+        self,
+        source: str | None = None,
+        schema_hash: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        route: str | None = None,
+        limit: int = 100,
+    ) -> list[dict]:
+        """Most recent runs first, with invalid_ratio and timings decoded."""
+        where, params = _filters(source, schema_hash, since, until, route)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {_RUN_COLUMNS} FROM runs{where} ORDER BY started_at DESC, id DESC LIMIT ?", params + [limit]
+            ).fetchall()
+        out = []
+        for row in rows:
+            run = dict(row)
+            run["timings"] = json.loads(run["timings"])
+            run["invalid_ratio"] = run["invalid_rows"] / run["total_rows"] if run["total_rows"] else 0.0
+            out.append(run)
+        return out
+
+    def rule_trend(
+        self,
+        source: str | None = None,
+        column: str | None = None,
+        rule_id: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> list[dict]:
+        """Per-run failure counts and rates of each (column, rule), oldest first."""
+        where, params = _filters(source, None, since, until)
+        for name, value in (("column_name", column), ("rule_id", rule_id)):
+            if value is not None:
+                where += (" AND " if where else " WHERE ") + f"rule_counts.{name} = ?"
+                params.append(value)
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT runs.id AS run_id, runs.source, runs.started_at, rule_counts.column_name AS column, "
+                "rule_counts.rule_id, rule_counts.rows, runs.total_rows FROM rule_counts "
+                f"JOIN runs ON runs.id = rule_counts.run_id{where} ORDER BY runs.started_at, runs.id",
+                params,
+            ).fetchall()
+        return [dict(row, rate=row["rows"] / row["total_rows"] if row["total_rows"] else 0.0) for row in rows]
+
+    def sources(self) -> list[str]:
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT source FROM runs ORDER BY source")]
+
+    def profiles(self, run_id: int) -> dict | None:
+        """The run's column profiles (ColumnProfile objects), e.g. to compare two runs."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT profiles FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        from profiler import profiles_from_dict
+
+        return profiles_from_dict(json.loads(zlib.decompress(row[0])))
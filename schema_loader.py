@@ -0,0 +1,272 @@
+"""Schema loading: validate config/schema.json once, fill in defaults and cache the
+compiled result next to the JSON so later processes skip parsing and checking.
+
+Only the standard library is imported here to keep startup cheap."""
+import difflib
+import hashlib
+import json
+import os
+import pickle
+import threading
+
+COLUMN_TYPES = {"int", "float", "date", "string"}
+COMMON_KEYS = {"type", "required", "drift", "repair", "default", "rules"}
+TYPE_KEYS = {
+    "int": {"min", "max", "number_format"},
+    "float": {"min", "max", "number_format"},
+    "date": {"format", "parse_formats"},
+    "string": set(),
+}
+TOP_LEVEL_KEYS = {"columns", "drift", "rule_modules"}
+DRIFT_KEYS = {"baseline_runs", "psi_threshold", "ks_threshold", "null_ratio_threshold"}
+# Auto-fixes a column may list under "repair" (implemented in repair.py)
+REPAIR_STRATEGIES = {
+    "int": {"decimal_comma"},
+    "float": {"decimal_comma"},
+    "date": {"day_month_swap"},
+    "string": {"trim", "casefold"},
+}
+
+# "number_format" of int/float columns (parsed by numeric.py)
+NUMBER_FORMAT_KEYS = {"decimal", "thousands", "currency", "percent"}
+DECIMAL_SEPARATORS = {".", ","}
+THOUSANDS_SEPARATORS = set(",.' ")
+PERCENT_MODES = {"strip", "ratio"}
+
+_CACHE_VERSION = 1
+
+
+class SchemaError(ValueError):
+    """Raised when a schema file is malformed or uses unknown rules."""
+
+
+def _unknown_key(where: str, key: str, allowed: set) -> SchemaError:
+    hint = difflib.get_close_matches(key, sorted(allowed), n=1)
+    suggestion = f" (did you mean '{hint[0]}'?)" if hint else ""
+    return SchemaError(f"{where}: unknown key '{key}'{suggestion}")
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_drift(where: str, drift) -> None:
+    if drift is False:
+        return
+    if not isinstance(drift, dict):
+        raise SchemaError(f"{where}: 'drift' must be an object or false")
+    for key, value in drift.items():
+        if key not in DRIFT_KEYS:
+            raise _unknown_key(f"{where}.drift", key, DRIFT_KEYS)
+        if not _is_number(value):
+            raise SchemaError(f"{where}.drift.{key} must be a number")
+
+
+def _check_repair(where: str, col_type: str, spec: dict) -> None:
+    strategies = spec.get("repair", [])
+    if not (isinstance(strategies, list) and all(isinstance(s, str) for s in strategies)):
+        raise SchemaError(f"{where}.repair must be a list of strategy names")
+    allowed = REPAIR_STRATEGIES[col_type]
+    for strategy in strategies:
+        if strategy not in allowed:
+            hint = difflib.get_close_matches(strategy, sorted(allowed), n=1)
+            suggestion = f" (did you mean '{hint[0]}'?)" if hint else ""
+            raise SchemaError(f"{where}.repair: '{strategy}' does not apply to {col_type} columns{suggestion}")
+    if "default" in spec:
+        default = spec["default"]
+        if col_type in {"int", "float"} and not _is_number(default):
+            raise SchemaError(f"{where}.default must be a number")
+        if col_type in {"date", "string"} and not isinstance(default, str):
+            raise SchemaError(f"{where}.default must be a string")
+
+
+def _check_number_format(where: str, fmt) -> None:
+    where = f"{where}.number_format"
+    if not isinstance(fmt, dict):
+        raise SchemaError(f"{where} must be an object")
+    for key in fmt:
+        if key not in NUMBER_FORMAT_KEYS:
+            raise _unknown_key(where, key, NUMBER_FORMAT_KEYS)
+    decimal = fmt.get("decimal", ".")
+    if decimal not in DECIMAL_SEPARATORS:
+        raise SchemaError(f"{where}.decimal must be one of {sorted(DECIMAL_SEPARATORS)}")
+    thousands = fmt.get("thousands", "." if decimal == "," else ",")
+    if not isinstance(thousands, str) or not set(thousands) <= THOUSANDS_SEPARATORS:
+        raise SchemaError(f"{where}.thousands must be a string of separators from {sorted(THOUSANDS_SEPARATORS)}")
+    if decimal in thousands:
+        raise SchemaError(f"{where}: '{decimal}' cannot be both the decimal and a thousands separator")
+    currency = fmt.get("currency", [])
+    if not (isinstance(currency, list) and all(isinstance(c, str) and c for c in currency)):
+        raise SchemaError(f"{where}.currency must be a list of currency symbols or codes")
+    if fmt.get("percent", "strip") not in PERCENT_MODES:
+        raise SchemaError(f"{where}.percent must be one of {sorted(PERCENT_MODES)}")
+
+
+def _compile_rules(where: str, col_type: str, entries) -> list[dict]:
+    """Normalize a column's "rules" to [{"name", "id", "params"[, "message"]}], checking
+    names, applicable types and parameters against the registry in rules.py."""
+    from rules import BUILTIN_RULE_IDS, RESERVED_KEYS, RULES
+
+    if not isinstance(entries, list):
+        raise SchemaError(f"{where}.rules must be a list of rule names or objects")
+    compiled, seen = [], set()
+    for i, entry in enumerate(entries):
+        entry = {"name": entry} if isinstance(entry, str) else entry
+        at = f"{where}.rules[{i}]"
+        if not isinstance(entry, dict) or not isinstance(entry.get("name"), str):
+            raise SchemaError(f"{at} must be a rule name or an object with a 'name'")
+        rule = RULES.get(entry["name"])
+        if rule is None:
+            hint = difflib.get_close_matches(entry["name"], sorted(RULES), n=1)
+            suggestion = f" (did you mean '{hint[0]}'?)" if hint else " (is its module listed under 'rule_modules'?)"
+            raise SchemaError(f"{at}: unknown rule '{entry['name']}'{suggestion}")
+        if rule.types and col_type not in rule.types:
+            raise SchemaError(f"{at}: rule '{rule.name}' does not apply to {col_type} columns")
+        params = {key: value for key, value in entry.items() if key not in RESERVED_KEYS}
+        for key in params:
+            if key not in rule.params:
+                raise _unknown_key(f"{at} ({rule.name})", key, set(rule.params) | RESERVED_KEYS)
+        missing = [name for name, required in rule.params.items() if required and name not in params]
+        if missing:
+            raise SchemaError(f"{at}: rule '{rule.name}' needs {', '.join(missing)}")
+        rule_id = entry.get("id", rule.name)
+        if not isinstance(rule_id, str) or rule_id in BUILTIN_RULE_IDS or rule_id in seen:
+            raise SchemaError(f"{at}: rule id '{rule_id}' is reserved or used twice on this column (set a distinct 'id')")
+        seen.add(rule_id)
+        out = {"name": rule.name, "id": rule_id, "params": params}
+        if "message" in entry:
+            if not isinstance(entry["message"], str):
+                raise SchemaError(f"{at}.message must be a string")
+            out["message"] = entry["message"]
+        compiled.append(out)
+    return compiled
+
+
+def _compile_column(col: str, spec) -> dict:
+    where = f"columns.{col}"
+    if not isinstance(spec, dict):
+        raise SchemaError(f"{where} must be an object")
+    col_type = spec.get("type")
+    if col_type not in COLUMN_TYPES:
+        raise SchemaError(f"{where}.type must be one of {sorted(COLUMN_TYPES)}, got {col_type!r}")
+    allowed = COMMON_KEYS | TYPE_KEYS[col_type]
+    for key in spec:
+        if key not in allowed:
+            raise _unknown_key(where, key, allowed)
+
+    compiled = dict(spec)
+    compiled["required"] = spec.get("required", False)
+    if not isinstance(compiled["required"], bool):
+        raise SchemaError(f"{where}.required must be true or false")
+    for bound in ("min", "max"):
+        if bound in spec and not _is_number(spec[bound]):
+            raise SchemaError(f"{where}.{bound} must be a number")
+    if "min" in spec and "max" in spec and spec["min"] > spec["max"]:
+        raise SchemaError(f"{where}: min {spec['min']} is greater than max {spec['max']}")
+    if col_type == "date":
+        if "format" in spec and not isinstance(spec["format"], str):
+            raise SchemaError(f"{where}.format must be a string")
+        formats = spec.get("parse_formats")
+        if formats is not None and not (isinstance(formats, list) and all(isinstance(f, str) for f in formats)):
+            raise SchemaError(f"{where}.parse_formats must be a list of strings")
+        compiled["parse_formats"] = formats or ([spec["format"]] if spec.get("format") else [])
+    if "number_format" in spec:
+        _check_number_format(where, spec["number_format"])
+    if "drift" in spec:
+        _check_drift(where, spec["drift"])
+    _check_repair(where, col_type, spec)
+    if "rules" in spec:
+        compiled["rules"] = _compile_rules(where, col_type, spec["rules"])
+    return compiled
+
+
+def compile_schema(schema) -> dict:
+    """Validate a parsed schema and return it with defaults filled in."""
+    if not isinstance(schema, dict):
+        raise SchemaError("schema must be a JSON object")
+    for key in schema:
+        if key not in TOP_LEVEL_KEYS:
+            raise _unknown_key("schema", key, TOP_LEVEL_KEYS)
+    columns = schema.get("columns")
+    if not isinstance(columns, dict) or not columns:
+        raise SchemaError("schema.columns must be a non-empty object")
+    modules = schema.get("rule_modules", [])
+    if not (isinstance(modules, list) and all(isinstance(m, str) for m in modules)):
+        raise SchemaError("schema.rule_modules must be a list of module names")
+    if modules:
+        from rules import load_rule_modules
+
+        try:
+            load_rule_modules(schema)
+        except ImportError as exc:
+            raise SchemaError(f"schema.rule_modules: {exc}") from exc
+    compiled = dict(schema)
+    compiled["columns"] = {col: _compile_column(col, spec) for col, spec in columns.items()}
+    if "drift" in schema:
+        _check_drift("schema", schema["drift"])
+    return compiled
+
+
+def schema_hash(schema: dict) -> str:
+    """Stable sha256 of a (compiled) schema, identifying which rules a run used."""
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def cache_path(path: str) -> str:
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.compiled")
+
+
+def _read_cache(path: str) -> dict | None:
+    try:
+        with open(cache_path(path), "rb") as f:
+            cached = pickle.load(f)
+    except Exception:
+        # Missing, truncated or written by another version: a bad cache is no cache
+        return None
+    if not isinstance(cached, dict) or cached.get("version") != _CACHE_VERSION:
+        return None
+    return cached if {"key", "sha256", "schema"} <= cached.keys() else None
+
+
+def _write_cache(path: str, stat: os.stat_result, digest: str, schema: dict) -> None:
+    target = cache_path(path)
+    # Unique per thread too: the daemon loads schemas on several threads of one process
+    tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    payload = {"version": _CACHE_VERSION, "key": (stat.st_mtime_ns, stat.st_size), "sha256": digest, "schema": schema}
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, target)
+    except OSError:
+        # A read-only config directory just means no cache
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load_schema(path: str, use_cache: bool = True) -> dict:
+    """Load, validate and normalize a schema file.
+
+    The compiled schema is cached in a hidden pickle next to the JSON, keyed by the
+    file's mtime and size (and its sha256, so a touched but unchanged file is not
+    recompiled). Raises SchemaError for invalid schemas.
+    """
+    stat = os.stat(path)
+    cached = _read_cache(path) if use_cache else None
+    if cached and cached["key"] == (stat.st_mtime_ns, stat.st_size):
+        return cached["schema"]
+
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    if cached and cached["sha256"] == digest:
+        compiled = cached["schema"]
+    else:
+        try:
+            schema = json.loads(raw.decode("utf-8"))
+        except json.JSONDecodeError as exc:
+            raise SchemaError(f"{path}: invalid JSON ({exc})") from exc
+        compiled = compile_schema(schema)
+    if use_cache:
+        _write_cache(path, stat, digest, compiled)
+    return compiled
@@ -0,0 +1,70 @@
+import queue
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable
+
+_DONE = object()
+
+
+def run_staged(
+    chunks: Iterable,
+    process: Callable,
+    write: Callable,
+    workers: int = 2,
+    queue_size: int = 4,
+    executor: str = "thread",
+) -> None:
+    """Run reader -> compute -> writer as overlapping stages.
+
+    A reader thread pulls chunks and submits them to a pool of compute workers.
+    The submitted futures go through a bounded queue in input order, and the
+    writer (the calling thread) resolves them in that order, so output rows keep
+    their input order while reading, computing and writing overlap. No more than
+    queue_size + 2 chunks are held at once, which bounds memory.
+
+    executor="process" runs process() in worker processes; it and its inputs must
+    then be picklable.
+    """
+    pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    pending: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    reader_error: list[BaseException] = []
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read(pool: Executor) -> None:
+        try:
+            for chunk in chunks:
+                if not _put(pool.submit(process, chunk)):
+                    return
+        except BaseException as exc:
+            reader_error.append(exc)
+        finally:
+            _put(_DONE)
+
+    with pool_cls(max_workers=workers) as pool:
+        reader = threading.Thread(target=_read, args=(pool,), name="pipeline-reader", daemon=True)
+        reader.start()
+        try:
+            while (future := pending.get()) is not _DONE:
+                write(future.result())
+        finally:
+            stop.set()
+            # Drain so a reader blocked on a full queue can observe stop and exit
+            while reader.is_alive():
+                try:
+                    item = pending.get(timeout=0.1)
+                    if item is not _DONE:
+                        item.cancel()
+                except queue.Empty:
+                    pass
+            reader.join()
+    if reader_error:
+        raise reader_error[0]
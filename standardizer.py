@@ -1,13 +1,34 @@
-import re
+import numpy as np
 import pandas as pd
 
+from numeric import parse_integers, parse_numeric
 
-def _clean_numeric_series(series: pd.Series) -> pd.Series:
-    """Clean a numeric series by removing thousands separators, currency symbols,
-    and coercing to float."""
-    # Keep digits, decimal point, and minus sign; replace others with empty
-    cleaned = series.astype(str).str.replace(r"[^0-9\.-]", "", regex=True)
-    return pd.to_numeric(cleaned, errors="coerce")
+_INT32 = np.iinfo(np.int32)
+# Floats at or beyond ±2**63 cannot be represented as int64
+_INT64_LIMIT = float(2 ** 63)
+
+
+def to_nullable_int(values: pd.Series) -> tuple[pd.Series, int]:
+    """Convert a numeric series to a nullable integer series in one pass.
+
+    Fractions are truncated (as astype(int) did). Values outside the int64 range
+    become <NA> and are counted as overflow. The result is Int32 when every value
+    fits, else Int64. Returns (series, overflow count).
+    """
+    if pd.api.types.is_integer_dtype(values):
+        ints, mask = values.to_numpy(dtype=np.int64, na_value=0), values.isna().to_numpy()
+        overflow = 0
+    else:
+        floats = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        mask = np.isnan(floats)
+        out_of_range = ~mask & ((floats >= _INT64_LIMIT) | (floats < -_INT64_LIMIT))
+        overflow = int(np.count_nonzero(out_of_range))
+        mask |= out_of_range
+        ints = np.trunc(np.where(mask, 0.0, floats)).astype(np.int64)
+    valid = ints[~mask]
+    if valid.size == 0 or (valid.min() >= _INT32.min and valid.max() <= _INT32.max):
+        ints = ints.astype(np.int32)
+    return pd.Series(pd.arrays.IntegerArray(ints, mask), index=values.index), overflow
 
 
 def _parse_dates_with_formats(series: pd.Series, formats: list[str]) -> pd.Series:
@@ -17,9 +38,9 @@ def _parse_dates_with_formats(series: pd.Series, formats: list[str]) -> pd.Serie
     if formats:
         mask = result.isna() & series.notna()
         if mask.any():
-            s = series.copy()
+            s = series
             # Attempt formats in order until parsed
-            parsed = pd.Series([pd.NaT] * len(series))
+            parsed = pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
             for fmt in formats:
                 try:
                     attempt = pd.to_datetime(s[mask], format=fmt, errors="coerce")
@@ -31,22 +52,28 @@ def _parse_dates_with_formats(series: pd.Series, formats: list[str]) -> pd.Serie
                 except Exception:
                     # Ignore bad format attempts
                     pass
-            # Merge successful parsed values back into result
-            filled = result.copy()
+            # Merge successful parsed values back into result (a fresh series we own)
             fill_mask = parsed.notna()
-            filled.loc[fill_mask] = parsed.loc[fill_mask]
-            result = filled
+            result.loc[fill_mask] = parsed.loc[fill_mask]
     return result
 
 
-def standardize_data(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
+def standardize_data(df: pd.DataFrame, schema: dict, copy: bool = True) -> pd.DataFrame:
     """Standardize data based on schema definitions.
 
     - Dates: parse using provided parse_formats (or auto-parse) to datetime64[ns]
-    - Numerics: strip non-numeric chars and coerce to float
+    - Numerics: parse with the column's number_format, float columns to float64
+      with numeric.parse_numeric and int columns exactly (never through float64)
+      with numeric.parse_integers to nullable Int32/Int64, with per-column
+      overflow counts in out.attrs["int_overflow"]
+
+    With copy=False only the standardized columns are new; all other columns
+    share memory with df, so df must not be modified in place afterwards.
     """
     columns = schema.get("columns", {})
-    out = df.copy()
+    # Column assignment below always replaces, never writes into, the shared arrays
+    out = df.copy(deep=copy)
+    overflow = {}
 
     for col, spec in columns.items():
         if col not in out.columns:
@@ -56,11 +83,14 @@ def standardize_data(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
             formats = spec.get("parse_formats") or ([spec.get("format")] if spec.get("format") else [])
             out[col] = _parse_dates_with_formats(out[col], formats)
         elif col_type in {"float", "int"}:
-            out[col] = _clean_numeric_series(out[col])
             if col_type == "int":
-                # Convert to integer if possible
-                out[col] = out[col].dropna().astype(int)
+                cleaned, overflow[col] = parse_integers(out[col], spec.get("number_format"))
+                cleaned = to_nullable_int(cleaned)[0]
+            else:
+                cleaned = parse_numeric(out[col], spec.get("number_format"))
+            out[col] = cleaned
         elif col_type == "string":
             out[col] = out[col].astype(str).str.strip()
 
+    out.attrs["int_overflow"] = overflow
     return out
@@ -0,0 +1,49 @@
+import json
+import os
+import sys
+
+import pytest
+
+# The modules live at the repository root (run as scripts, not as a package)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCHEMA = {
+    "columns": {
+        "customer_id": {"type": "int", "required": True},
+        "name": {"type": "string", "required": True},
+        "order_date": {"type": "date", "format": "%Y-%m-%d", "parse_formats": ["%Y-%m-%d", "%d-%m-%Y"], "required": True},
+        "order_amount": {"type": "float", "required": True, "min": 0},
+    }
+}
+
+
+@pytest.fixture
+def schema_path(tmp_path):
+    """Path of a schema file; call it with a dict to write a different schema."""
+    def write(schema: dict = SCHEMA, name: str = "schema.json") -> str:
+        path = tmp_path / name
+        path.write_text(json.dumps(schema), encoding="utf-8")
+        return str(path)
+
+    return write
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    """Write text to a CSV file under tmp_path and return its path."""
+    def write(text: str, name: str = "input.csv") -> str:
+        path = tmp_path / name
+        path.write_bytes(text.encode("utf-8"))
+        return str(path)
+
+    return write
+
+
+def orders_csv(rows: int, start: int = 0) -> str:
+    """Order rows in the SCHEMA layout; every 7th amount is negative and every 11th date is bad."""
+    lines = ["customer_id,name,order_date,order_amount"]
+    for i in range(start, start + rows):
+        date = "not a date" if i % 11 == 0 else f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}"
+        amount = -1.5 if i % 7 == 0 else round(i * 0.25, 2)
+        lines.append(f"{i},name {i % 13},{date},{amount}")
+    return "\n".join(lines) + "\n"
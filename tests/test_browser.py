@@ -0,0 +1,41 @@
+import io
+
+import pandas as pd
+
+from browser import InvalidRowBrowser
+from conftest import SCHEMA, orders_csv
+from standardizer import standardize_data
+from violations import rule_violations
+
+
+def _browser() -> InvalidRowBrowser:
+    raw = pd.read_csv(io.StringIO(orders_csv(200)))
+    df = standardize_data(raw, SCHEMA)
+    df.index = df.index + 1_000
+    return InvalidRowBrowser(df, list(rule_violations(df, SCHEMA)))
+
+
+def test_filters_select_rows_failing_the_chosen_rules():
+    browser = _browser()
+    below_min = set(range(0, 200, 7))
+    bad_date = set(range(0, 200, 11))
+    assert set(browser.filter()) == below_min | bad_date
+    assert set(browser.filter(rule_ids=["below_min"])) == below_min
+    assert set(browser.filter(columns=["order_date"])) == bad_date
+    assert not len(browser.filter(columns=["name"]))
+    counts = browser.rule_counts().set_index(["column", "rule_id"])["rows"]
+    assert counts[("order_amount", "below_min")] == len(below_min)
+
+
+def test_pages_carry_row_ids_and_their_errors():
+    browser = _browser()
+    positions = browser.filter()
+    assert browser.page_count(positions, 10) == -(-len(positions) // 10)
+    assert browser.page_count(positions[:0], 10) == 1
+    first = browser.page(positions, 0, 10)
+    assert len(first) == 10
+    assert first["row_id"].iloc[0] == 1_000
+    assert first["errors"].iloc[0] == "order_date is required; order_date invalid date; order_amount below min 0"
+    last = browser.page(positions, browser.page_count(positions, 10) - 1, 10)
+    assert 0 < len(last) <= 10
+    assert last["row_id"].iloc[-1] == 1_000 + positions[-1]
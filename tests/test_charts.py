@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from charts import build_chart_data, failure_timeline, merge_timelines
+from profiler import profile_data
+
+SCHEMA = {"columns": {"day": {"type": "date"}, "amount": {"type": "float"}}}
+
+
+def _chunk(start: str, days: int, invalid_every: int):
+    df = pd.DataFrame({
+        "day": pd.date_range(start, periods=days, freq="D").append(pd.DatetimeIndex([pd.NaT])),
+        "amount": np.arange(days + 1, dtype=float),
+    })
+    is_valid = np.arange(days + 1) % invalid_every != 0
+    return df, is_valid
+
+
+def test_timelines_merge_across_chunks():
+    left_df, left_valid = _chunk("2024-01-01", 3, 2)
+    right_df, right_valid = _chunk("2024-01-03", 2, 1_000)
+    left = failure_timeline(left_df, left_valid, SCHEMA)
+    assert left == {"day": {"2024-01-01": [1, 1], "2024-01-02": [1, 0], "2024-01-03": [1, 1]}}
+    merged = merge_timelines(left, failure_timeline(right_df, right_valid, SCHEMA))
+    assert merged["day"]["2024-01-03"] == [2, 2]
+    assert merged["day"]["2024-01-04"] == [1, 0]
+
+
+def test_long_timelines_are_bucketed_to_at_most_max_points():
+    df, is_valid = _chunk("2020-01-01", 1_000, 3)
+    charts = build_chart_data(profile_data(df, SCHEMA), {("amount", "below_min"): 4}, failure_timeline(df, is_valid, SCHEMA), max_points=60)
+    timeline = charts["timelines"]["day"]
+    assert timeline["bucket"] == "month" and len(timeline["start"]) <= 60
+    assert sum(timeline["rows"]) == 1_000
+    assert sum(timeline["invalid"]) == int(np.count_nonzero(~is_valid[:1_000]))
+    histogram = charts["histograms"]["amount"]
+    assert len(histogram["counts"]) == 20 and abs(sum(histogram["counts"]) - 1_001) <= 20
+    assert charts["column_failures"] == {"amount": 4}
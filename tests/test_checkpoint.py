@@ -0,0 +1,72 @@
+import filecmp
+import json
+
+import pytest
+
+import requirement
+from checkpoint import Checkpoint, run_fingerprint
+from requirement import run_pipeline
+from schema_loader import load_schema
+
+
+def _quoted_newlines_csv(rows: int) -> str:
+    """Orders whose name field spans several lines on every 5th row, with a blank line now and then."""
+    lines = ["customer_id,name,order_date,order_amount"]
+    for i in range(rows):
+        name = f'"first line {i}\n\nlast line"' if i % 5 == 0 else f"name {i}"
+        amount = -1 if i % 9 == 0 else i
+        lines.append(f"{i},{name},2024-01-{i % 28 + 1:02d},{amount}")
+        if i % 997 == 0:
+            lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def _outputs(tmp_path, name: str) -> dict:
+    (tmp_path / name).mkdir(exist_ok=True)
+    return {
+        "standardized_csv": str(tmp_path / name / "standardized.csv"),
+        "invalid_csv": str(tmp_path / name / "invalid_rows.csv"),
+        "report_html": str(tmp_path / name / "report.html"),
+    }
+
+
+def _interrupt_after(monkeypatch, chunks: int) -> None:
+    process = requirement._process_chunk
+    calls = []
+
+    def failing(*args, **kwargs):
+        calls.append(None)
+        if len(calls) > chunks:
+            raise RuntimeError("interrupted")
+        return process(*args, **kwargs)
+
+    monkeypatch.setattr(requirement, "_process_chunk", failing)
+
+
+def test_resume_with_quoted_newlines_matches_an_uninterrupted_run(tmp_path, csv_file, schema_path, monkeypatch):
+    input_csv, schema = csv_file(_quoted_newlines_csv(20_000)), schema_path()
+    expected = run_pipeline(input_csv, schema, chunksize=3_000, **_outputs(tmp_path, "full"))
+
+    checkpoint = str(tmp_path / "run.ckpt.json")
+    with monkeypatch.context() as patch:
+        _interrupt_after(patch, 3)
+        with pytest.raises(RuntimeError, match="interrupted"):
+            run_pipeline(input_csv, schema, chunksize=3_000, checkpoint_path=checkpoint, **_outputs(tmp_path, "resumed"))
+    with open(checkpoint, encoding="utf-8") as f:
+        assert json.load(f)["state"]["rows"] == 9_000
+    resumed = run_pipeline(input_csv, schema, chunksize=3_000, checkpoint_path=checkpoint, **_outputs(tmp_path, "resumed"))
+
+    assert resumed["total_rows"] == expected["total_rows"] == 20_000
+    assert resumed["invalid_rows"] == expected["invalid_rows"]
+    for key in ("standardized_csv", "invalid_csv"):
+        assert filecmp.cmp(resumed[key], expected[key], shallow=False)
+
+
+def test_checkpoint_of_a_run_with_other_output_options_is_not_resumed(tmp_path, csv_file, schema_path):
+    input_csv, schema = csv_file(_quoted_newlines_csv(10)), schema_path()
+    compiled = load_schema(schema)
+    plain = Checkpoint(str(tmp_path / "ckpt.json"), run_fingerprint(input_csv, compiled, 5, {"codec": None}))
+    plain.save({"rows": 5})
+    assert plain.load() == {"rows": 5}
+    gzip = Checkpoint(plain.path, run_fingerprint(input_csv, compiled, 5, {"codec": "gzip"}))
+    assert gzip.load() is None
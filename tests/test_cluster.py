@@ -0,0 +1,79 @@
+import filecmp
+import os
+import time
+
+import pytest
+
+from cluster import ShardQueue, ShardRejected
+from conftest import orders_csv
+from requirement import _check_shard_reply, _shard_dir, run_pipeline, run_sharded_pipeline
+
+
+def test_sharded_run_matches_an_mmap_run(tmp_path, csv_file, schema_path):
+    input_csv, schema = csv_file(orders_csv(3_000), name="orders.csv"), schema_path()
+    sharded = run_sharded_pipeline(
+        [input_csv], schema, output_dir=str(tmp_path / "sharded"), address=str(tmp_path / "coordinator.sock"), range_bytes=16 << 10
+    )
+    assert sharded["shards"] > 1 and not sharded["failed_files"]
+    (tmp_path / "mmap").mkdir()
+    mapped = run_pipeline(
+        input_csv,
+        schema,
+        str(tmp_path / "mmap" / "standardized.csv"),
+        str(tmp_path / "mmap" / "invalid_rows.csv"),
+        str(tmp_path / "mmap" / "report.html"),
+        reader="mmap",
+        range_bytes=16 << 10,
+    )
+    result = sharded["files"][input_csv]
+    assert result["total_rows"] == mapped["total_rows"] == 3_000
+    for key in ("standardized_csv", "invalid_csv"):
+        assert filecmp.cmp(result[key], mapped[key], shallow=False)
+
+
+def test_a_hung_workers_lease_expires_and_its_late_result_is_ignored():
+    merged = []
+    queue = ShardQueue([{"id": 0}, {"id": 1}], lambda shard, reply: merged.append((shard["id"], reply)), lease_timeout=0.2)
+    hung = queue.lease()
+    other = queue.lease()
+    queue.complete(other, "second", "worker-b")
+    # Waits for the hung worker's lease to expire, then hands its shard out again
+    retried = queue.lease()
+    assert (retried["id"], retried["attempt"]) == (0, 2)
+    queue.complete(hung, "stale", "worker-a")
+    queue.complete(retried, "first", "worker-b")
+    assert merged == [(1, "second"), (0, "first")]
+    assert queue.finished and queue.lease() is None
+    assert queue.per_worker == {"worker-b": 2}
+
+
+def test_a_lease_expiring_max_attempts_times_fails_the_shard():
+    queue = ShardQueue([{"id": 0}], lambda shard, reply: None, max_attempts=2, lease_timeout=0.05)
+    queue.lease()
+    queue.lease()
+    time.sleep(0.1)
+    assert queue.wait(1.0)
+    assert queue.failed == {0: "lease expired after 0.05s"}
+
+
+def test_a_rejected_reply_fails_the_attempt():
+    def on_result(shard, reply):
+        if reply == "bad":
+            raise ShardRejected("bad reply")
+
+    queue = ShardQueue([{"id": 0}], on_result, max_attempts=2)
+    queue.complete(queue.lease(), "bad", "worker-a")
+    retried = queue.lease()
+    assert retried["attempt"] == 2 and not queue.finished
+    queue.complete(retried, "bad", "worker-a")
+    assert queue.failed == {0: "worker-a: bad reply"} and queue.error is None
+
+
+def test_reply_files_must_be_in_the_attempts_directory(tmp_path):
+    shard_dir = _shard_dir(str(tmp_path), {"id": 3, "attempt": 2})
+    assert os.path.basename(shard_dir) == "shard-000003-2"
+    files = {key: os.path.join(shard_dir, f"{key}.csv") for key in ("standardized", "invalid", "repairs")}
+    _check_shard_reply(files, shard_dir)
+    for path in (os.path.join(shard_dir, "..", "shard-000003-1", "invalid.csv"), str(tmp_path / "outputs"), shard_dir, None):
+        with pytest.raises(ShardRejected, match="invalid="):
+            _check_shard_reply({**files, "invalid": path}, shard_dir)
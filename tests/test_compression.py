@@ -0,0 +1,57 @@
+import gzip
+
+import pandas as pd
+import pytest
+
+from compression import compress_bytes, detect_codec, open_input, with_codec_suffix, write_csv
+from conftest import orders_csv
+from requirement import run_pipeline
+
+
+def _outputs(tmp_path, name: str) -> dict:
+    (tmp_path / name).mkdir()
+    return {
+        "standardized_csv": str(tmp_path / name / "standardized.csv"),
+        "invalid_csv": str(tmp_path / name / "invalid_rows.csv"),
+        "report_html": str(tmp_path / name / "report.html"),
+    }
+
+
+def test_codec_suffixes():
+    assert detect_codec("a.csv.gz") == "gzip" and detect_codec("a.csv.zst") == "zstd" and detect_codec("a.csv") is None
+    assert with_codec_suffix("out.csv", "gzip") == "out.csv.gz" == with_codec_suffix("out.csv.gz", "gzip")
+    with pytest.raises(ValueError, match="unsupported output codec"):
+        with_codec_suffix("out.csv", "lz4")
+
+
+@pytest.mark.parametrize("codec", ["gzip", "zstd"])
+def test_prefetching_reader_returns_the_decompressed_bytes(tmp_path, codec):
+    if codec == "zstd":
+        pytest.importorskip("zstandard")
+    data = orders_csv(20_000).encode()
+    path = tmp_path / f"input.csv{'.gz' if codec == 'gzip' else '.zst'}"
+    # Two members/frames, as appended output chunks are
+    path.write_bytes(compress_bytes(data[:1000], codec) + compress_bytes(data[1000:], codec))
+    with open_input(str(path), prefetch=2) as f:
+        assert f.read() == data
+
+
+def test_appended_compressed_chunks_read_back_as_one_csv(tmp_path):
+    df = pd.DataFrame({"a": range(5), "b": list("vwxyz")})
+    path = str(tmp_path / "out.csv.gz")
+    write_csv(df[:2], path, append=False, codec="gzip")
+    write_csv(df[2:], path, append=True, codec="gzip")
+    pd.testing.assert_frame_equal(pd.read_csv(path), df)
+
+
+def test_compressed_input_and_output_match_a_plain_run(tmp_path, csv_file, schema_path):
+    text, schema = orders_csv(2_000), schema_path()
+    plain_input = csv_file(text)
+    gz_input = tmp_path / "input.csv.gz"
+    gz_input.write_bytes(gzip.compress(text.encode()))
+    plain = run_pipeline(plain_input, schema, chunksize=300, **_outputs(tmp_path, "plain"))
+    packed = run_pipeline(str(gz_input), schema, chunksize=300, output_codec="gzip", **_outputs(tmp_path, "packed"))
+    assert packed["standardized_csv"].endswith(".csv.gz")
+    for key in ("standardized_csv", "invalid_csv"):
+        with gzip.open(packed[key], "rb") as f, open(plain[key], "rb") as g:
+            assert f.read() == g.read()
@@ -0,0 +1,43 @@
+import os
+import socket
+import threading
+import time
+
+import socketserver
+
+import pytest
+
+from conftest import orders_csv
+from daemon import _server_class, parse_address, serve, submit
+
+
+def test_addresses():
+    assert parse_address("127.0.0.1:7700") == (socket.AF_INET, ("127.0.0.1", 7700))
+    assert parse_address(":7700") == (socket.AF_INET, ("127.0.0.1", 7700))
+    assert parse_address("/tmp/dq.sock") == (socket.AF_UNIX, "/tmp/dq.sock")
+
+
+def test_server_classes_use_daemon_threads_without_changing_the_stdlib():
+    for family, base in ((socket.AF_UNIX, socketserver.ThreadingUnixStreamServer), (socket.AF_INET, socketserver.ThreadingTCPServer)):
+        assert issubclass(_server_class(family), base) and _server_class(family).daemon_threads
+        assert not base.daemon_threads
+
+
+def test_jobs_submitted_to_a_worker(tmp_path, csv_file, schema_path):
+    address = str(tmp_path / "dq.sock")
+    # The worker runs until the test process exits
+    threading.Thread(target=serve, args=(address,), daemon=True).start()
+    deadline = time.monotonic() + 10
+    while not os.path.exists(address) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    job = {
+        "input_csv": csv_file(orders_csv(100)),
+        "schema_path": schema_path(),
+        "standardized_csv": str(tmp_path / "standardized.csv"),
+        "invalid_csv": str(tmp_path / "invalid_rows.csv"),
+        "report_html": str(tmp_path / "report.html"),
+    }
+    outputs = submit(address, job, timeout=60)
+    assert outputs["total_rows"] == 100 and os.path.exists(outputs["standardized_csv"])
+    with pytest.raises(RuntimeError, match="FileNotFoundError"):
+        submit(address, {**job, "input_csv": str(tmp_path / "missing.csv")}, timeout=60)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from conftest import orders_csv
+from drift import add_drift_results, detect_drift, feed_name, load_baseline, save_profile_snapshot
+from profiler import profile_data
+from requirement import run_pipeline
+
+SCHEMA = {"columns": {"amount": {"type": "float"}, "city": {"type": "string"}, "note": {"type": "string", "drift": False}}}
+
+
+def _profiles(seed: int, shift: float = 0.0, nulls: int = 0, cities=("a", "b", "c")):
+    rng = np.random.default_rng(seed)
+    amount = rng.normal(100 + shift, 10, 5_000)
+    amount[:nulls] = np.nan
+    df = pd.DataFrame({"amount": amount, "city": rng.choice(list(cities), 5_000), "note": rng.choice(["x", "y"], 5_000)})
+    return profile_data(df, SCHEMA)
+
+
+def _by_type(results: list[dict]) -> dict:
+    return {(entry["column"], entry["expectation_type"]): entry["success"] for entry in results}
+
+
+def test_baseline_merges_the_last_runs_of_a_feed(tmp_path):
+    store = str(tmp_path)
+    assert load_baseline(store, "orders") is None
+    for seed in range(3):
+        save_profile_snapshot(store, "orders", _profiles(seed), 5_000)
+    assert load_baseline(store, "orders")["amount"].count == 15_000
+    assert load_baseline(store, "orders", runs=2)["amount"].count == 10_000
+    assert feed_name("/data/orders.2024-01.csv.gz") == "orders"
+
+
+def test_stable_data_passes_and_shifted_data_drifts():
+    baseline = _profiles(0)
+    stable = _by_type(detect_drift(_profiles(1), baseline, SCHEMA))
+    assert all(stable.values())
+    assert ("note", "expect_column_distribution_to_not_drift") not in stable
+    shifted = _by_type(detect_drift(_profiles(2, shift=15, nulls=1_000, cities=("a", "d")), baseline, SCHEMA))
+    assert not shifted[("amount", "expect_column_distribution_to_not_drift")]
+    assert not shifted[("amount", "expect_column_null_ratio_to_not_drift")]
+    assert not shifted[("city", "expect_column_distribution_to_not_drift")]
+
+
+def test_drift_results_update_the_validation_statistics():
+    ge_result = {"success": True, "results": [], "statistics": {
+        "evaluated_expectations": 1, "successful_expectations": 1, "unsuccessful_expectations": 0,
+    }}
+    add_drift_results(ge_result, detect_drift(_profiles(2, shift=15), _profiles(0), SCHEMA))
+    stats = ge_result["statistics"]
+    assert not ge_result["success"]
+    assert stats["evaluated_expectations"] == 1 + len(ge_result["results"])
+    assert stats["successful_expectations"] + stats["unsuccessful_expectations"] == stats["evaluated_expectations"]
+
+
+def test_runs_of_dated_files_share_the_baseline_of_their_feed(tmp_path, csv_file, schema_path):
+    store, schema = tmp_path / "profiles", schema_path()
+    evaluated = []
+    for day in ("2024-01-01", "2024-01-02"):
+        outputs = run_pipeline(
+            csv_file(orders_csv(200), name=f"orders_{day}.csv"),
+            schema,
+            str(tmp_path / "standardized.csv"),
+            str(tmp_path / "invalid_rows.csv"),
+            str(tmp_path / "report.html"),
+            profile_store=str(store),
+            feed="orders",
+        )
+        evaluated.append(outputs["ge_result_summary"]["evaluated_expectations"])
+    assert [path.parent.name for path in store.glob("*/*.json")] == ["orders", "orders"]
+    # The second run found the first one's snapshot and added drift expectations
+    assert evaluated[1] > evaluated[0]
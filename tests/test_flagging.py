@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import SCHEMA
+from requirement import _error_combinations, flag_invalid_rows, run_pipeline
+
+HEADER = "customer_id,name,order_date,order_amount\n"
+
+
+def _outputs(tmp_path) -> dict:
+    return {
+        "standardized_csv": str(tmp_path / "standardized.csv"),
+        "invalid_csv": str(tmp_path / "invalid_rows.csv"),
+        "report_html": str(tmp_path / "report.html"),
+    }
+
+
+def test_error_combinations_share_one_message_per_combination():
+    violations = [
+        ("a", "required", "a is required", np.array([True, False, True, False])),
+        ("b", "below_min", "b below 0", np.array([True, False, True, True])),
+    ]
+    codes, categories = _error_combinations(violations, 4)
+    assert categories[0] == ""
+    assert [categories[code] for code in codes] == ["a is required; b below 0", "", "a is required; b below 0", "b below 0"]
+
+
+def test_rules_sharing_a_message_share_one_category():
+    df = pd.DataFrame({"customer_id": [1, 2, 3], "name": ["a", "b", "c"], "order_date": pd.to_datetime(["2024-01-01"] * 3),
+                       "order_amount": [1.0, 2.0, 3.0]})
+    schema = {"columns": {**SCHEMA["columns"], "customer_id": {"type": "int", "rules": [
+        {"name": "allowed_values", "id": "a", "params": {"values": [1, 3]}},
+        {"name": "allowed_values", "id": "b", "params": {"values": [2, 3]}},
+    ]}}}
+    flagged = flag_invalid_rows(df, schema)
+    assert flagged["errors"].tolist() == ["customer_id not an allowed value"] * 2 + [""]
+    assert list(flagged["errors"].cat.categories) == ["", "customer_id not an allowed value"]
+
+
+def test_errors_column_is_categorical_and_valid_rows_have_no_message():
+    df = pd.DataFrame({"customer_id": [1, None], "name": ["a", "b"], "order_date": pd.to_datetime(["2024-01-01"] * 2), "order_amount": [1.0, 2.0]})
+    flagged = flag_invalid_rows(df, SCHEMA)
+    assert isinstance(flagged["errors"].dtype, pd.CategoricalDtype)
+    assert flagged["is_valid"].tolist() == [True, False]
+    assert flagged["errors"].iloc[0] == ""
+
+
+def test_no_rows_gives_no_errors():
+    violations = [("a", "required", "a is required", np.zeros(0, dtype=bool))]
+    codes, categories = _error_combinations(violations, 0)
+    assert codes.size == 0 and categories == [""]
+
+
+@pytest.mark.parametrize("chunksize", [None, 10])
+def test_header_only_input(tmp_path, csv_file, schema_path, chunksize):
+    outputs = run_pipeline(csv_file(HEADER), schema_path(), chunksize=chunksize, **_outputs(tmp_path))
+    assert outputs["total_rows"] == 0
+    assert outputs["invalid_rows"] == 0
+    assert pd.read_csv(outputs["standardized_csv"]).columns.tolist() == HEADER.strip().split(",")
+    assert pd.read_csv(outputs["invalid_csv"]).empty
@@ -0,0 +1,67 @@
+import filecmp
+import json
+
+import pytest
+
+from conftest import orders_csv
+from requirement import run_pipeline
+from run_store import RunStore
+
+HEADER = "customer_id,name,order_date,order_amount\n"
+
+
+def _outputs(tmp_path, name: str) -> dict:
+    (tmp_path / name).mkdir(exist_ok=True)
+    return {
+        "standardized_csv": str(tmp_path / name / "standardized.csv"),
+        "invalid_csv": str(tmp_path / name / "invalid_rows.csv"),
+        "report_html": str(tmp_path / name / "report.html"),
+    }
+
+
+@pytest.mark.parametrize("first", [HEADER, orders_csv(1).rstrip("\n")], ids=["header-only", "no-trailing-newline"])
+def test_first_run_without_complete_records_then_appended_rows(tmp_path, csv_file, schema_path, first):
+    input_csv, schema = csv_file(first), schema_path()
+    state = str(tmp_path / "tail.json")
+    outputs = run_pipeline(input_csv, schema, incremental_state=state, **_outputs(tmp_path, "incremental"))
+    assert outputs["new_rows"] == outputs["total_rows"] == 0
+    assert open(outputs["standardized_csv"]).read() == HEADER
+
+    full = orders_csv(300)
+    with open(input_csv, "a") as f:
+        f.write(full[len(first):])
+    outputs = run_pipeline(input_csv, schema, incremental_state=state, range_bytes=2_000, **_outputs(tmp_path, "incremental"))
+    assert outputs["new_rows"] == outputs["total_rows"] == 300
+    plain = run_pipeline(input_csv, schema, reader="mmap", **_outputs(tmp_path, "plain"))
+    for key in ("standardized_csv", "invalid_csv"):
+        assert filecmp.cmp(outputs[key], plain[key], shallow=False)
+
+
+def test_refreshes_record_and_snapshot_only_their_new_rows(tmp_path, csv_file, schema_path):
+    input_csv, schema = csv_file(orders_csv(300)), schema_path()
+    options = {
+        "incremental_state": str(tmp_path / "tail.json"),
+        "run_store": str(tmp_path / "runs.db"),
+        "profile_store": str(tmp_path / "profiles"),
+        **_outputs(tmp_path, "incremental"),
+    }
+    run_pipeline(input_csv, schema, **options)
+    with open(input_csv, "a") as f:
+        f.write(orders_csv(200, start=300).split("\n", 1)[1])
+    outputs = run_pipeline(input_csv, schema, **options)
+    assert (outputs["total_rows"], outputs["new_rows"]) == (500, 200)
+
+    store = RunStore(options["run_store"])
+    latest, first = store.runs()
+    assert (first["total_rows"], latest["total_rows"]) == (300, 200)
+    assert latest["invalid_rows"] == len(set(range(301, 500, 7)) | set(range(308, 500, 11)))
+    assert store.profiles(latest["id"])["order_amount"].count == 200
+    below_min = store.rule_trend(rule_id="below_min")
+    assert [row["rows"] for row in below_min] == [len(range(0, 300, 7)), len(range(301, 500, 7))]
+    snapshots = sorted((tmp_path / "profiles").glob("*/*.json"))
+    assert [json.loads(path.read_text())["total_rows"] for path in snapshots] == [300, 200]
+
+    # A refresh without new rows records an empty run and leaves the baseline alone
+    run_pipeline(input_csv, schema, **options)
+    assert store.runs(limit=1)[0]["total_rows"] == 0
+    assert len(list((tmp_path / "profiles").glob("*/*.json"))) == 2
@@ -0,0 +1,37 @@
+import asyncio
+import gzip
+
+import pandas as pd
+
+from conftest import orders_csv
+from ingest_service import IngestService, job_name
+
+
+def test_job_name_strips_only_csv_suffixes():
+    assert job_name("in/a.csv", set()) == "a"
+    assert job_name("in/a.csv.gz", set()) == "a"
+    assert job_name("in/a.v2.csv", set()) == "a.v2"
+    assert job_name("in/a.csv.zst", {"a", "a-2"}) == "a-3"
+
+
+def test_concurrent_files_with_the_same_stem_get_their_own_outputs(tmp_path, schema_path):
+    (tmp_path / "a.csv").write_text(orders_csv(10))
+    with gzip.open(tmp_path / "a.csv.gz", "wt") as f:
+        f.write(orders_csv(20))
+    service = IngestService(output_dir=str(tmp_path / "out"), workers=2, pipeline_kwargs={"schema_path": schema_path()})
+
+    async def run():
+        consumers = [asyncio.create_task(service._consume(None)) for _ in range(2)]
+        await service.submit(str(tmp_path / "a.csv"))
+        await service.submit(str(tmp_path / "a.csv.gz"))
+        await service.queue.join()
+        for consumer in consumers:
+            consumer.cancel()
+
+    try:
+        asyncio.run(run())
+    finally:
+        service.executor.shutdown()
+    assert service.completed == 2
+    rows = {len(pd.read_csv(tmp_path / "out" / name / "standardized.csv")) for name in ("a", "a-2")}
+    assert rows == {10, 20}
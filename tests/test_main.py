@@ -0,0 +1,41 @@
+import argparse
+import os
+import subprocess
+import sys
+
+import pytest
+
+import main
+from conftest import orders_csv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_parsing_arguments_does_not_import_pandas():
+    code = "import sys, main; main.build_parser().parse_args(['x.csv', '--chunksize', 'auto']); print('pandas' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_size_and_chunksize_arguments():
+    assert main._byte_size("512M") == 512 << 20 and main._byte_size("1.5k") == 1536 and main._byte_size("100") == 100
+    assert main._chunksize("auto") == "auto" and main._chunksize("5000") == 5000
+    with pytest.raises(argparse.ArgumentTypeError):
+        main._byte_size("2X")
+    with pytest.raises(argparse.ArgumentTypeError):
+        main._chunksize("many")
+
+
+def test_cli_run(tmp_path, csv_file, schema_path, capsys):
+    input_csv = csv_file(orders_csv(100))
+    outputs = [str(tmp_path / name) for name in ("standardized.csv", "invalid.csv", "report.html")]
+    argv = [input_csv, "--schema", schema_path(), "--standardized", outputs[0], "--invalid", outputs[1], "--report", outputs[2]]
+    assert main.main(argv + ["--chunksize", "30"]) == 0
+    assert "Total: 100" in capsys.readouterr().out
+    assert all(os.path.exists(path) for path in outputs)
+
+
+def test_missing_input_is_reported(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert main.main(["missing.csv"]) == 1
+    assert "not found" in capsys.readouterr().err
@@ -0,0 +1,58 @@
+import urllib.request
+
+from conftest import orders_csv
+from metrics import CONTENT_TYPE, PipelineMetrics
+from requirement import run_pipeline
+
+
+def _registry() -> PipelineMetrics:
+    metrics = PipelineMetrics()
+    metrics.observe_chunk(100, 7, {("amount", "below_min"): 7}, {"default": 2}, {"validate": 0.02}, 0.003)
+    metrics.observe_run(100, 0.5, {"statistics": {"successful_expectations": 4, "unsuccessful_expectations": 1}})
+    return metrics
+
+
+def test_render_is_openmetrics_text():
+    text = _registry().render()
+    lines = text.splitlines()
+    assert lines[-1] == "# EOF"
+    assert "dq_rows_total 100" in lines
+    assert 'dq_rule_failures_total{column="amount",rule="below_min"} 7' in lines
+    assert 'dq_stage_seconds_bucket{stage="validate",le="0.025"} 1' in lines
+    assert 'dq_stage_seconds_bucket{stage="validate",le="0.01"} 0' in lines
+    assert 'dq_last_run_expectations{result="unsuccessful"} 1' in lines
+    assert "dq_last_run_rows_per_second 200" in lines
+    assert "# TYPE dq_rows counter" in lines and "# TYPE dq_chunk_seconds histogram" in lines
+
+
+def test_merging_a_snapshot_adds_counters_and_histograms():
+    total = _registry()
+    total.merge(_registry().to_dict())
+    lines = total.render().splitlines()
+    assert "dq_rows_total 200" in lines
+    assert "dq_chunk_seconds_count 2" in lines
+
+
+def test_metrics_are_served_and_written_after_a_run(tmp_path, csv_file, schema_path):
+    metrics = PipelineMetrics()
+    textfile = str(tmp_path / "prom" / "dq.prom")
+    run_pipeline(
+        csv_file(orders_csv(500)),
+        schema_path(),
+        str(tmp_path / "standardized.csv"),
+        str(tmp_path / "invalid_rows.csv"),
+        str(tmp_path / "report.html"),
+        chunksize=200,
+        metrics=metrics,
+        metrics_textfile=textfile,
+    )
+    text = open(textfile, encoding="utf-8").read()
+    assert "dq_rows_total 500" in text and "dq_chunks_total 3" in text
+    assert 'dq_runs_total{outcome="success"} 1' in text
+    server = metrics.serve(0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            assert response.read().decode("utf-8") == text
+    finally:
+        server.shutdown()
@@ -0,0 +1,51 @@
+import filecmp
+
+import pandas as pd
+
+from conftest import orders_csv
+from mmap_reader import read_header, split_byte_ranges
+from requirement import run_pipeline
+
+HEADER = "customer_id,name,order_date,order_amount\n"
+
+
+def _outputs(tmp_path, name: str) -> dict:
+    (tmp_path / name).mkdir()
+    return {
+        "standardized_csv": str(tmp_path / name / "standardized.csv"),
+        "invalid_csv": str(tmp_path / name / "invalid_rows.csv"),
+        "report_html": str(tmp_path / name / "report.html"),
+    }
+
+
+def test_ranges_cover_the_records_and_never_split_a_quoted_field(csv_file):
+    text = HEADER + "".join(f'{i},"line one\nline, two",2024-01-01,{i}\n' for i in range(500))
+    path = csv_file(text)
+    columns, header_end = read_header(path)
+    ranges = list(split_byte_ranges(path, range_bytes=1_000))
+    assert columns == HEADER.strip().split(",")
+    assert ranges[0][:2] == (True, header_end)
+    assert not any(first for first, _, _ in ranges[1:])
+    assert all(left[2] == right[1] for left, right in zip(ranges, ranges[1:]))
+    assert ranges[-1][2] == len(text.encode())
+    data = text.encode()
+    assert all(data[start:end].count(b'"') % 2 == 0 for _, start, end in ranges)
+
+
+def test_mmap_run_matches_a_chunked_run(tmp_path, csv_file, schema_path):
+    input_csv, schema = csv_file(orders_csv(5_000)), schema_path()
+    chunked = run_pipeline(input_csv, schema, chunksize=700, **_outputs(tmp_path, "chunked"))
+    mapped = run_pipeline(input_csv, schema, reader="mmap", range_bytes=16 << 10, **_outputs(tmp_path, "mmap"))
+    assert mapped["total_rows"] == chunked["total_rows"] == 5_000
+    for key in ("standardized_csv", "invalid_csv"):
+        assert filecmp.cmp(mapped[key], chunked[key], shallow=False)
+
+
+def test_header_only_input_in_mmap_mode(tmp_path, csv_file, schema_path):
+    input_csv, schema = csv_file(HEADER), schema_path()
+    mapped = run_pipeline(input_csv, schema, reader="mmap", **_outputs(tmp_path, "mmap"))
+    plain = run_pipeline(input_csv, schema, **_outputs(tmp_path, "plain"))
+    assert mapped["total_rows"] == mapped["invalid_rows"] == 0
+    for key in ("standardized_csv", "invalid_csv"):
+        assert filecmp.cmp(mapped[key], plain[key], shallow=False)
+    assert pd.read_csv(mapped["invalid_csv"]).columns[0] == "row_id"
@@ -0,0 +1,45 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from numeric import parse_integers, parse_numeric
+from standardizer import standardize_data
+
+BIG = ["9007199254740993", "1234567890123456789", "-9223372036854775808"]
+
+
+def test_int_columns_stay_exact_beyond_float_precision():
+    for values in (BIG, BIG + [None, "$1,234"]):
+        parsed, overflow = parse_integers(pd.Series(values, dtype=object))
+        assert parsed.tolist()[:3] == [int(v) for v in BIG]
+        assert overflow == 0
+    df = pd.read_csv(io.StringIO("id\n" + "\n".join(BIG) + "\n"))
+    out = standardize_data(df, {"columns": {"id": {"type": "int"}}})
+    assert str(out["id"].dtype) == "Int64"
+    assert out["id"].tolist() == [int(v) for v in BIG]
+
+
+def test_int_columns_truncate_fractions_and_count_out_of_range_values():
+    values = pd.Series(["12.7", "(5)", "1e3", "12.00", "99999999999999999999", None], dtype=object)
+    parsed, overflow = parse_integers(values)
+    assert parsed.tolist()[:4] == [12, -5, 1000, 12]
+    assert parsed.isna().tolist()[4:] == [True, True]
+    assert overflow == 1
+    unsigned, overflow = parse_integers(pd.Series([2 ** 63 + 5, 3], dtype=np.uint64))
+    assert unsigned.isna().tolist() == [True, False] and overflow == 1
+
+
+@pytest.mark.parametrize("value", ["1_000", "--5", "+-5", "١٢", "1,000", "- 5", " 7 "])
+def test_a_value_parses_the_same_whatever_else_is_in_its_column(value):
+    # A clean column takes the numpy fast path, a dirty one the pattern
+    clean, dirty = pd.Series([value, "1"]), pd.Series([value, "x"])
+    assert parse_numeric(clean)[:1].equals(parse_numeric(dirty)[:1])
+    assert parse_integers(clean)[0][:1].equals(parse_integers(dirty)[0][:1])
+
+
+def test_double_signs_and_digit_group_underscores_are_rejected():
+    parsed = parse_numeric(pd.Series(["--5", "+-5", "1_000", "-5", "(1,234.50)"]))
+    assert parsed.isna().tolist() == [True, True, True, False, False]
+    assert parsed.tolist()[3:] == [-5.0, -1234.5]
@@ -0,0 +1,85 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from profiler import ColumnProfile, HyperLogLog, KLLSketch, merge_profiles, profile_data, profiles_from_dict, profiles_to_dict
+from requirement import run_pipeline
+
+SCHEMA = {"columns": {"amount": {"type": "float"}, "name": {"type": "string"}}}
+
+
+def test_hyperloglog_estimate_is_close():
+    sketch = HyperLogLog()
+    sketch.update(pd.Series(np.arange(50_000)))
+    assert abs(sketch.estimate() - 50_000) / 50_000 < 0.05
+
+
+def test_hyperloglog_merge_matches_single_pass():
+    left, right, whole = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    values = pd.Series(np.arange(20_000))
+    left.update(values[:12_000])
+    right.update(values[8_000:])
+    whole.update(values)
+    left.merge(right)
+    assert left.estimate() == whole.estimate()
+
+
+def test_kll_quantiles_are_close_after_merge():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=100_000)
+    parts = [KLLSketch(seed=i) for i in range(4)]
+    for part, chunk in zip(parts, np.array_split(values, 4)):
+        part.update(chunk)
+    for part in parts[1:]:
+        parts[0].merge(part)
+    assert parts[0].n == values.size
+    for q, estimate in zip((0.1, 0.5, 0.9), parts[0].quantiles([0.1, 0.5, 0.9])):
+        assert abs(np.mean(values <= estimate) - q) < 0.02
+
+
+def test_chunked_profiles_merge_to_whole_frame_counts():
+    df = pd.DataFrame({"amount": [1.0, None, 3.0, 4.0, None, 6.0], "name": ["a", "b", "a", None, "c", "a"]})
+    merged = None
+    for start in range(0, len(df), 2):
+        merged = merge_profiles(merged, profile_data(df.iloc[start:start + 2], SCHEMA))
+    whole = profile_data(df, SCHEMA)
+    for col in df.columns:
+        assert merged[col].count == whole[col].count
+        assert merged[col].null_count == whole[col].null_count
+        assert (merged[col].min, merged[col].max) == (whole[col].min, whole[col].max)
+    assert merged["name"].summary()["top"][0] == ("a", 3)
+
+
+def test_profiles_survive_a_json_round_trip():
+    profiles = profile_data(pd.DataFrame({"amount": [1.5, 2.5], "name": ["x", "y"]}), SCHEMA)
+    restored = profiles_from_dict(json.loads(json.dumps(profiles_to_dict(profiles))))
+    assert restored["amount"].summary() == profiles["amount"].summary()
+    assert isinstance(restored["name"], ColumnProfile)
+
+
+@pytest.mark.parametrize("options", [{"chunksize": 10}, {"reader": "mmap", "range_bytes": 200}])
+def test_columns_outside_the_schema_whose_guessed_type_changes_between_chunks(tmp_path, csv_file, schema_path, options):
+    lines = ["customer_id,name,order_date,order_amount,note"]
+    lines += [f"{i},n,2024-01-01,1.5,{i if i < 10 else 'abc'}" for i in range(20)]
+    outputs = run_pipeline(
+        csv_file("\n".join(lines) + "\n"),
+        schema_path(),
+        str(tmp_path / "standardized.csv"),
+        str(tmp_path / "invalid_rows.csv"),
+        str(tmp_path / "report.html"),
+        **options,
+    )
+    assert outputs["total_rows"] == 20
+
+
+def test_profiles_of_different_kinds_merge_as_text():
+    numeric = ColumnProfile("numeric")
+    numeric.update(pd.Series([3.0, 12.0]))
+    text = ColumnProfile("string")
+    text.update(pd.Series(["abc"]))
+    numeric.merge(text)
+    assert (numeric.kind, numeric.count, numeric.quantiles) == ("string", 3, None)
+    assert (numeric.min, numeric.max) == ("3.0", "abc")
+    assert text.kind == "string" and text.min == "abc"
@@ -0,0 +1,62 @@
+import pandas as pd
+
+from repair import repair_data
+from schema_loader import load_schema
+from standardizer import standardize_data
+
+SCHEMA = {
+    "columns": {
+        "qty": {"type": "int", "repair": ["decimal_comma"]},
+        "amount": {"type": "float", "repair": ["decimal_comma"], "default": 0},
+        "day": {"type": "date", "format": "%Y-%m-%d", "parse_formats": ["%d-%m-%Y"], "repair": ["day_month_swap"]},
+        "name": {"type": "string", "repair": ["trim", "casefold"]},
+    }
+}
+
+
+def _repair(schema_path, raw: pd.DataFrame):
+    schema = load_schema(schema_path(SCHEMA))
+    return repair_data(raw, standardize_data(raw, schema), schema)
+
+
+def test_repairs_are_applied_and_logged_with_their_raw_text(schema_path):
+    raw = pd.DataFrame({
+        "qty": ["1", "1.234,00", "7", None],
+        "amount": ["12,5", "3.25", None, "abc"],
+        "day": ["15-01-2024", "01-15-2024", "15-01-2024", "nonsense"],
+        "name": ["  Ann  Lee ", "BOB", "c", "d"],
+    })
+    repaired, log = _repair(schema_path, raw)
+    assert repaired["amount"].tolist() == [12.5, 3.25, 0.0, 0.0]
+    assert repaired["qty"].tolist()[:3] == [1, 1234, 7]
+    assert repaired["day"].iloc[1] == pd.Timestamp("2024-01-15")
+    assert repaired["name"].tolist() == ["ann lee", "bob", "c", "d"]
+    actions = set(zip(log["row_id"], log["column"], log["action"], log["raw"]))
+    assert (0, "amount", "decimal_comma", "12,5") in actions
+    assert (1, "qty", "decimal_comma", "1.234,00") in actions
+    assert (1, "day", "day_month_swap", "01-15-2024") in actions
+    assert (3, "amount", "default", "abc") in actions
+    assert (3, "day", "quarantined", "nonsense") in actions
+
+
+def test_decimal_comma_leaves_values_that_parsed_alone(schema_path):
+    raw = pd.DataFrame({"qty": ["12,500", "3"], "amount": ["1,234.5", "2"], "day": [None, None], "name": ["a", "b"]})
+    repaired, log = _repair(schema_path, raw)
+    assert repaired["qty"].tolist() == [12500, 3]
+    assert repaired["amount"].tolist() == [1234.5, 2.0]
+    assert "decimal_comma" not in set(log["action"])
+
+
+def test_int_decimal_comma_with_a_fraction_stays_quarantined(schema_path):
+    raw = pd.DataFrame({"qty": ["12,5", "4"], "amount": ["1", "2"], "day": [None, None], "name": ["a", "b"]})
+    repaired, log = _repair(schema_path, raw)
+    assert pd.isna(repaired["qty"].iloc[0])
+    assert log[["row_id", "column", "action", "raw"]].values.tolist() == [[0, "qty", "quarantined", "12,5"]]
+
+
+def test_values_parsed_with_a_comma_number_format_are_not_logged_as_repairs(schema_path):
+    schema = load_schema(schema_path({"columns": {"amount": {"type": "float", "number_format": {"decimal": ","}, "repair": ["decimal_comma"]}}}))
+    raw = pd.DataFrame({"amount": ["12,5", "1.234,5"]})
+    repaired, log = repair_data(raw, standardize_data(raw, schema), schema)
+    assert repaired["amount"].tolist() == [12.5, 1234.5]
+    assert log.empty
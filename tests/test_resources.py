@@ -0,0 +1,56 @@
+import filecmp
+
+import numpy as np
+import pandas as pd
+
+import resources
+from conftest import orders_csv
+from requirement import run_pipeline
+from resources import EXPANSION, ChunkSizer
+
+
+def test_cgroup_limit_and_usage_bound_the_memory(tmp_path, monkeypatch):
+    monkeypatch.setattr(resources, "_CGROUP_ROOT", str(tmp_path))
+    (tmp_path / "memory.max").write_text("536870912\n")
+    (tmp_path / "memory.current").write_text("104857600\n")
+    assert resources.memory_limit() == 512 << 20
+    assert resources.available_memory() <= 412 << 20
+    (tmp_path / "memory.max").write_text("max\n")
+    assert resources.memory_limit() > 512 << 20  # physical memory
+
+
+def test_chunk_size_ramps_up_then_follows_memory_and_latency(monkeypatch):
+    monkeypatch.setattr(resources, "available_memory", lambda: None)
+    sizer = ChunkSizer(budget_bytes=64 << 20, initial_rows=1_000, min_rows=100)
+    df = pd.DataFrame({"a": np.zeros(1_000), "b": np.zeros(1_000)})  # 16 bytes per row
+    sizer.observe_chunk(df)
+    assert sizer.rows == 2_000
+    sizer.observe_chunk(df)
+    assert sizer.rows == 4_000
+    sizer.observe_latency(1_000, 0.5)  # target 2s at 0.5ms per row
+    assert sizer.rows == 4_000
+    assert sizer.report()["chunk_rows"] == {"first": 1_000, "last": 1_000, "min": 1_000, "max": 1_000}
+    # A budget for 500 rows (times the expansion factor) caps the size
+    small = ChunkSizer(budget_bytes=int(500 * EXPANSION * 16), initial_rows=1_000, min_rows=100)
+    small.observe_chunk(df)
+    assert small.rows == 500
+
+
+def test_auto_chunked_run_matches_a_plain_run(tmp_path, csv_file, schema_path):
+    # More rows than the first (probe) chunk of 10,000
+    input_csv, schema = csv_file(orders_csv(15_000)), schema_path()
+    outputs = {}
+    for name, options in (("plain", {}), ("auto", {"chunksize": "auto", "memory_budget": 1 << 20})):
+        (tmp_path / name).mkdir()
+        outputs[name] = run_pipeline(
+            input_csv,
+            schema,
+            str(tmp_path / name / "standardized.csv"),
+            str(tmp_path / name / "invalid_rows.csv"),
+            str(tmp_path / name / "report.html"),
+            **options,
+        )
+    chunking = outputs["auto"]["chunking"]
+    assert chunking["chunks"] > 1 and chunking["budget_bytes"] == 1 << 20
+    for key in ("standardized_csv", "invalid_csv"):
+        assert filecmp.cmp(outputs["auto"][key], outputs["plain"][key], shallow=False)
@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+from requirement import run_routed_pipeline
+
+HEADER = "kind,customer_id,name,order_date,order_amount\n"
+ROWS = "1,1,a,2024-01-01,3\n2,2,b,2024-01-02,4\n,3,c,2024-01-03,5\n1,4,d,2024-01-04,-1\n"
+
+
+@pytest.mark.parametrize("chunksize", [None, 2])
+def test_numeric_route_keys_with_nulls_match_their_routes(tmp_path, csv_file, schema_path, chunksize):
+    schema = schema_path()
+    outputs = run_routed_pipeline(
+        csv_file(HEADER + ROWS), {"1": schema, "2": schema}, route_column="kind", output_dir=str(tmp_path / "out"), chunksize=chunksize
+    )
+    assert {route: result["total_rows"] for route, result in outputs["routes"].items()} == {"1": 2, "2": 1}
+    assert outputs["routes"]["1"]["invalid_rows"] == 1
+    assert outputs["unrouted_rows"] == 1
+    assert pd.read_csv(outputs["unrouted_csv"])["row_id"].tolist() == [2]
+
+
+def test_string_route_keys(tmp_path, csv_file, schema_path):
+    text = HEADER + "order,1,a,2024-01-01,3\nrefund,2,b,2024-01-02,4\nother,3,c,2024-01-03,5\n"
+    outputs = run_routed_pipeline(csv_file(text), {"order": schema_path(), "refund": schema_path()}, route_column="kind", output_dir=str(tmp_path / "out"))
+    assert sorted(outputs["routes"]) == ["order", "refund"]
+    assert outputs["unrouted_rows"] == 1
+
+
+@pytest.mark.parametrize("options", [{}, {"chunksize": 2}, {"chunksize": 2, "pipelined": True}])
+def test_header_only_input_publishes_an_empty_unrouted_file(tmp_path, csv_file, schema_path, options):
+    outputs = run_routed_pipeline(csv_file(HEADER), {"1": schema_path()}, route_column="kind", output_dir=str(tmp_path / "out"), **options)
+    assert outputs["routes"] == {}
+    assert outputs["total_rows"] == 0
+    assert pd.read_csv(outputs["unrouted_csv"]).columns.tolist() == ["row_id"] + HEADER.strip().split(",")
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from conftest import orders_csv
+from requirement import run_pipeline
+
+MODES = {
+    "plain": {},
+    "chunked": {"chunksize": 170},
+    "pipelined": {"chunksize": 170, "pipelined": True, "workers": 3},
+    "mmap": {"reader": "mmap", "range_bytes": 4 << 10},
+}
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_row_ids_are_input_positions_in_every_mode(tmp_path, csv_file, schema_path, mode):
+    input_csv = csv_file(orders_csv(1_000))
+    outputs = run_pipeline(
+        input_csv,
+        schema_path(),
+        str(tmp_path / "standardized.csv"),
+        str(tmp_path / "invalid_rows.csv"),
+        str(tmp_path / "report.html"),
+        repairs_csv=str(tmp_path / "repairs.csv"),
+        **MODES[mode],
+    )
+    invalid = pd.read_csv(outputs["invalid_csv"])
+    assert invalid["row_id"].tolist() == sorted(set(range(0, 1_000, 7)) | set(range(0, 1_000, 11)))
+    # customer_id is the row number in orders_csv
+    assert (invalid["row_id"] == invalid["customer_id"]).all()
+    repairs = pd.read_csv(outputs["repairs_csv"])
+    quarantined = repairs[repairs["column"] == "order_date"]
+    assert quarantined["row_id"].tolist() == list(range(0, 1_000, 11))
@@ -0,0 +1,86 @@
+import copy
+
+import pandas as pd
+import pytest
+
+from conftest import SCHEMA, orders_csv
+from requirement import run_pipeline
+from rules import evaluate_rules, register_rule
+from schema_loader import SchemaError, load_schema
+
+RULE_MODULE = '''
+from rules import register_rule
+
+
+@register_rule("amount_below", types={"float"}, message="{column} below {floor}")
+def amount_below(values, *, floor):
+    mask = (values < floor).to_numpy()
+    return mask, {"short_by": float((floor - values[mask]).sum())}
+'''
+
+
+def _schema(rules: list, modules=("dq_rules_test",)) -> dict:
+    schema = copy.deepcopy(SCHEMA)
+    schema["rule_modules"] = list(modules)
+    schema["columns"]["order_amount"]["rules"] = rules
+    return schema
+
+
+@pytest.fixture
+def rule_module(tmp_path, monkeypatch):
+    (tmp_path / "dq_rules_test.py").write_text(RULE_MODULE, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+
+def test_custom_rules_from_rule_modules_run_in_the_pipeline(tmp_path, csv_file, schema_path, rule_module):
+    schema = schema_path(_schema([{"name": "amount_below", "floor": 10}, {"name": "allowed_values", "values": [0.25]}]))
+    outputs = run_pipeline(
+        csv_file(orders_csv(200)),
+        schema,
+        str(tmp_path / "standardized.csv"),
+        str(tmp_path / "invalid_rows.csv"),
+        str(tmp_path / "report.html"),
+        chunksize=60,
+    )
+    invalid = pd.read_csv(outputs["invalid_csv"]).set_index("row_id")
+    # Amounts are row * 0.25 (or -1.5 on every 7th row), so rows below 40 are below 10
+    assert invalid.loc[39, "errors"] == "order_amount below 10; order_amount not an allowed value"
+    assert invalid.loc[40, "errors"] == "order_amount not an allowed value"
+    assert invalid.loc[1, "errors"] == "order_amount below 10"
+
+
+def test_rule_metrics_and_timings_are_reported(schema_path, rule_module):
+    schema = load_schema(schema_path(_schema([{"name": "amount_below", "floor": 1, "id": "small_amount"}])))
+    df = pd.DataFrame({"order_amount": [0.5, 2.0, -1.0]})
+    [result] = evaluate_rules(df, schema)
+    assert result.rule_id == "small_amount" and result.mask.tolist() == [True, False, True]
+    assert result.metrics == {"short_by": 2.5} and result.seconds >= 0
+
+
+@pytest.mark.parametrize("rules, message", [
+    ([{"name": "amount_belwo", "floor": 1}], "did you mean 'amount_below'"),
+    ([{"name": "pattern", "pattern": "x"}], "does not apply to float columns"),
+    ([{"name": "amount_below"}], "needs floor"),
+    ([{"name": "amount_below", "floor": 1, "id": "below_min"}], "reserved"),
+    ([{"name": "amount_below", "floor": 1, "cap": 2}], "cap"),
+])
+def test_bad_rule_entries_are_schema_errors(schema_path, rule_module, rules, message):
+    with pytest.raises(SchemaError, match=message):
+        load_schema(schema_path(_schema(rules)))
+
+
+def test_rules_returning_python_lists_warn_and_wrong_lengths_fail(schema_path):
+    @register_rule("dq_test_row_by_row")
+    def row_by_row(values):
+        return [value > 1 for value in values]
+
+    @register_rule("dq_test_short")
+    def short(values):
+        return values.to_numpy()[:-1] > 1
+
+    df = pd.DataFrame({"order_amount": [0.5, 2.0]})
+    with pytest.warns(RuntimeWarning, match="not vectorized"):
+        [result] = evaluate_rules(df, load_schema(schema_path(_schema(["dq_test_row_by_row"], modules=()))))
+    assert result.mask.tolist() == [False, True]
+    with pytest.raises(ValueError, match="returned 1 values for 2 rows"):
+        evaluate_rules(df, load_schema(schema_path(_schema(["dq_test_short"], modules=()))))
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from conftest import orders_csv
+from requirement import run_pipeline
+from run_store import RunStore
+
+STATS = {"evaluated_expectations": 5, "successful_expectations": 4}
+
+
+def test_runs_are_filtered_by_source_and_time(tmp_path):
+    store = RunStore(str(tmp_path / "history" / "runs.db"))
+    for day, source, invalid in ((1, "a.csv", 10), (2, "a.csv", 20), (3, "b.csv", 0), (4, "a.csv", 5)):
+        store.record_run(source, "hash", datetime(2024, 1, day), 1.0, 100, invalid, STATS, {("amount", "below_min"): invalid})
+    assert [run["invalid_rows"] for run in store.runs(source="a.csv")] == [5, 20, 10]
+    assert [run["invalid_rows"] for run in store.runs(source="a.csv", since="2024-01-02", until="2024-01-04")] == [20]
+    assert store.runs(limit=1)[0]["invalid_ratio"] == 0.05
+    assert store.sources() == ["a.csv", "b.csv"]
+    trend = store.rule_trend(source="a.csv", column="amount")
+    assert [(row["rows"], row["rate"]) for row in trend] == [(10, 0.1), (20, 0.2), (5, 0.05)]
+
+
+def test_pipeline_runs_are_recorded_with_their_profiles(tmp_path, csv_file, schema_path):
+    db = str(tmp_path / "runs.db")
+    for _ in range(2):
+        run_pipeline(
+            csv_file(orders_csv(300)),
+            schema_path(),
+            str(tmp_path / "standardized.csv"),
+            str(tmp_path / "invalid_rows.csv"),
+            str(tmp_path / "report.html"),
+            chunksize=100,
+            run_store=db,
+        )
+    store = RunStore(db)
+    runs = store.runs()
+    assert len(runs) == 2 and runs[0]["total_rows"] == 300
+    assert runs[0]["invalid_rows"] == len(set(range(0, 300, 7)) | set(range(0, 300, 11)))
+    assert store.profiles(runs[0]["id"])["order_amount"].count == 300
+    below_min = store.rule_trend(rule_id="below_min")
+    assert [row["rows"] for row in below_min] == [len(range(0, 300, 7))] * 2
@@ -0,0 +1,61 @@
+import os
+import pickle
+import threading
+
+import pytest
+
+from conftest import SCHEMA
+from schema_loader import SchemaError, cache_path, load_schema
+
+
+def test_unknown_key_suggests_the_closest_one(schema_path):
+    bad = {"columns": {"amount": {"type": "float", "mni": 0}}}
+    with pytest.raises(SchemaError, match="did you mean 'min'"):
+        load_schema(schema_path(bad))
+
+
+def test_compiled_schema_is_cached_next_to_the_json(schema_path):
+    path = schema_path()
+    compiled = load_schema(path)
+    assert os.path.exists(cache_path(path))
+    assert load_schema(path) == compiled
+    assert set(compiled["columns"]) == set(SCHEMA["columns"])
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"",  # empty
+        pickle.dumps({"version": 1, "key": (0, 0)})[:-3],  # truncated
+        b"\x80\x04\x95\x1a\x00\x00\x00\x00\x00\x00\x00\x8c\x0bno_such_mod\x94\x8c\x03Cls\x94\x93\x94.",  # unknown module
+        pickle.dumps(["not", "a", "dict"]),
+        pickle.dumps({"version": 1}),  # stale layout
+    ],
+)
+def test_a_bad_cache_is_ignored(schema_path, payload):
+    path = schema_path()
+    expected = load_schema(path, use_cache=False)
+    with open(cache_path(path), "wb") as f:
+        f.write(payload)
+    assert load_schema(path) == expected
+
+
+def test_threads_loading_one_schema_do_not_collide(schema_path):
+    path = schema_path()
+    errors = []
+
+    def load():
+        try:
+            for _ in range(20):
+                os.utime(path)  # force a cache rewrite on every load
+                load_schema(path)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=load) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.endswith(".tmp")]
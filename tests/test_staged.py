@@ -0,0 +1,70 @@
+import filecmp
+import threading
+import time
+
+import pytest
+
+from conftest import orders_csv
+from requirement import run_pipeline
+from staged import run_staged
+
+
+def _slow_square(x: int) -> int:
+    time.sleep(0.001 * (x % 5))
+    return x * x
+
+
+def test_results_are_written_in_input_order():
+    written = []
+    run_staged(range(100), _slow_square, written.append, workers=4, queue_size=3)
+    assert written == [x * x for x in range(100)]
+
+
+def test_the_reader_stays_within_the_queue_bound():
+    read, written = [], []
+    lock = threading.Lock()
+
+    def chunks():
+        for i in range(50):
+            with lock:
+                read.append(i)
+            yield i
+
+    def write(result):
+        with lock:
+            # At most queue_size futures are queued, plus one being submitted and one being written
+            assert len(read) - len(written) <= 2 + 2
+        written.append(result)
+        time.sleep(0.002)
+
+    run_staged(chunks(), lambda x: x, write, workers=2, queue_size=2)
+    assert written == list(range(50))
+
+
+def test_reader_and_compute_errors_reach_the_caller():
+    def chunks():
+        yield 1
+        raise OSError("disk gone")
+
+    with pytest.raises(OSError, match="disk gone"):
+        run_staged(chunks(), lambda x: x, lambda result: None)
+    with pytest.raises(ZeroDivisionError):
+        run_staged(range(10), lambda x: 1 / (x - 5), lambda result: None)
+
+
+def test_pipelined_run_matches_a_sequential_run(tmp_path, csv_file, schema_path):
+    input_csv, schema = csv_file(orders_csv(3_000)), schema_path()
+    outputs = {}
+    for name, options in (("sequential", {}), ("pipelined", {"pipelined": True, "workers": 3, "queue_size": 2})):
+        (tmp_path / name).mkdir()
+        outputs[name] = run_pipeline(
+            input_csv,
+            schema,
+            str(tmp_path / name / "standardized.csv"),
+            str(tmp_path / name / "invalid_rows.csv"),
+            str(tmp_path / name / "report.html"),
+            chunksize=400,
+            **options,
+        )
+    for key in ("standardized_csv", "invalid_csv"):
+        assert filecmp.cmp(outputs["pipelined"][key], outputs["sequential"][key], shallow=False)
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from conftest import SCHEMA
+from requirement import flag_invalid_rows
+from standardizer import standardize_data
+from validator import validate_data
+
+
+def _raw() -> pd.DataFrame:
+    return pd.DataFrame({
+        "customer_id": ["1", "2", None],
+        "name": [" a ", "b", "c"],
+        "order_date": ["2024-01-01", "02-01-2024", "bad"],
+        "order_amount": ["1.5", "-2", "3"],
+        "extra": np.arange(3.0),
+    })
+
+
+def test_standardize_without_copy_shares_the_other_columns_and_leaves_the_input_alone():
+    raw = _raw()
+    before = raw.copy()
+    out = standardize_data(raw, SCHEMA, copy=False)
+    assert np.shares_memory(out["extra"].to_numpy(), raw["extra"].to_numpy())
+    assert not np.shares_memory(standardize_data(raw, SCHEMA)["extra"].to_numpy(), raw["extra"].to_numpy())
+    pd.testing.assert_frame_equal(raw, before)
+    assert out["name"].tolist() == ["a", "b", "c"]
+    assert out["order_date"].tolist()[:2] == [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-02")]
+
+
+def test_flagging_without_copy_adds_only_the_flag_columns():
+    std = standardize_data(_raw(), SCHEMA)
+    flagged = flag_invalid_rows(std, SCHEMA, copy=False)
+    assert np.shares_memory(flagged["order_amount"].to_numpy(), std["order_amount"].to_numpy())
+    assert list(flagged.columns) == list(std.columns) + ["is_valid", "errors"]
+    assert "is_valid" not in std.columns
+    assert flagged["is_valid"].tolist() == [True, False, False]
+
+
+def test_int_columns_become_nullable_ints_narrowed_to_int32_where_they_fit():
+    schema = {"columns": {"small": {"type": "int"}, "large": {"type": "int"}, "huge": {"type": "int"}}}
+    raw = pd.DataFrame({"small": ["1", None, "3"], "large": ["1", "2", str(2 ** 40)], "huge": ["1", "2", "1e30"]}, index=[5, 6, 7])
+    out = standardize_data(raw, schema)
+    assert (str(out["small"].dtype), str(out["large"].dtype), str(out["huge"].dtype)) == ("Int32", "Int64", "Int32")
+    assert out["small"].tolist() == [1, pd.NA, 3]
+    assert out.index.tolist() == [5, 6, 7]
+    assert out.attrs["int_overflow"] == {"small": 0, "large": 0, "huge": 1}
+    result = validate_data(out, schema)
+    overflow = {entry["column"]: entry for entry in result["results"]
+                if entry["expectation_type"] == "expect_column_values_to_be_in_int64_range"}
+    assert overflow["huge"]["unexpected_count"] == 1 and overflow["small"]["success"]
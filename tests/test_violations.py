@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from conftest import SCHEMA, orders_csv
+from requirement import run_pipeline
+from violations import RULE_IDS, rule_violations, violations_table
+
+pytest.importorskip("pyarrow")
+
+
+def test_violations_table_has_one_row_per_broken_rule():
+    df = pd.DataFrame(
+        {"customer_id": [1, None, 3], "name": ["a", "b", None], "order_date": pd.to_datetime(["2024-01-01", None, "2024-01-03"]),
+         "order_amount": [1.0, -2.0, 3.0]},
+        index=[10, 11, 12],
+    )
+    table = violations_table(df, list(rule_violations(df, SCHEMA)), SCHEMA)
+    rows = list(table[["row_id", "column", "rule_id", "observed"]].itertuples(index=False, name=None))
+    assert rows == [
+        (11, "customer_id", "required", None),
+        (11, "order_date", "required", None),
+        (11, "order_date", "invalid_date", None),
+        (11, "order_amount", "below_min", "-2.0"),
+        (12, "name", "required", None),
+    ]
+    assert list(table["rule_id"].cat.categories) == RULE_IDS
+    assert list(table["column"].cat.categories) == list(SCHEMA["columns"])
+
+
+def test_observed_values_are_the_raw_input():
+    df_raw = pd.DataFrame(
+        {"customer_id": ["1"], "name": ["a"], "order_date": ["not a date"], "order_amount": ["-2"]}, index=[5]
+    )
+    df = pd.DataFrame(
+        {"customer_id": [1], "name": ["a"], "order_date": pd.to_datetime([None]), "order_amount": [-2.0]}, index=[5]
+    )
+    table = violations_table(df, list(rule_violations(df, SCHEMA)), SCHEMA, df_raw)
+    rows = list(table[["column", "rule_id", "observed"]].itertuples(index=False, name=None))
+    assert rows == [
+        ("order_date", "required", "not a date"),
+        ("order_date", "invalid_date", "not a date"),
+        ("order_amount", "below_min", "-2"),
+    ]
+
+
+def test_chunked_run_writes_the_violations_dataset(tmp_path, csv_file, schema_path):
+    outputs = run_pipeline(
+        csv_file(orders_csv(1_000)),
+        schema_path(),
+        str(tmp_path / "standardized.csv"),
+        str(tmp_path / "invalid_rows.csv"),
+        str(tmp_path / "report.html"),
+        chunksize=300,
+        violations_path=str(tmp_path / "violations"),
+        errors_column=False,
+    )
+    table = pd.read_parquet(tmp_path / "violations")
+    assert len(list((tmp_path / "violations").iterdir())) == 4
+    invalid = pd.read_csv(outputs["invalid_csv"])
+    assert "errors" not in invalid.columns
+    assert sorted(table["row_id"].unique()) == sorted(invalid["row_id"])
+    counts = table["rule_id"].astype(str).value_counts()
+    assert counts["below_min"] == len(range(0, 1_000, 7)) and counts["invalid_date"] == len(range(0, 1_000, 11))
+    assert set(table.loc[table["rule_id"] == "invalid_date", "observed"]) == {"not a date"}
@@ -1,9 +1,36 @@
+import numpy as np
 import pandas as pd
 
+from rules import evaluate_rules
+
+
+def _custom_entry(result) -> dict:
+    """Expectation entry of one custom rule (see rules.py); its metrics are kept alongside."""
+    failed = int(np.count_nonzero(result.mask))
+    entry = {
+        "expectation_type": f"expect_column_values_to_pass_{result.rule_id}",
+        "success": failed == 0,
+        "column": result.column,
+    }
+    if failed:
+        entry["unexpected_count"] = failed
+    if result.metrics:
+        entry["metrics"] = result.metrics
+    return entry
+
+
+def validate_data(df, schema: dict, custom: list | None = None):
+    """Build and run validations based on schema (without Great Expectations).
+
+    Custom rules (rules.evaluate_rules() results, evaluated here when custom is
+    None) each add an expect_column_values_to_pass_<rule id> entry.
+    """
+    if custom is None:
+        custom = evaluate_rules(df, schema)
+    by_column = {}
+    for result in custom:
+        by_column.setdefault(result.column, []).append(result)
 
-def validate_data(df, schema: dict):
-    """Build and run validations based on schema (without Great Expectations)."""
-    
     results = {
         "success": True,
         "statistics": {
@@ -54,7 +81,7 @@ def validate_data(df, schema: dict):
         type_valid = True
         
         if col_type == "int":
-            type_valid = df[col].dtype in ["int64", "Int64"]
+            type_valid = pd.api.types.is_integer_dtype(df[col])
         elif col_type == "float":
             type_valid = df[col].dtype in ["float64", "int64", "Int64"]
         elif col_type == "date":
@@ -74,6 +101,23 @@ def validate_data(df, schema: dict):
             "column": col,
             "expected_type": col_type
         })
+
+        # Integer overflow (counted by standardize_data, the values became nulls)
+        overflow = df.attrs.get("int_overflow", {})
+        if col_type == "int" and col in overflow:
+            results["statistics"]["evaluated_expectations"] += 1
+            entry = {
+                "expectation_type": "expect_column_values_to_be_in_int64_range",
+                "success": overflow[col] == 0,
+                "column": col
+            }
+            if overflow[col]:
+                results["success"] = False
+                results["statistics"]["unsuccessful_expectations"] += 1
+                entry["unexpected_count"] = overflow[col]
+            else:
+                results["statistics"]["successful_expectations"] += 1
+            results["results"].append(entry)
         
         # Numeric constraints
         if col_type in {"int", "float"}:
@@ -98,5 +142,55 @@ def validate_data(df, schema: dict):
                         "column": col,
                         "min_value": spec["min"]
                     })
+
+        for result in by_column.get(col, []):
+            entry = _custom_entry(result)
+            results["statistics"]["evaluated_expectations"] += 1
+            if entry["success"]:
+                results["statistics"]["successful_expectations"] += 1
+            else:
+                results["success"] = False
+                results["statistics"]["unsuccessful_expectations"] += 1
+            results["results"].append(entry)
     
     return results
+
+
+def merge_validation_results(left, right):
+    """Combine validate_data results from two chunks of the same data.
+
+    Entries are matched on (expectation_type, column); counts are summed and an
+    expectation only succeeds if it succeeded in both chunks.
+    """
+    if left is None:
+        return right
+
+    merged = {}
+    for entry in left["results"] + right["results"]:
+        key = (entry["expectation_type"], entry.get("column"))
+        if key not in merged:
+            merged[key] = dict(entry)
+            continue
+        current = merged[key]
+        for count_key in ("null_count", "unexpected_count"):
+            if count_key in entry:
+                current[count_key] = current.get(count_key, 0) + entry[count_key]
+        if "metrics" in entry:
+            # Custom rule metrics are summed across chunks
+            metrics = dict(current.get("metrics", {}))
+            for name, value in entry["metrics"].items():
+                metrics[name] = metrics.get(name, 0) + value
+            current["metrics"] = metrics
+        current["success"] = current["success"] and entry["success"]
+
+    results = list(merged.values())
+    successful = sum(1 for r in results if r["success"])
+    return {
+        "success": successful == len(results),
+        "statistics": {
+            "evaluated_expectations": len(results),
+            "successful_expectations": successful,
+            "unsuccessful_expectations": len(results) - successful
+        },
+        "results": results
+    }
@@ -0,0 +1,124 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from rules import BUILTIN_RULE_IDS, evaluate_rules, rule_ids
+
+# Stable ids of the built-in rules; with the schema's custom rule ids appended they
+# are the dictionary of the rule_id column
+RULE_IDS = BUILTIN_RULE_IDS
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError("writing violations needs the 'pyarrow' package (pip install pyarrow)") from exc
+    return pyarrow
+
+
+def rule_violations(df: pd.DataFrame, schema: dict, custom: list | None = None):
+    """Yield (column, rule_id, message, mask) for each schema rule, one boolean mask per rule.
+
+    Rules come out in the order their messages appear in the 'errors' column; a
+    column's custom rules follow its built-in ones. custom takes precomputed
+    rules.evaluate_rules() results (they are evaluated here otherwise).
+    """
+    n = len(df)
+    if custom is None:
+        custom = evaluate_rules(df, schema)
+    by_column = {}
+    for result in custom:
+        by_column.setdefault(result.column, []).append(result)
+    for col, spec in schema.get("columns", {}).items():
+        if col not in df.columns:
+            yield col, "missing_column", f"missing column: {col}", np.ones(n, dtype=bool)
+            continue
+        series = df[col]
+        nulls = series.isna().to_numpy()
+        if spec.get("required"):
+            yield col, "required", f"{col} is required", nulls
+        t = spec.get("type")
+        if t == "date":
+            yield col, "invalid_date", f"{col} invalid date", nulls
+        elif t in {"int", "float"}:
+            if "min" in spec:
+                yield col, "below_min", f"{col} below min {spec['min']}", (series < spec["min"]).fillna(False).to_numpy(dtype=bool)
+            if "max" in spec:
+                yield col, "above_max", f"{col} above max {spec['max']}", (series > spec["max"]).fillna(False).to_numpy(dtype=bool)
+        for result in by_column.get(col, []):
+            yield col, result.rule_id, result.message, result.mask
+
+
+def violations_table(df: pd.DataFrame, violations: list, schema: dict, df_raw: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Long-format violations: one row per (row_id, column, rule_id) with the observed value.
+
+    observed is the value as read: pass the raw chunk as df_raw (same index as
+    df), or values that standardization coerced to NaN/NaT are reported as None.
+    column and rule_id are categoricals with fixed categories, so they are stored
+    dictionary-encoded and every chunk shares the same dictionary.
+    """
+    row_ids = df.index.to_numpy()
+    source = df if df_raw is None else df_raw
+    parts = []
+    for col, rule_id, _, mask in violations:
+        pos = np.flatnonzero(mask)
+        if not pos.size:
+            continue
+        if col in source.columns:
+            values = source[col].iloc[pos]
+            observed = values.astype(str).where(values.notna(), None).to_numpy(dtype=object)
+        else:
+            observed = np.full(pos.size, None, dtype=object)
+        parts.append(pd.DataFrame({
+            "row_id": row_ids[pos].astype(np.int64),
+            "column": col,
+            "rule_id": rule_id,
+            "observed": observed,
+        }))
+    table = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(
+        {"row_id": np.empty(0, dtype=np.int64), "column": [], "rule_id": [], "observed": np.empty(0, dtype=object)}
+    )
+    table["column"] = pd.Categorical(table["column"], categories=list(schema.get("columns", {})))
+    table["rule_id"] = pd.Categorical(table["rule_id"], categories=RULE_IDS + rule_ids(schema))
+    return table.sort_values("row_id", kind="stable", ignore_index=True)
+
+
+class ViolationsWriter:
+    """Writes violations as a Parquet dataset directory, one part file per chunk.
+
+    Parts are written under <path>.part and the directory is renamed on finalize;
+    a resumed run drops the parts of uncommitted chunks.
+    """
+
+    def __init__(self, path: str, codec: str = "zstd"):
+        self.pa = _pyarrow()
+        self.path = path
+        self.codec = codec
+        os.makedirs(self.part_dir, exist_ok=True)
+
+    @property
+    def part_dir(self) -> str:
+        return self.path + ".part"
+
+    def write(self, table: pd.DataFrame, chunk: int) -> None:
+        arrow_table = self.pa.Table.from_pandas(table, preserve_index=False)
+        self.pa.parquet.write_table(arrow_table, os.path.join(self.part_dir, f"part-{chunk:06d}.parquet"), compression=self.codec)
+
+    def discard_from(self, chunk: int) -> None:
+        for name in os.listdir(self.part_dir):
+            if name.startswith("part-") and int(name[5:11]) >= chunk:
+                os.remove(os.path.join(self.part_dir, name))
+
+    def reopen(self) -> None:
+        """Move the published dataset back to its .part directory to append to it."""
+        shutil.rmtree(self.part_dir, ignore_errors=True)
+        os.replace(self.path, self.part_dir)
+
+    def finalize(self) -> None:
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path)
+        os.replace(self.part_dir, self.path)